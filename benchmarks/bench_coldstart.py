@@ -0,0 +1,110 @@
+"""Cold start: lazy imports vs warm-up, through the production entrypoint.
+
+Starts `serve.py` from scratch (fresh parse cache) with and without
+--warmup and measures how long until it answers, then the first and second
+latency of upload, merge and export. Lazy loading makes the server ready
+sooner; warm-up moves the backend loading out of the first requests.
+
+    python -m benchmarks.bench_coldstart --runs 3 --env PARSE_WORKERS=1
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.loadtest import HTTPTransport, build_requests, free_port
+
+ENDPOINTS = ("upload", "merge", "export")
+
+
+async def wait_ready(url: str, timeout: float = 120.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        transport = HTTPTransport(url)
+        try:
+            status, _ = await transport.request("GET", "/", b"", {})
+            if status == 200:
+                return
+        except OSError:
+            pass
+        finally:
+            await transport.close()
+        await asyncio.sleep(0.05)
+    raise RuntimeError(f"server did not answer within {timeout:.0f}s")
+
+
+async def startup_metrics(transport: HTTPTransport) -> Dict[str, float]:
+    _, body = await transport.request("GET", "/metrics", b"", {})
+    values = {}
+    for line in body.decode().splitlines():
+        if line.startswith("resume_startup_seconds{"):
+            phase = line.split('phase="')[1].split('"')[0]
+            values[phase] = float(line.rsplit(" ", 1)[1]) * 1000
+    return values
+
+
+async def measure_once(warmup: bool, workers: int, requests, env: Dict[str, str]) -> Dict[str, float]:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as scratch:
+        process_env = {
+            **os.environ,
+            "PARSE_CACHE_PATH": os.path.join(scratch, "parse_cache.sqlite3"),
+            "JOBS_DB_PATH": os.path.join(scratch, "jobs.sqlite3"),
+            **env,
+        }
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+             "--warmup" if warmup else "--no-warmup"],
+            env=process_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            await wait_ready(url)
+            result = {"ready_ms": (time.perf_counter() - started) * 1000}
+
+            transport = HTTPTransport(url)
+            for name in ENDPOINTS:
+                method, path, body, headers = requests[name]
+                for attempt in ("first", "second"):
+                    sent = time.perf_counter()
+                    status, _ = await transport.request(method, path, body, headers)
+                    if status != 200:
+                        raise RuntimeError(f"{name} returned {status}")
+                    result[f"{name}_{attempt}_ms"] = (time.perf_counter() - sent) * 1000
+            for phase, value in (await startup_metrics(transport)).items():
+                result[f"{phase}_ms"] = value
+            await transport.close()
+            return result
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--runs", type=int, default=3)
+    arg_parser.add_argument("--workers", type=int, default=1)
+    arg_parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE")
+    args = arg_parser.parse_args()
+
+    env = dict(item.split("=", 1) for item in args.env)
+    requests = build_requests(pages=2, files_per_upload=2)
+
+    columns = ["ready_ms", "import_ms", "warmup_ms"] + [f"{n}_{a}_ms" for n in ENDPOINTS for a in ("first", "second")]
+    print(f"{'mode':>7} " + " ".join(f"{c[:-3]:>13}" for c in columns))
+    for warmup in (False, True):
+        runs: List[Dict[str, float]] = [
+            asyncio.run(measure_once(warmup, args.workers, requests, env)) for _ in range(args.runs)
+        ]
+        medians = {c: statistics.median(run.get(c, 0.0) for run in runs) for c in columns}
+        print(f"{'warm' if warmup else 'lazy':>7} " + " ".join(f"{medians[c]:>13.0f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Throughput and peak memory of the DOCX extraction backends.
+
+    python -m benchmarks.bench_docx --jobs 4 64 512 --repeat 5
+"""
+import argparse
+import io
+import multiprocessing
+import resource
+import time
+
+from benchmarks.corpus import make_docx
+from services.extractors import DOCX_BACKENDS, get_docx_backend
+
+
+def _measure(backend_name: str, data: bytes, repeat: int):
+    backend = get_docx_backend(backend_name)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    for _ in range(repeat):
+        lines = sum(1 for _ in backend.iter_lines(io.BytesIO(data)))
+    elapsed = (time.perf_counter() - started) / repeat
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return lines, elapsed, (peak_kb - baseline_kb) / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[4, 64, 512],
+                            help="experience entries per synthetic resume (controls document size)")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'backend':>12} {'KB':>7} {'lines':>6} {'ms/doc':>9} {'peak MB':>8}")
+    for jobs in args.jobs:
+        data = make_docx(jobs, jobs=jobs, bullets=6)
+        for backend_name in DOCX_BACKENDS:
+            with context.Pool(1) as pool:
+                lines, elapsed, peak_mb = pool.apply(_measure, (backend_name, data, args.repeat))
+            print(f"{backend_name:>12} {len(data) // 1024:>7} {lines:>6} {elapsed * 1000:>9.1f} {peak_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Experience merging: exact signatures vs entity resolution with near-duplicate bullet removal.
+
+Each resume is a reworded copy of one work history (company suffixes, title
+abbreviations, date formats, edited bullets), as when one candidate uploads
+several versions. Reports time and the entries and bullets each approach keeps.
+
+    python -m benchmarks.bench_entities --resumes 5 50 500
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from models.schemas import Experience
+from services.merger import ResumeMerger
+
+from benchmarks.corpus import COMPANIES, TITLES, WORDS
+
+ABBREVIATED = {"Senior": "Sr.", "Engineer": "Eng.", "Developer": "Dev"}
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def history(jobs: int, bullets: int, rng: random.Random) -> List[Experience]:
+    return [
+        Experience(
+            title=rng.choice(TITLES), company=f"{rng.choice(COMPANIES)} {job}",
+            start_date=f"{2022 - job * 2}-{rng.randint(1, 12):02d}",
+            description=[" ".join(rng.choice(WORDS) for _ in range(14)) for _ in range(bullets)],
+        )
+        for job in range(jobs)
+    ]
+
+
+def reworded(experience: List[Experience], rng: random.Random) -> List[Experience]:
+    variants = []
+    for exp in experience:
+        title = " ".join(ABBREVIATED.get(word, word) if rng.random() < 0.5 else word for word in exp.title.split())
+        company = exp.company.upper() if rng.random() < 0.3 else exp.company + rng.choice(["", " Inc.", ", LLC"])
+        year, month = exp.start_date.split("-")
+        start_date = exp.start_date if rng.random() < 0.5 else f"{MONTHS[int(month) - 1]} {year}"
+        description = []
+        for bullet in exp.description:
+            words = bullet.split()
+            # Edit one word in some bullets, add a new bullet now and then
+            if rng.random() < 0.4:
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+            description.append(" ".join(words))
+        if rng.random() < 0.2:
+            description.append(" ".join(rng.choice(WORDS) for _ in range(14)))
+        variants.append(exp.model_copy(update={
+            "title": title, "company": company, "start_date": start_date, "description": description
+        }))
+    return variants
+
+
+def signature_merge(exp_lists: List[List[Experience]]) -> List[Experience]:
+    """The previous merge: exact (company, title, start date) signatures, first entry kept whole"""
+    seen = set()
+    merged = []
+    for experiences in exp_lists:
+        for exp in experiences:
+            signature = f"{exp.company.lower()}_{exp.title.lower()}_{exp.start_date or ''}"
+            if signature not in seen:
+                merged.append(exp)
+                seen.add(signature)
+    return merged
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--resumes", type=int, nargs="+", default=[5, 50, 500])
+    arg_parser.add_argument("--jobs", type=int, default=6)
+    arg_parser.add_argument("--bullets", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    merger = ResumeMerger()
+    rng = random.Random(0)
+    # Load rapidfuzz and numpy before timing
+    merger._merge_experience([history(2, 2, rng)])
+
+    print(f"{'resumes':>8} {'approach':>10} {'ms':>9} {'entries':>8} {'bullets':>8}")
+    for count in args.resumes:
+        base = history(args.jobs, args.bullets, rng)
+        exp_lists = [reworded(base, rng) for _ in range(count)]
+        for approach, merge in (("signature", signature_merge), ("resolved", merger._merge_experience)):
+            started = time.perf_counter()
+            merged = merge(exp_lists)
+            elapsed = time.perf_counter() - started
+            bullets = sum(len(exp.description) for exp in merged)
+            print(f"{count:>8} {approach:>10} {elapsed * 1000:>9.1f} {len(merged):>8} {bullets:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Per-export latency with the prebuilt template registry vs building the layout per request.
+
+"per-request" rebuilds the format's part of the template (style sheet and
+paragraph styles for PDF, the styled base Document for DOCX) inside every
+export, which is what the exporter used to do. The render
+cache is disabled so every iteration really renders.
+
+    python -m benchmarks.bench_export --repeat 30
+"""
+import argparse
+import copy
+import statistics
+import time
+
+from benchmarks.corpus import resume_lines
+from services.exporter import ResumeExporter
+from services.parser import ResumeParser
+from services.templates import get_template
+
+
+def sample_resume() -> dict:
+    parser = ResumeParser()
+    text = "\n".join(resume_lines(11, jobs=6, bullets=4))
+    index = parser.segmenter.segment(text)
+    return {
+        "personal_info": parser._parse_personal_info(index).model_dump(),
+        "skills": [s.model_dump() for s in parser._parse_skills(text)],
+        "experience": [e.model_dump() for e in parser._parse_experience(index.lines('experience'))],
+        "education": [e.model_dump() for e in parser._parse_education(index.lines('education'))],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=30)
+    args = arg_parser.parse_args()
+
+    resume = sample_resume()
+    exporter = ResumeExporter(cache_bytes=0)
+    template = get_template('classic')
+    render = {
+        "pdf": (exporter._export_pdf, "build_pdf_styles"),
+        "docx": (exporter._export_docx, "build_docx_base"),
+    }
+
+    print(f"{'format':>6} {'per-request ms':>15} {'registry ms':>12} {'saved':>7}")
+    for format, (fn, builder) in render.items():
+        timings = {"per-request": [], "registry": []}
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            fresh = copy.copy(template)
+            getattr(fresh, builder)()
+            fn(resume, fresh)
+            timings["per-request"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            fn(resume, template)
+            timings["registry"].append(time.perf_counter() - started)
+
+        before = statistics.median(timings["per-request"]) * 1000
+        after = statistics.median(timings["registry"]) * 1000
+        print(f"{format:>6} {before:>15.2f} {after:>12.2f} {(before - after) / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Skill/project dedup: per-item extractOne (the original merge) vs batched cdist clustering.
+
+    python -m benchmarks.bench_merge --resumes 5 --items 100 300 600
+"""
+import argparse
+import random
+import time
+
+from rapidfuzz import fuzz, process
+
+from models.schemas import Project, Skill
+from services.merger import ResumeMerger
+
+
+def synthetic_lists(resumes: int, items: int, seed: int = 0):
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 12)))
+                  for _ in range(items * 2)]
+    skill_lists, project_lists = [], []
+    for _ in range(resumes):
+        names = rng.sample(vocabulary, items)
+        # Introduce near-duplicates: casing, a typo, a suffix
+        names = [rng.choice([n, n.title(), n[:-1] + "x", n + "js"]) for n in names]
+        skill_lists.append([Skill(name=n) for n in names])
+        project_lists.append([Project(name=f"{n} app", description=f"built {n}") for n in names])
+    return skill_lists, project_lists
+
+
+def legacy_merge_names(lists, threshold: int):
+    """The original greedy loop: one extractOne against the growing key set per item"""
+    seen = {}
+    for items in lists:
+        for item in items:
+            name = item.name.lower().strip()
+            match = process.extractOne(name, seen.keys(), scorer=fuzz.ratio, score_cutoff=threshold) if seen else None
+            if match:
+                seen[match[0]] += 1
+            else:
+                seen[name] = 1
+    return seen
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--resumes", type=int, default=5)
+    arg_parser.add_argument("--items", type=int, nargs="+", default=[100, 300, 600])
+    arg_parser.add_argument("--threshold", type=int, default=85)
+    args = arg_parser.parse_args()
+
+    merger = ResumeMerger()
+    print(f"{'items':>6} {'legacy ms':>10} {'batched ms':>11} {'speedup':>8} {'clusters':>9}")
+    for items in args.items:
+        skill_lists, project_lists = synthetic_lists(args.resumes, items)
+
+        started = time.perf_counter()
+        legacy_merge_names(skill_lists, args.threshold)
+        legacy_merge_names(project_lists, args.threshold)
+        legacy = time.perf_counter() - started
+
+        started = time.perf_counter()
+        skills = merger._merge_skills(skill_lists, args.threshold)
+        merger._merge_projects(project_lists, args.threshold)
+        batched = time.perf_counter() - started
+
+        print(f"{items:>6} {legacy * 1000:>10.1f} {batched * 1000:>11.1f} {legacy / batched:>7.1f}x {len(skills):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Where /api/merge time goes besides merging: request validation, response encoding and gzip.
+
+Compares FastAPI's default path (json.loads + model validation in, jsonable_encoder
++ json.dumps out) with pydantic-core encoding and with merging uploads by digest
+from the parse cache.
+
+    python -m benchmarks.bench_payload --resumes 5 50
+"""
+import argparse
+import gzip
+import json
+import time
+
+import pydantic_core
+from fastapi.encoders import jsonable_encoder
+
+from models.schemas import RESUME_SECTIONS, MergeRequest, MergeResponse, MergeSettings
+from services.cache import ParseCache, ParseEntry
+from services.merger import ResumeMerger
+from services.parser import ResumeParser
+
+from benchmarks.corpus import resume_text
+
+
+def best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--resumes", type=int, nargs="+", default=[5, 50])
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    parser = ResumeParser()
+    merger = ResumeMerger()
+    settings = MergeSettings()
+
+    for count in args.resumes:
+        texts = [resume_text(seed, jobs=6, bullets=5) for seed in range(count)]
+        resumes = [parser.parse_text(text) for text in texts]
+        body = MergeRequest(resumes=resumes).model_dump_json().encode()
+
+        cache = ParseCache(version="bench", memory_bytes=256 * 1024 * 1024)
+        digests = [f"{seed:064x}" for seed in range(count)]
+        for digest, text, resume in zip(digests, texts, resumes):
+            cache.put(digest, ParseEntry(text, RESUME_SECTIONS, resume))
+
+        request = MergeRequest.model_validate(json.loads(body))
+        response = MergeResponse(success=True, merged_resume=merger.merge(request.resumes, settings))
+        encoded = pydantic_core.to_json(response)
+
+        stages = {
+            # What FastAPI does with a MergeRequest body
+            "validate": best_ms(lambda: MergeRequest.model_validate(json.loads(body)), args.repeat),
+            "by digest": best_ms(
+                lambda: [cache.get(digest).select(RESUME_SECTIONS) for digest in digests], args.repeat
+            ),
+            "merge": best_ms(lambda: merger.merge(request.resumes, settings), args.repeat),
+            # FastAPI's default response path
+            "encode default": best_ms(
+                lambda: json.dumps(jsonable_encoder(response), separators=(",", ":")).encode(), args.repeat
+            ),
+            "encode core": best_ms(lambda: pydantic_core.to_json(response), args.repeat),
+            "gzip": best_ms(lambda: gzip.compress(encoded, compresslevel=6), args.repeat),
+        }
+        paths = {
+            "default": stages["validate"] + stages["merge"] + stages["encode default"],
+            "core": stages["validate"] + stages["merge"] + stages["encode core"],
+            "by digest": stages["by digest"] + stages["merge"] + stages["encode core"],
+        }
+
+        print(f"{count} resumes: request {len(body) / 1024:.0f} KiB, response {len(encoded) / 1024:.0f} KiB "
+              f"({len(gzip.compress(encoded, compresslevel=6)) / 1024:.0f} KiB gzipped)")
+        for stage, ms in stages.items():
+            print(f"  {stage:>15} {ms:>8.2f} ms {ms / paths['default']:>6.0%} of default")
+        for path, ms in paths.items():
+            print(f"  {'total ' + path:>15} {ms:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Throughput and peak memory of the PDF extraction backends over a page-count sweep.
+
+Each measurement runs in a fresh process so the resident-set high-water mark
+(which includes PDFium's native allocations) belongs to that backend alone.
+
+    python -m benchmarks.bench_pdf_backends --jobs 4 16 64 --repeat 5
+"""
+import argparse
+import io
+import multiprocessing
+import resource
+import time
+
+from benchmarks.corpus import make_pdf
+from services.extractors import PDF_BACKENDS, get_pdf_backend
+
+
+def _measure(backend_name: str, data: bytes, repeat: int):
+    backend = get_pdf_backend(backend_name)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    for _ in range(repeat):
+        pages = sum(1 for _ in backend.iter_pages(io.BytesIO(data)))
+    elapsed = (time.perf_counter() - started) / repeat
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pages, elapsed, (peak_kb - baseline_kb) / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[4, 16, 64],
+                            help="experience entries per synthetic resume (controls page count)")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'backend':>12} {'pages':>6} {'ms/doc':>9} {'pages/s':>9} {'peak MB':>8}")
+    for jobs in args.jobs:
+        data = make_pdf(jobs, jobs=jobs, bullets=6)
+        for backend_name in PDF_BACKENDS:
+            with context.Pool(1) as pool:
+                pages, elapsed, peak_mb = pool.apply(_measure, (backend_name, data, args.repeat))
+            print(f"{backend_name:>12} {pages:>6} {elapsed * 1000:>9.1f} {pages / elapsed:>9.1f} {peak_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
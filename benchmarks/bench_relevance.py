@@ -0,0 +1,62 @@
+"""Relevance ranking: scoring each item on its own vs one batched BM25 pass per merge.
+
+    python -m benchmarks.bench_relevance --bullets 100 500 2000
+"""
+import argparse
+import random
+import time
+
+from models.schemas import Experience, ParsedResume, PersonalInfo, Skill
+from services.relevance import BULLET, RelevanceRanker
+
+from benchmarks.bench_search import SKILLS, WORDS
+
+JOB_DESCRIPTION = (
+    "Senior backend engineer to scale our payments platform. Python and Go services on Kubernetes and AWS, "
+    "Kafka streaming pipelines, PostgreSQL, strong focus on latency, reliability and monitoring."
+)
+
+
+def synthetic_resume(bullets: int, rng: random.Random) -> ParsedResume:
+    per_entry = 8
+    return ParsedResume(
+        personal_info=PersonalInfo(),
+        skills=[Skill(name=name) for name in SKILLS],
+        experience=[
+            Experience(title="Engineer", company=f"Company {i}", description=[
+                " ".join(rng.choice(WORDS + SKILLS) for _ in range(14)) for _ in range(per_entry)
+            ])
+            for i in range(max(1, bullets // per_entry))
+        ],
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--bullets", type=int, nargs="+", default=[100, 500, 2000])
+    args = arg_parser.parse_args()
+
+    ranker = RelevanceRanker()
+    rng = random.Random(0)
+    # Load the taxonomy and numpy before timing
+    ranker.rank(synthetic_resume(8, rng), JOB_DESCRIPTION)
+
+    print(f"{'bullets':>8} {'per-item ms':>12} {'batched ms':>11} {'speedup':>8}")
+    for count in args.bullets:
+        resume = synthetic_resume(count, rng)
+        bullets = [bullet for exp in resume.experience for bullet in exp.description]
+
+        started = time.perf_counter()
+        for bullet in bullets:
+            ranker.score(JOB_DESCRIPTION, [ranker.terms(bullet)], [BULLET])
+        per_item = time.perf_counter() - started
+
+        started = time.perf_counter()
+        ranker.rank(resume, JOB_DESCRIPTION)
+        batched = time.perf_counter() - started
+
+        print(f"{len(bullets):>8} {per_item * 1000:>12.1f} {batched * 1000:>11.1f} {per_item / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Search index: build time, incremental insert/delete and query latency over a synthetic corpus.
+
+    python -m benchmarks.bench_search --resumes 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from models.schemas import Experience, ParsedResume, PersonalInfo, Project, Skill
+from services.search import ResumeIndex
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "go", "rust", "c++", "c#", "sql", "postgresql", "mysql",
+    "mongodb", "redis", "docker", "kubernetes", "aws", "gcp", "azure", "terraform", "react", "vue", "angular",
+    "node.js", "django", "flask", "fastapi", "spring", "kafka", "spark", "airflow", "pandas", "pytorch",
+    "tensorflow", "machine learning", "graphql", "linux", "git", "php", "ruby", "scala",
+]
+CATEGORIES = ["programming", "database", "cloud", "framework", "data", "tools"]
+WORDS = (
+    "built designed led migrated scaled optimized services pipelines platform api latency throughput team "
+    "customers billing search payments analytics dashboards infrastructure reliability cost reduced improved "
+    "launched mentored automated deployment monitoring microservices streaming batch models training"
+).split()
+QUERIES = [
+    "python",
+    "python docker",
+    "python OR golang",
+    "kubernetes -php",
+    'skill:"machine learning" category:cloud',
+    "latency microservices",
+]
+
+
+def synthetic_resume(rng: random.Random) -> ParsedResume:
+    # Zipf-like: a few skills and words are very common, most are rare
+    skills = {rng.choice(SKILLS[:int(rng.paretovariate(1.2)) % len(SKILLS) + 1]) for _ in range(rng.randint(5, 20))}
+    return ParsedResume(
+        personal_info=PersonalInfo(name=f"Candidate {rng.randrange(10 ** 9)}"),
+        skills=[Skill(name=name, category=rng.choice(CATEGORIES)) for name in skills],
+        experience=[
+            Experience(title="Engineer", company="Acme", description=[
+                " ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(rng.randint(2, 5))
+            ])
+            for _ in range(rng.randint(1, 4))
+        ],
+        projects=[Project(name="Tool", description=" ".join(rng.choice(WORDS) for _ in range(15)))],
+    )
+
+
+def timed_ms(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--resumes", type=int, default=100000)
+    arg_parser.add_argument("--batch", type=int, default=1000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as scratch:
+        index = ResumeIndex(os.path.join(scratch, "search.sqlite3"))
+
+        started = time.perf_counter()
+        for start in range(0, args.resumes, args.batch):
+            count = min(args.batch, args.resumes - start)
+            index.add_many([(f"r{start + i}", synthetic_resume(rng), None) for i in range(count)])
+        build = time.perf_counter() - started
+        print(f"indexed {args.resumes} resumes in {build:.1f}s ({args.resumes / build:.0f}/s)")
+
+        extra = synthetic_resume(rng)
+        print(f"single insert {timed_ms(index.add, 'extra', extra):.1f}ms, "
+              f"delete {timed_ms(index.delete, 'extra'):.1f}ms")
+
+        print(f"{'query':>40} {'rank':>5} {'matches':>8} {'median ms':>10}")
+        for query in QUERIES:
+            for rank in ("bm25", "none"):
+                total = index.search(query, rank=rank)["total"]
+                median = statistics.median(timed_ms(index.search, query, 20, 0, rank) for _ in range(args.repeat))
+                print(f"{query:>40} {rank:>5} {total:>8} {median:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
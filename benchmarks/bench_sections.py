@@ -0,0 +1,54 @@
+"""Section parsing: the original per-section DOTALL regex scans vs the one-pass segmenter.
+
+    python -m benchmarks.bench_sections --jobs 4 32 256 --repeat 20
+"""
+import argparse
+import re
+import time
+
+from benchmarks.corpus import resume_lines
+from services.parser import ResumeParser
+
+
+def legacy_sections(text: str):
+    """The pre-segmenter lookups, kept here only as a baseline"""
+    patterns = [
+        r'(?:experience|work history|employment)(.*?)(?:education|skills|projects|$)',
+        r'(?:professional experience)(.*?)(?:education|skills|$)',
+        r'(?:education)(.*?)(?:experience|skills|projects|$)',
+        r'(?:projects)(.*?)(?:experience|education|skills|$)',
+    ]
+    found = [re.search(p, text, re.IGNORECASE | re.DOTALL) for p in patterns]
+    contact = [
+        re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text),
+        re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text),
+        re.search(r'linkedin\.com/in/[\w-]+', text, re.IGNORECASE),
+        re.search(r'github\.com/[\w-]+', text, re.IGNORECASE),
+    ]
+    return found, contact
+
+
+def timed(fn, text: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[4, 32, 256])
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    segmenter = ResumeParser().segmenter
+    print(f"{'KB':>7} {'legacy ms':>10} {'segmenter ms':>13} {'speedup':>8}")
+    for jobs in args.jobs:
+        text = "\n".join(resume_lines(jobs, jobs=jobs, bullets=6))
+        legacy = timed(legacy_sections, text, args.repeat)
+        single_pass = timed(segmenter.segment, text, args.repeat)
+        print(f"{len(text) / 1024:>7.1f} {legacy * 1000:>10.3f} {single_pass * 1000:>13.3f} {legacy / single_pass:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
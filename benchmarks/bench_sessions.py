@@ -0,0 +1,47 @@
+"""Adding resumes one at a time: full re-merge after each vs an incremental merge session.
+
+    python -m benchmarks.bench_sessions --resumes 20 --items 300
+"""
+import argparse
+import time
+
+from models.schemas import MergeSettings, ParsedResume, PersonalInfo
+from services.merger import ResumeMerger
+from services.sessions import MergeSession
+
+from benchmarks.bench_merge import synthetic_lists
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--resumes", type=int, default=20)
+    arg_parser.add_argument("--items", type=int, default=300)
+    args = arg_parser.parse_args()
+
+    skill_lists, project_lists = synthetic_lists(args.resumes, args.items)
+    resumes = [
+        ParsedResume(personal_info=PersonalInfo(), skills=skills, projects=projects)
+        for skills, projects in zip(skill_lists, project_lists)
+    ]
+    merger = ResumeMerger()
+    settings = MergeSettings()
+    session = MergeSession("bench", settings)
+
+    print(f"{'resumes':>8} {'full ms':>9} {'session ms':>11} {'speedup':>8}")
+    for count in range(1, args.resumes + 1):
+        started = time.perf_counter()
+        full = merger.merge(resumes[:count], settings)
+        full_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        session.add([resumes[count - 1]], max_bytes=2 ** 62)
+        incremental = session.merge(merger)
+        session_time = time.perf_counter() - started
+
+        assert incremental == full
+        if count == 1 or count % 5 == 0:
+            print(f"{count:>8} {full_time * 1000:>9.1f} {session_time * 1000:>11.1f} {full_time / session_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
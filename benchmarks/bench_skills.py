@@ -0,0 +1,75 @@
+"""Skill matching cost as the taxonomy grows.
+
+Reports matcher build time, load time from the pickled cache, and per-resume
+match time, next to the old `keyword in text` loop on the same taxonomy.
+
+    python -m benchmarks.bench_skills --sizes 100 10000 50000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.corpus import resume_lines
+from services.skills import SkillMatcher
+
+
+def synthetic_taxonomy(size: int, seed: int = 0):
+    with open(os.path.join(os.path.dirname(__file__), "..", "data", "skill_taxonomy.json")) as f:
+        base = json.load(f)["skills"]
+    rng = random.Random(seed)
+    skills = list(base)
+    syllables = ["ka", "lo", "mi", "ne", "ra", "zu", "tor", "flux", "ql", "db", "io", "js"]
+    while len(skills) < size:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        words = rng.randint(1, 3)
+        name = " ".join([name] + [rng.choice(syllables) for _ in range(words - 1)])
+        skills.append({"name": name, "category": "synthetic", "aliases": [name.replace(" ", "-")]})
+    return skills[:size]
+
+
+def legacy_match(skills, text: str):
+    text_lower = text.lower()
+    return [s["name"] for s in skills if s["name"].lower() in text_lower]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 50000])
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    text = "\n".join(resume_lines(7, jobs=8, bullets=6))
+    print(f"{'skills':>7} {'build ms':>9} {'load ms':>8} {'match ms':>9} {'legacy ms':>10}")
+    for size in args.sizes:
+        skills = synthetic_taxonomy(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "taxonomy.json")
+            with open(path, "w") as f:
+                json.dump({"skills": skills}, f)
+
+            started = time.perf_counter()
+            SkillMatcher.from_file(path, tmp)
+            build = time.perf_counter() - started
+
+            started = time.perf_counter()
+            matcher = SkillMatcher.from_file(path, tmp)
+            load = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            matcher.match(text)
+        match = (time.perf_counter() - started) / args.repeat
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            legacy_match(skills, text)
+        legacy = (time.perf_counter() - started) / args.repeat
+
+        print(f"{size:>7} {build * 1000:>9.1f} {load * 1000:>8.1f} {match * 1000:>9.3f} {legacy * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Upload wall-clock and /api/merge tail latency while uploads are running.
+
+Compares the old inline parsing (event loop blocked for every file) with the
+process-pool executor, then reports time-to-first-result vs total time for
+the streaming upload path. Run from the repo root:
+
+    python -m benchmarks.bench_upload --uploads 4 --files 5
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+
+from benchmarks.corpus import make_pdf
+from models.schemas import MergeRequest, MergeSettings
+from services.cache import ParseCache, content_hash
+from services.executor import ParseExecutor
+from services.ingest import IngestedFile
+from services.merger import ResumeMerger
+from services.parser import ResumeParser
+from services.pipeline import ParsePipeline
+
+
+def p99(samples):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+async def merge_probe(request: MergeRequest, merger: ResumeMerger, stop: asyncio.Event, latencies: list):
+    """Issue a merge every 10ms and record how long each one took end to end"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0)  # the request has to get scheduled first, like a real one
+        merger.merge(request.resumes, request.settings)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+
+async def run(mode: str, files, uploads: int, workers: int):
+    parser = ResumeParser()
+    merger = ResumeMerger()
+    executor = ParseExecutor(max_workers=workers, timeout=60)
+    executor.start()
+
+    sample = [parser.parse_resume(io.BytesIO(data), "pdf") for data in files[:2]]
+    request = MergeRequest(resumes=sample, settings=MergeSettings())
+
+    # Warm the pool so process start-up isn't counted
+    await asyncio.gather(*(executor.parse(data, "pdf") for data in files))
+
+    async def upload():
+        started = time.perf_counter()
+        if mode == "inline":
+            for data in files:
+                parser.parse_resume(io.BytesIO(data), "pdf")
+        else:
+            await asyncio.gather(*(executor.parse(data, "pdf") for data in files))
+        return time.perf_counter() - started
+
+    stop = asyncio.Event()
+    latencies = []
+    probe = asyncio.create_task(merge_probe(request, merger, stop, latencies))
+    upload_times = await asyncio.gather(*(upload() for _ in range(uploads)))
+    stop.set()
+    await probe
+    executor.shutdown()
+
+    print(
+        f"{mode:>8}: upload wall-clock mean={statistics.mean(upload_times) * 1000:.0f}ms "
+        f"max={max(upload_times) * 1000:.0f}ms | merge p99={p99(latencies) * 1000:.1f}ms "
+        f"(n={len(latencies)})"
+    )
+
+
+async def run_stream(files, workers: int):
+    """Time to first streamed result vs time until every file is done"""
+    executor = ParseExecutor(max_workers=workers, timeout=60)
+    executor.start()
+    await asyncio.gather(*(executor.parse(data, "pdf") for data in files))
+
+    # No cache: every file is really parsed
+    pipeline = ParsePipeline(executor, ParseCache("bench", memory_bytes=0))
+    uploads = [IngestedFile(f"resume_{i}.pdf", "pdf", data, content_hash(data)) for i, data in enumerate(files)]
+
+    started = time.perf_counter()
+    first = None
+    async for _ in pipeline.iter_completed(uploads):
+        if first is None:
+            first = time.perf_counter() - started
+    total = time.perf_counter() - started
+    executor.shutdown()
+
+    print(f"  stream: first result {first * 1000:.0f}ms, all {len(files)} results {total * 1000:.0f}ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--uploads", type=int, default=4, help="concurrent uploads")
+    arg_parser.add_argument("--files", type=int, default=5, help="files per upload")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = arg_parser.parse_args()
+
+    files = [make_pdf(seed, jobs=8) for seed in range(max(args.files, 2))]
+    for mode in ("inline", "pool"):
+        asyncio.run(run(mode, files, args.uploads, args.workers))
+
+    # Mixed sizes, so results complete at different times
+    files = [make_pdf(seed, jobs=4 + 8 * seed) for seed in range(max(args.files, 2))]
+    asyncio.run(run_stream(files, args.workers))
+
+
+if __name__ == "__main__":
+    main()
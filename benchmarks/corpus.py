@@ -0,0 +1,139 @@
+"""Deterministic synthetic resumes for benchmarks.
+
+Every generator is a pure function of its arguments (seeded RNG), so a corpus
+regenerated on another machine or commit is byte-for-byte comparable input.
+"""
+import io
+import itertools
+import random
+from typing import Dict, Iterator, List, Tuple, Union
+
+from docx import Document
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+
+SKILLS = [
+    'Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust', 'React', 'Vue', 'Django',
+    'FastAPI', 'Flask', 'PostgreSQL', 'MongoDB', 'Redis', 'AWS', 'Docker', 'Kubernetes', 'Git'
+]
+COMPANIES = ['Acme Inc', 'Globex', 'Initech', 'Umbrella Corp', 'Hooli', 'Stark Industries']
+TITLES = ['Software Engineer', 'Senior Engineer', 'Backend Developer', 'Data Engineer', 'Tech Lead']
+WORDS = (
+    'built scalable services improved latency designed pipelines migrated legacy systems '
+    'mentored engineers automated deployments reduced costs shipped features for customers'
+).split()
+
+# Sections in the order they are added as `sections` grows
+SECTION_ORDER = ['skills', 'experience', 'education', 'projects', 'summary']
+
+# Roughly how many experience entries (with 4 bullets) fill a letter page
+JOBS_PER_PAGE = 6
+
+# A table row: rendered as table cells, or joined with " | " in plain text
+Line = Union[str, Tuple[str, ...]]
+
+
+def jobs_for_pages(pages: int) -> int:
+    return max(1, pages * JOBS_PER_PAGE - 2)
+
+
+def resume_lines(seed: int, jobs: int = 4, bullets: int = 4, sections: int = 4,
+                 skill_density: float = 0.0, tables: bool = False) -> List[Line]:
+    """Resume body, stable for a given set of arguments.
+
+    `sections` picks how many of SECTION_ORDER appear, `skill_density` is the
+    fraction of bullet words replaced by skill names, and `tables` makes each
+    experience header a table row instead of a "title | company | dates" line.
+    """
+    rng = random.Random(seed)
+    included = set(SECTION_ORDER[:max(1, sections)])
+    lines: List[Line] = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com | (555) 123-{seed % 10000:04d}",
+        f"linkedin.com/in/candidate-{seed} | github.com/candidate-{seed}",
+    ]
+    if 'summary' in included:
+        lines += ["", "SUMMARY", " ".join(rng.choice(WORDS) for _ in range(30))]
+    if 'skills' in included:
+        lines += ["", "SKILLS", ", ".join(rng.sample(SKILLS, 8))]
+    if 'experience' in included:
+        lines += ["", "EXPERIENCE"]
+        for job in range(jobs):
+            year = 2023 - job * 2
+            header = (rng.choice(TITLES), rng.choice(COMPANIES), f"{year - 2} - {year}")
+            lines.append(header if tables else " | ".join(header))
+            for _ in range(bullets):
+                words = [
+                    rng.choice(SKILLS) if rng.random() < skill_density else rng.choice(WORDS)
+                    for _ in range(12)
+                ]
+                lines.append(" ".join(words))
+    if 'education' in included:
+        lines += ["", "EDUCATION", f"B.Sc. Computer Science - State University {seed % 7}"]
+    if 'projects' in included:
+        lines += [
+            "", "PROJECTS",
+            f"Project {seed} - a side project using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}",
+        ]
+    return lines
+
+
+def resume_text(seed: int, **kwargs) -> str:
+    """resume_lines() as the plain text an extractor would produce"""
+    return "\n".join(
+        " | ".join(line) if isinstance(line, tuple) else line
+        for line in resume_lines(seed, **kwargs)
+    )
+
+
+def make_pdf(seed: int, jobs: int = 4, bullets: int = 4, **kwargs) -> bytes:
+    """Render a synthetic resume to PDF bytes"""
+    buffer = io.BytesIO()
+    styles = getSampleStyleSheet()
+    story = []
+    for line in resume_lines(seed, jobs, bullets, **kwargs):
+        if isinstance(line, tuple):
+            story.append(Table([[Paragraph(cell, styles['Normal']) for cell in line]]))
+        else:
+            story.append(Paragraph(line, styles['Normal']) if line else Spacer(1, 6))
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
+    return buffer.getvalue()
+
+
+def make_docx(seed: int, jobs: int = 4, bullets: int = 4, **kwargs) -> bytes:
+    """Render a synthetic resume to DOCX bytes.
+
+    Like many templates, the contact block sits in a table and the name in the
+    page header, which python-docx's paragraph list does not see.
+    """
+    lines = resume_lines(seed, jobs, bullets, **kwargs)
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = lines[0]
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = lines[1]
+    table.cell(0, 1).text = lines[2]
+    for line in lines[3:]:
+        if isinstance(line, tuple):
+            row = doc.add_table(rows=1, cols=len(line)).rows[0]
+            for cell, text in zip(row.cells, line):
+                cell.text = text
+        else:
+            doc.add_paragraph(line)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def sweep(**axes) -> Iterator[Dict]:
+    """Cartesian product of parameter axes, e.g. sweep(pages=[1, 3], tables=[False, True])"""
+    names = list(axes)
+    for values in itertools.product(*(axes[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def make_document(format: str, seed: int, pages: int = 2, sections: int = 4,
+                  skill_density: float = 0.0, tables: bool = False) -> bytes:
+    """One corpus document described by sweep parameters"""
+    render = make_pdf if format == "pdf" else make_docx
+    return render(seed, jobs=jobs_for_pages(pages), sections=sections, skill_density=skill_density, tables=tables)
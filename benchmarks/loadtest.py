@@ -0,0 +1,365 @@
+"""End-to-end load generator for the FastAPI app.
+
+Drives a configurable mix of /api/upload, /api/merge and /api/export traffic
+at a fixed concurrency (closed loop: each virtual user sends its next request
+as soon as the previous one returns) and reports requests/sec, latency
+percentiles and error rates per endpoint. Everything runs offline:
+
+    # In-process, through the ASGI interface (no sockets)
+    python -m benchmarks.loadtest --concurrency 16 --duration 20
+
+    # Against a uvicorn this script starts, to compare worker/pool settings
+    python -m benchmarks.loadtest --serve-workers 2 --env PARSE_WORKERS=2 --mix upload=1,merge=4,export=1
+
+    # Against a server that is already running
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000
+
+Uploads repeat the same files, so they hit the parse cache after the first
+request; pass --env PARSE_CACHE_MEMORY_BYTES=0 --env PARSE_CACHE_PATH= to
+measure cold parsing.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.corpus import make_document
+from models.schemas import MergeSettings
+from services.merger import ResumeMerger
+from services.parser import ResumeParser
+
+# (status, body)
+Result = Tuple[int, bytes]
+
+
+class ASGITransport:
+    """Minimal in-process HTTP client for an ASGI app"""
+
+    def __init__(self, app):
+        self.app = app
+        self._lifespan_task = None
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._lifespan_events: Optional[asyncio.Queue] = None
+
+    async def start(self):
+        self._lifespan_queue = asyncio.Queue()
+        self._lifespan_events = asyncio.Queue()
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}}
+        self._lifespan_task = asyncio.create_task(
+            self.app(scope, self._lifespan_queue.get, self._lifespan_events.put)
+        )
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        event = await self._lifespan_events.get()
+        if event["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"App failed to start: {event}")
+
+    async def close(self):
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        await self._lifespan_events.get()
+        await self._lifespan_task
+
+    async def request(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> Result:
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+                       + [(b"content-length", str(len(body)).encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        sent_body = False
+        status = 0
+        chunks = []
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Never disconnect while the app is still responding
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+
+class HTTPTransport:
+    """Minimal keep-alive HTTP/1.1 client, one connection per virtual user"""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self._connections: Dict[int, Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = {}
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        for _, writer in self._connections.values():
+            writer.close()
+
+    async def _connection(self, user: int):
+        if user not in self._connections:
+            self._connections[user] = await asyncio.open_connection(self.host, self.port)
+        return self._connections[user]
+
+    async def request(self, method: str, path: str, body: bytes, headers: Dict[str, str], user: int = 0) -> Result:
+        try:
+            return await self._send(method, path, body, headers, user)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # Server closed the keep-alive connection; retry once on a fresh one
+            self._connections.pop(user, None)
+            return await self._send(method, path, body, headers, user)
+
+    async def _send(self, method: str, path: str, body: bytes, headers: Dict[str, str], user: int) -> Result:
+        reader, writer = await self._connection(user)
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        head += [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in response_headers:
+            payload = await reader.readexactly(int(response_headers["content-length"]))
+        elif response_headers.get("transfer-encoding") == "chunked":
+            parts = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                parts.append(await reader.readexactly(size + 2))
+                if size == 0:
+                    break
+            payload = b"".join(part[:-2] for part in parts)
+        else:
+            payload = await reader.read()
+
+        if response_headers.get("connection") == "close":
+            writer.close()
+            self._connections.pop(user, None)
+        return status, payload
+
+
+def multipart(files: List[Tuple[str, bytes]]) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for filename, data in files:
+        parts.append(
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"files\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n".encode() + data + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def build_requests(pages: int, files_per_upload: int) -> Dict[str, Tuple[str, str, bytes, Dict[str, str]]]:
+    """One canned request per endpoint: (method, path, body, headers)"""
+    documents = [
+        (f"resume_{seed}.{fmt}", make_document(fmt, seed, pages=pages, skill_density=0.2))
+        for seed, fmt in zip(range(files_per_upload), ["pdf", "docx"] * files_per_upload)
+    ]
+    upload_body, content_type = multipart(documents)
+
+    parser = ResumeParser()
+    parsed = [parser.parse_resume(io.BytesIO(data), name.rsplit(".", 1)[1]) for name, data in documents]
+    merge_body = json.dumps({"resumes": [p.model_dump() for p in parsed]}).encode()
+    merged = ResumeMerger().merge(parsed, MergeSettings())
+    export_body = merged.model_dump_json().encode()
+
+    json_headers = {"Content-Type": "application/json"}
+    return {
+        "upload": ("POST", "/api/upload", upload_body, {"Content-Type": content_type}),
+        "merge": ("POST", "/api/merge", merge_body, json_headers),
+        "export": ("POST", "/api/export/pdf", export_body, json_headers),
+    }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))]
+
+
+async def run_load(transport, requests, weights: Dict[str, float], concurrency: int,
+                   duration: float, seed: int) -> Dict[str, Dict]:
+    names = [name for name in weights if name in requests]
+    probabilities = [weights[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    statuses: Dict[str, Dict[int, int]] = {name: {} for name in names}
+    deadline = time.perf_counter() + duration
+
+    async def user(index: int):
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, probabilities)[0]
+            method, path, body, headers = requests[name]
+            started = time.perf_counter()
+            try:
+                if isinstance(transport, HTTPTransport):
+                    status, _ = await transport.request(method, path, body, headers, user=index)
+                else:
+                    status, _ = await transport.request(method, path, body, headers)
+            except Exception:
+                status = 0
+            latencies[name].append(time.perf_counter() - started)
+            statuses[name][status] = statuses[name].get(status, 0) + 1
+            if not 200 <= status < 400:
+                errors[name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    for name in names:
+        samples = latencies[name]
+        if not samples:
+            continue
+        report[name] = {
+            "requests": len(samples),
+            "rps": len(samples) / elapsed,
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+            "mean_ms": statistics.mean(samples) * 1000,
+            "error_rate": errors[name] / len(samples),
+            "statuses": statuses[name],
+        }
+    total = sum(len(s) for s in latencies.values())
+    report["total"] = {
+        "requests": total,
+        "rps": total / elapsed,
+        "error_rate": sum(errors.values()) / total if total else 0.0,
+        "elapsed_s": elapsed,
+    }
+    return report
+
+
+def print_report(report: Dict[str, Dict]):
+    print(f"{'endpoint':>8} {'reqs':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, row in report.items():
+        if name == "total":
+            continue
+        print(
+            f"{name:>8} {row['requests']:>6} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['error_rate']:>7.1%}"
+        )
+    total = report["total"]
+    print(f"{'total':>8} {total['requests']:>6} {total['rps']:>8.1f} {'':>26} {total['error_rate']:>7.1%}")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, env: Dict[str, str]) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env={**os.environ, **env},
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start within 60s")
+
+
+async def main_async(args):
+    requests = build_requests(args.pages, args.files)
+    weights = parse_mix(args.mix)
+    server = None
+
+    if args.url or args.serve_workers:
+        url = args.url
+        if args.serve_workers:
+            env = dict(item.split("=", 1) for item in args.env)
+            server, url = start_server(args.serve_workers, env)
+        transport = HTTPTransport(url)
+    else:
+        for item in args.env:
+            name, value = item.split("=", 1)
+            os.environ[name] = value
+        import main
+        transport = ASGITransport(main.app)
+
+    try:
+        await transport.start()
+        report = await run_load(transport, requests, weights, args.concurrency, args.duration, args.seed)
+        await transport.close()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_report(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"config": vars(args), "report": report}, f, indent=2)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="virtual users")
+    arg_parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    arg_parser.add_argument("--mix", default="upload=1,merge=3,export=1", help="endpoint weights")
+    arg_parser.add_argument("--pages", type=int, default=2, help="pages per uploaded resume")
+    arg_parser.add_argument("--files", type=int, default=2, help="files per upload request (2-5)")
+    arg_parser.add_argument("--url", help="target an already running server")
+    arg_parser.add_argument("--serve-workers", type=int, help="start uvicorn with this many workers and target it")
+    arg_parser.add_argument("--env", action="append", default=[], help="NAME=VALUE for the app (repeatable)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--out", help="write the report as JSON")
+    asyncio.run(main_async(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Benchmark suite for the parse, merge and export stages.
+
+Generates a deterministic synthetic corpus, times ResumeParser.parse_resume,
+ResumeMerger.merge and ResumeExporter.export across parameter sweeps, and
+reports throughput, latency percentiles and peak Python memory per case.
+
+    python -m benchmarks.suite run --out baseline.json
+    python -m benchmarks.suite run --quick --compare baseline.json --threshold 0.2
+    python -m benchmarks.suite compare baseline.json current.json
+
+`compare` (or `run --compare`) exits with status 1 when any case's p50 is
+slower than the baseline by more than the threshold.
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import make_document, sweep
+from models.schemas import MergeSettings
+from services.exporter import ResumeExporter
+from services.merger import ResumeMerger
+from services.parser import ResumeParser
+
+FULL_SWEEP = {
+    "parse": dict(format=["pdf", "docx"], pages=[1, 3, 10], sections=[2, 5], skill_density=[0.0, 0.3], tables=[False, True]),
+    "merge": dict(resumes=[2, 5, 20], pages=[1, 3]),
+    "export": dict(format=["pdf", "docx"], pages=[1, 3]),
+}
+QUICK_SWEEP = {
+    "parse": dict(format=["pdf", "docx"], pages=[1, 3], sections=[5], skill_density=[0.3], tables=[False, True]),
+    "merge": dict(resumes=[2, 5], pages=[1]),
+    "export": dict(format=["pdf", "docx"], pages=[1]),
+}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Latency distribution over `repeat` calls, then peak traced memory for one more"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    # Separate pass: tracing slows execution down and would skew the timings
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "repeat": repeat,
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "throughput_per_s": len(samples) / sum(samples),
+        "peak_kb": peak / 1024,
+    }
+
+
+def case_name(stage: str, params: Dict) -> str:
+    return stage + "[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]"
+
+
+def run_suite(quick: bool, repeat: int, stages: List[str]) -> Dict[str, Dict]:
+    sweeps = QUICK_SWEEP if quick else FULL_SWEEP
+    # No parse-cache or render-cache in the way: the stages themselves are measured
+    parser = ResumeParser()
+    merger = ResumeMerger()
+    exporter = ResumeExporter(cache_bytes=0)
+    results = {}
+
+    def parsed_corpus(count: int, pages: int):
+        return [
+            parser.parse_resume(io.BytesIO(make_document("pdf", seed, pages=pages, skill_density=0.2)), "pdf")
+            for seed in range(count)
+        ]
+
+    if "parse" in stages:
+        for params in sweep(**sweeps["parse"]):
+            document_params = {k: v for k, v in params.items() if k != "format"}
+            data = make_document(params["format"], 1, **document_params)
+            results[case_name("parse", params)] = measure(
+                lambda: parser.parse_resume(io.BytesIO(data), params["format"]), repeat
+            )
+            print(f"  {case_name('parse', params)}: p50 {results[case_name('parse', params)]['p50_ms']:.2f}ms")
+
+    if "merge" in stages:
+        for params in sweep(**sweeps["merge"]):
+            resumes = parsed_corpus(params["resumes"], params["pages"])
+            settings = MergeSettings()
+            results[case_name("merge", params)] = measure(lambda: merger.merge(resumes, settings), repeat)
+            print(f"  {case_name('merge', params)}: p50 {results[case_name('merge', params)]['p50_ms']:.2f}ms")
+
+    if "export" in stages:
+        for params in sweep(**sweeps["export"]):
+            merged = merger.merge(parsed_corpus(5, params["pages"]), MergeSettings()).model_dump()
+            results[case_name("export", params)] = measure(
+                lambda: exporter.export(merged, params["format"]), repeat
+            )
+            print(f"  {case_name('export', params)}: p50 {results[case_name('export', params)]['p50_ms']:.2f}ms")
+
+    return results
+
+
+def metadata() -> Dict[str, str]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = "unknown"
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float, metric: str = "p50_ms") -> bool:
+    """Print a per-case comparison; return False if any case regressed beyond threshold"""
+    ok = True
+    print(f"{'case':<70} {'base':>9} {'now':>9} {'change':>8}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<70} {'-':>9} {result[metric]:>9.2f} {'new':>8}")
+            continue
+        change = result[metric] / base[metric] - 1 if base[metric] else 0.0
+        flag = ""
+        if change > threshold:
+            ok = False
+            flag = "  REGRESSION"
+        print(f"{name:<70} {base[metric]:>9.2f} {result[metric]:>9.2f} {change:>+7.0%}{flag}")
+    return ok
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite")
+    run.add_argument("--quick", action="store_true", help="smaller sweep")
+    run.add_argument("--repeat", type=int, default=10)
+    run.add_argument("--stages", nargs="+", default=["parse", "merge", "export"], choices=["parse", "merge", "export"])
+    run.add_argument("--out", help="write results JSON here (use as a baseline later)")
+    run.add_argument("--compare", help="baseline JSON to compare against")
+    run.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown, e.g. 0.15 = 15%%")
+
+    cmp = commands.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.15)
+    cmp.add_argument("--metric", default="p50_ms", choices=["mean_ms", "p50_ms", "p95_ms", "p99_ms", "peak_kb"])
+
+    args = arg_parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        sys.exit(0 if compare(baseline, current, args.threshold, args.metric) else 1)
+
+    current = {"meta": metadata(), "results": run_suite(args.quick, args.repeat, args.stages)}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        sys.exit(0 if compare(baseline, current, args.threshold) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+# Parse executor
+# PARSE_WORKERS=0 parses in a thread instead of a process pool (handy for local dev)
+PARSE_WORKERS = _env_int("PARSE_WORKERS", os.cpu_count() or 1)
+PARSE_TIMEOUT = _env_float("PARSE_TIMEOUT", 30.0)
+# Recycle each worker process after this many jobs to cap memory growth (0 = never)
+PARSE_MAX_TASKS_PER_CHILD = _env_int("PARSE_MAX_TASKS_PER_CHILD", 50)
+
+# Parse cache: in-memory LRU per process plus an SQLite file shared by all workers
+PARSE_CACHE_MEMORY_BYTES = _env_int("PARSE_CACHE_MEMORY_BYTES", 64 * 1024 * 1024)
+# Empty string disables the disk tier
+PARSE_CACHE_PATH = os.getenv("PARSE_CACHE_PATH", "cache/parse_cache.sqlite3")
+
+# Upload limits, enforced while the upload streams in
+UPLOAD_MAX_FILE_BYTES = _env_int("UPLOAD_MAX_FILE_BYTES", 10 * 1024 * 1024)
+UPLOAD_MAX_REQUEST_BYTES = _env_int("UPLOAD_MAX_REQUEST_BYTES", 25 * 1024 * 1024)
+
+# PDF text extraction: "pdfium" (fast) or "pdfplumber" (layout-aware fallback)
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfium")
+# Stop extracting long documents after this many pages / characters (0 = no limit)
+PDF_MAX_PAGES = _env_int("PDF_MAX_PAGES", 0)
+PDF_MAX_CHARS = _env_int("PDF_MAX_CHARS", 0)
+# Once every section heading has been seen, read this many more pages and stop (-1 = read everything).
+# Off by default: content after the last heading (later jobs, projects) would be dropped silently
+PDF_TAIL_PAGES = _env_int("PDF_TAIL_PAGES", -1)
+
+# DOCX text extraction: "stream" (iterparse, includes tables/headers) or "python-docx"
+DOCX_BACKEND = os.getenv("DOCX_BACKEND", "stream")
+
+# Skill taxonomy (JSON) and where the compiled matcher is cached between worker starts
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(__file__), "data", "skill_taxonomy.json"))
+SKILL_MATCHER_CACHE_DIR = os.getenv("SKILL_MATCHER_CACHE_DIR", "cache")
+
+# Rendered export cache (per process), bounded by total bytes
+EXPORT_CACHE_BYTES = _env_int("EXPORT_CACHE_BYTES", 32 * 1024 * 1024)
+
+# Incremental merge sessions (/api/merge/sessions, per process): idle lifetime and total size cap
+MERGE_SESSION_TTL = _env_float("MERGE_SESSION_TTL", 1800.0)
+MERGE_SESSION_MAX_BYTES = _env_int("MERGE_SESSION_MAX_BYTES", 64 * 1024 * 1024)
+
+# Searchable corpus of parsed uploads (/api/search): SQLite index file; empty disables indexing and search
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "")
+
+# Gzip JSON/text responses of at least this many bytes for clients that accept it (0 = never), at this level
+GZIP_MIN_BYTES = _env_int("GZIP_MIN_BYTES", 4096)
+GZIP_LEVEL = _env_int("GZIP_LEVEL", 6)
+
+# Relevance ranking (MergeSettings.sort_experience_by="relevance"): IDF comes from the search index once it
+# holds this many resumes, re-read after this many seconds
+RELEVANCE_MIN_CORPUS = _env_int("RELEVANCE_MIN_CORPUS", 50)
+RELEVANCE_IDF_TTL = _env_float("RELEVANCE_IDF_TTL", 300.0)
+
+# Batch merge/export (/api/merge/batch, /api/export/batch): groups in flight at once, the longest NDJSON
+# line (one group), and how much of an NDJSON body is spooled in memory before going to a temp file
+BATCH_CONCURRENCY = _env_int("BATCH_CONCURRENCY", max(2, PARSE_WORKERS))
+BATCH_MAX_LINE_BYTES = _env_int("BATCH_MAX_LINE_BYTES", 8 * 1024 * 1024)
+BATCH_SPOOL_BYTES = _env_int("BATCH_SPOOL_BYTES", 4 * 1024 * 1024)
+# Largest NDJSON body spooled (413 past it), groups read from one, and largest single-document JSON
+# batch, which is held and validated whole (bigger batches belong in NDJSON)
+BATCH_MAX_BYTES = _env_int("BATCH_MAX_BYTES", 512 * 1024 * 1024)
+BATCH_MAX_GROUPS = _env_int("BATCH_MAX_GROUPS", 10000)
+BATCH_MAX_JSON_BYTES = _env_int("BATCH_MAX_JSON_BYTES", 8 * 1024 * 1024)
+# Batch groups are merged and rendered in their own worker pool (0 = threads, as with PARSE_WORKERS),
+# each group limited to BATCH_TIMEOUT seconds
+BATCH_WORKERS = _env_int("BATCH_WORKERS", PARSE_WORKERS)
+BATCH_TIMEOUT = _env_float("BATCH_TIMEOUT", 120.0)
+
+# Background jobs (/api/jobs): SQLite state file and concurrent job limit
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "cache/jobs.sqlite3")
+JOB_WORKERS = _env_int("JOB_WORKERS", 2)
+# Finished and failed jobs (with their stored outputs) are deleted this long after their last update; 0 keeps them
+JOB_TTL = _env_float("JOB_TTL", 24 * 3600.0)
+
+# Admin endpoints (/api/admin/...) and per-request profiling; empty disables both
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+# Read access to the search index (/api/search...), which holds candidates' resumes; the admin token also
+# reads it, and adding or removing resumes takes the admin token. With neither set, search is disabled
+SEARCH_TOKEN = os.getenv("SEARCH_TOKEN", "")
+# Sampling profiler: seconds between stack samples, where profiles go and how many to keep
+PROFILE_INTERVAL = _env_float("PROFILE_INTERVAL", 0.005)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "cache/profiles")
+PROFILE_KEEP = _env_int("PROFILE_KEEP", 100)
+
+# Production server (serve.py): worker processes, and whether to preload heavy backends before serving
+WEB_CONCURRENCY = _env_int("WEB_CONCURRENCY", 1)
+WARMUP = _env_int("WARMUP", 0) == 1
+
+# Admission control: requests of each class running at once (0 = unlimited), plus a bounded wait queue.
+# Requests that find the queue full, or wait longer than the timeout, get 503 with Retry-After.
+PARSE_CONCURRENCY = _env_int("PARSE_CONCURRENCY", max(2, PARSE_WORKERS))
+MERGE_CONCURRENCY = _env_int("MERGE_CONCURRENCY", 4)
+EXPORT_CONCURRENCY = _env_int("EXPORT_CONCURRENCY", 4)
+ADMISSION_QUEUE_SIZE = _env_int("ADMISSION_QUEUE_SIZE", 16)
+ADMISSION_QUEUE_TIMEOUT = _env_float("ADMISSION_QUEUE_TIMEOUT", 10.0)
@@ -1,16 +1,158 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import time
+
+# Reported as the import-time startup cost (see /metrics and serve.py)
+_import_started = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, UploadFile, File, Form, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from typing import List
-import uvicorn
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+import base64
+import hmac
+import json
+import logging
 import os
+from pydantic import ValidationError
+import pydantic_core
+import uvicorn
 
+import config
+from services import metrics, profiler, warmup
 from services.parser import ResumeParser
 from services.merger import ResumeMerger
 from services.exporter import ResumeExporter
-from models.schemas import MergeRequest, MergeResponse, ParsedResume
+from services.executor import BatchExecutor, BatchTimeout, ParseExecutor, ParseTimeout
+from services.cache import ParseCache
+from services.pipeline import ParsePipeline
+from services.admission import AdmissionGate, Overloaded
+from services.compression import GZipMiddleware
+from services.batch import (
+    BatchError,
+    BatchTooLarge,
+    ZipStream,
+    encode_json,
+    encode_manifest,
+    entry_name,
+    listed_groups,
+    manifest_entry,
+    ndjson_groups,
+    read_body,
+    run_batch,
+    spool,
+)
+from services.relevance import RelevanceRanker
+from services.search import QueryError, ResumeIndex
+from services.sessions import MergeSession, MergeSessionStore, SessionFull
+from services.ingest import ByteBudget, UploadRejected, ingest_upload
+from services.templates import DEFAULT_TEMPLATE, TEMPLATES
+from services.jobs import DONE, QUEUED, RUNNING, JobRunner, JobStore
+from models.schemas import (
+    RESUME_SECTIONS,
+    BatchGroup,
+    BatchRequest,
+    MergeRequest,
+    MergeResponse,
+    MergeSessionRequest,
+    MergeSessionResponse,
+    MergeSettings,
+    ParsedResume,
+    SessionResumesRequest,
+)
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+async def _warm_up() -> float:
+    """Load heavy backends and start parse workers before serving (WARMUP=1)"""
+    started = time.perf_counter()
+    # Warm-up work shouldn't show up as traffic in /metrics
+    with metrics.collect():
+        warmup.warm_merger(merger)
+        warmup.warm_exporter(exporter)
+    await parse_executor.warm_up()
+    return time.perf_counter() - started
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # uvicorn only starts accepting connections on this worker once startup returns
+    if config.WARMUP:
+        warmup_seconds = await _warm_up()
+        metrics.STARTUP_SECONDS.set(warmup_seconds, phase="warmup")
+        logger.info("Startup: import %.0fms, warm-up %.0fms", IMPORT_SECONDS * 1000, warmup_seconds * 1000)
+    else:
+        logger.info("Startup: import %.0fms, warm-up off", IMPORT_SECONDS * 1000)
+    parse_executor.start()
+    batch_executor.start()
+    parse_cache.prune()
+    job_runner.start()
+    yield
+    await job_runner.shutdown()
+    parse_executor.shutdown()
+    batch_executor.shutdown()
+
+
+app = FastAPI(title="Resume Merger API", version="1.0.0", lifespan=lifespan)
+
+
+def _admission_gate(request: Request) -> Optional[AdmissionGate]:
+    """The gate guarding a request's endpoint class, if it has one"""
+    path = request.url.path
+    if path.startswith("/api/merge/sessions"):
+        # Session reads and removals re-merge too
+        return admission_gates.get("merge")
+    if path.startswith("/api/resumes/"):
+        # Cached uploads asked for more sections are re-parsed in the pool
+        return admission_gates.get("parse")
+    if request.method != "POST":
+        return None
+    if path in ("/api/upload", "/api/upload/stream", "/api/jobs"):
+        # Job submissions ingest whole uploads into memory and SQLite, like an upload
+        return admission_gates.get("parse")
+    if path in ("/api/merge", "/api/merge/batch"):
+        return admission_gates.get("merge")
+    if path.startswith("/api/export/"):
+        return admission_gates.get("export")
+    return None
+
+
+# Registered before CORS so that 503s still carry CORS headers
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Limit concurrent parse/merge/export requests, queueing a bounded number before the body is read"""
+    gate = _admission_gate(request)
+    if gate is None:
+        return await call_next(request)
+    
+    try:
+        with metrics.timer("queue"):
+            acquired = await gate.acquire()
+    except Overloaded as e:
+        return JSONResponse(
+            status_code=503, content={"detail": str(e)}, headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    try:
+        response = await call_next(request)
+    except BaseException:
+        gate.release(acquired)
+        raise
+    
+    async def release_when_sent(body):
+        # Streamed uploads keep parsing while the body is sent, so hold the slot until then
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            gate.release(acquired)
+    
+    response.body_iterator = release_when_sent(response.body_iterator)
+    return response
 
-app = FastAPI(title="Resume Merger API", version="1.0.0")
 
 # CORS middleware for Next.js frontend
 app.add_middleware(
@@ -19,16 +161,123 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Ids", "Retry-After"],
 )
 
+
+_first_requests = set()
+
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Per-stage Server-Timing header and a latency histogram per route"""
+    started = time.perf_counter()
+    with metrics.request_timings() as timings:
+        response = await call_next(request)
+        elapsed = time.perf_counter() - started
+        # Streamed bodies are still being produced here; their stages land in /metrics only
+        response.headers["Server-Timing"] = metrics.server_timing_header(timings, elapsed)
+    route = request.scope.get("route")
+    route_path = route.path if route else "unmatched"
+    metrics.HTTP_SECONDS.observe(elapsed, method=request.method, route=route_path, status=response.status_code)
+    if route_path not in _first_requests:
+        # Lazy imports and cold caches land on the first request to each route
+        _first_requests.add(route_path)
+        metrics.FIRST_REQUEST_SECONDS.set(elapsed, route=route_path)
+        logger.info("First request to %s took %.0fms", route_path, elapsed * 1000)
+    return response
+
+
+def _is_admin(token: Optional[str]) -> bool:
+    return bool(config.ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, config.ADMIN_TOKEN)
+
+
+async def _require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not _is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+async def _require_search_reader(x_search_token: Optional[str] = Header(None),
+                                 x_admin_token: Optional[str] = Header(None)):
+    """Reading the search index (candidates' names and resumes) takes the search or the admin token"""
+    if not (config.SEARCH_TOKEN or config.ADMIN_TOKEN):
+        raise HTTPException(status_code=404, detail="Not Found")
+    if _is_admin(x_admin_token):
+        return
+    if config.SEARCH_TOKEN and x_search_token is not None and hmac.compare_digest(x_search_token, config.SEARCH_TOKEN):
+        return
+    raise HTTPException(status_code=403, detail="Invalid search token")
+
+
+@app.middleware("http")
+async def profiling(request: Request, call_next):
+    """Sample parse/merge/export stacks when asked by an admin (X-Profile) or during a profiling window"""
+    requested = request.headers.get("x-profile")
+    if requested:
+        if not _is_admin(request.headers.get("x-admin-token")):
+            return JSONResponse(status_code=403, content={"detail": "Profiling requires a valid X-Admin-Token"})
+        format = requested if requested in profiler.FORMATS else profiler.FORMATS[0]
+        session = profiler.ProfileSession(profile_store, format, config.PROFILE_INTERVAL)
+    elif profile_window.active():
+        session = profiler.ProfileSession(profile_store, profile_window.format, config.PROFILE_INTERVAL)
+    else:
+        return await call_next(request)
+    
+    with profiler.activate(session):
+        response = await call_next(request)
+    # Streamed bodies may record profiles after this; those are listed under /api/admin/profiles
+    if session.profile_ids:
+        response.headers["X-Profile-Ids"] = ", ".join(session.profile_ids)
+    return response
+
+
+# Outermost, so it sees the final body and headers; streamed and binary responses pass through
+app.add_middleware(GZipMiddleware, minimum_size=config.GZIP_MIN_BYTES, level=config.GZIP_LEVEL)
+
+
 # Initialize services
 parser = ResumeParser()
-merger = ResumeMerger()
-exporter = ResumeExporter()
+exporter = ResumeExporter(cache_bytes=config.EXPORT_CACHE_BYTES)
+parse_executor = ParseExecutor(
+    max_workers=config.PARSE_WORKERS,
+    timeout=config.PARSE_TIMEOUT,
+    max_tasks_per_child=config.PARSE_MAX_TASKS_PER_CHILD,
+    warm_workers=config.WARMUP
+)
+batch_executor = BatchExecutor(
+    max_workers=config.BATCH_WORKERS,
+    timeout=config.BATCH_TIMEOUT,
+    max_tasks_per_child=config.PARSE_MAX_TASKS_PER_CHILD
+)
+parse_cache = ParseCache(
+    version=parser.fingerprint(),
+    memory_bytes=config.PARSE_CACHE_MEMORY_BYTES,
+    disk_path=config.PARSE_CACHE_PATH or None
+)
+search_index = ResumeIndex(config.SEARCH_INDEX_PATH) if config.SEARCH_INDEX_PATH else None
+# Relevance ranking takes its IDF from the search index when there is one
+merger = ResumeMerger(ranker=RelevanceRanker(search_index))
+parse_pipeline = ParsePipeline(parse_executor, parse_cache, search_index)
+job_runner = JobRunner(
+    JobStore(config.JOBS_DB_PATH), parse_pipeline, merger, exporter, workers=config.JOB_WORKERS, ttl=config.JOB_TTL
+)
+admission_gates = {
+    name: AdmissionGate(name, limit, config.ADMISSION_QUEUE_SIZE, config.ADMISSION_QUEUE_TIMEOUT)
+    for name, limit in (
+        ("parse", config.PARSE_CONCURRENCY),
+        ("merge", config.MERGE_CONCURRENCY),
+        ("export", config.EXPORT_CONCURRENCY),
+    )
+    if limit > 0
+}
+merge_sessions = MergeSessionStore(config.MERGE_SESSION_TTL, config.MERGE_SESSION_MAX_BYTES)
+profile_store = profiler.ProfileStore(config.PROFILE_DIR, config.PROFILE_KEEP)
+profile_window = profiler.ProfileWindow()
 
-# Create upload directory
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+IMPORT_SECONDS = time.perf_counter() - _import_started
+metrics.STARTUP_SECONDS.set(IMPORT_SECONDS, phase="import")
 
 
 @app.get("/")
@@ -40,88 +289,662 @@ async def root():
     }
 
 
-@app.post("/api/upload")
-async def upload_resumes(files: List[UploadFile] = File(...)):
-    """Upload and parse multiple resumes"""
+async def _ingest_files(files: List[UploadFile]):
+    """Validate the file count and stream every upload into memory"""
     if len(files) < 2:
         raise HTTPException(status_code=400, detail="Please upload at least 2 resumes")
     
     if len(files) > 5:
         raise HTTPException(status_code=400, detail="Maximum 5 resumes allowed")
     
-    parsed_resumes = []
+    # Stream each file into memory, sniffing its type and hashing as it arrives
+    budget = ByteBudget(config.UPLOAD_MAX_REQUEST_BYTES)
+    uploads = []
+    try:
+        for file in files:
+            uploads.append(await ingest_upload(file, budget, config.UPLOAD_MAX_FILE_BYTES))
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return uploads
+
+
+def _parse_sections(sections: Optional[str]) -> Optional[List[str]]:
+    """`?sections=skills,experience` -> section names; None (all) when absent"""
+    if sections is None:
+        return None
+    names = [name.strip() for name in sections.split(",") if name.strip()]
+    _check_sections(names)
+    return names
+
+
+def _check_sections(names: List[str]):
+    unknown = [name for name in names if name not in RESUME_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sections: {', '.join(unknown)}. Choose from {', '.join(RESUME_SECTIONS)}"
+        )
+
+
+@app.post("/api/upload")
+async def upload_resumes(files: List[UploadFile] = File(...), sections: Optional[str] = None):
+    """Upload and parse multiple resumes
     
-    for file in files:
-        # Validate file type
-        if not file.filename.endswith(('.pdf', '.docx')):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type: {file.filename}. Only PDF and DOCX are supported."
-            )
-        
-        # Save file temporarily
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Parse resume
-        try:
-            parsed_data = parser.parse_resume(file_path)
-            parsed_resumes.append({
-                "filename": file.filename,
-                "data": parsed_data
-            })
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error parsing {file.filename}: {str(e)}"
-            )
-        finally:
-            # Clean up uploaded file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+    `?sections=skills,experience` parses only those sections; the others come
+    back empty and can be fetched later from /api/resumes/{digest}.
+    """
+    wanted = _parse_sections(sections)
+    uploads = await _ingest_files(files)
     
-    return {
+    # Parse all files concurrently (cached results are reused)
+    results = await parse_pipeline.parse_many(uploads, wanted)
+    
+    parsed_resumes = []
+    for upload, result in zip(uploads, results):
+        if isinstance(result, Exception):
+            status_code, detail = _parse_error(upload.filename, result)
+            raise HTTPException(status_code=status_code, detail=detail)
+        parsed_resumes.append({
+            "filename": upload.filename,
+            "digest": upload.digest,
+            "data": result
+        })
+    
+    return _json_response({
         "success": True,
         "count": len(parsed_resumes),
         "resumes": parsed_resumes
-    }
+    })
+
+
+def _json_response(content) -> Response:
+    """Encode with pydantic-core in one pass; FastAPI's default walks every model in Python first"""
+    return Response(pydantic_core.to_json(content), media_type="application/json")
+
+
+def _parse_error(filename: str, error: Exception):
+    """HTTP status and message for a failed parse"""
+    if isinstance(error, ParseTimeout):
+        return 504, f"Timed out parsing {filename}: {str(error)}"
+    return 500, f"Error parsing {filename}: {str(error)}"
+
+
+@app.post("/api/upload/stream")
+async def upload_resumes_stream(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    format: Optional[str] = None,
+    sections: Optional[str] = None
+):
+    """Upload and parse multiple resumes, streaming each result as soon as it is ready
+    
+    Emits NDJSON by default, or server-sent events with `?format=sse` or
+    `Accept: text/event-stream`. One failed file does not discard the others.
+    `?sections=` works as for /api/upload.
+    """
+    wanted = _parse_sections(sections)
+    uploads = await _ingest_files(files)
+    use_sse = format == "sse" or "text/event-stream" in request.headers.get("accept", "")
+    
+    def encode(event: str, payload: dict) -> str:
+        body = json.dumps({"event": event, **payload})
+        return f"event: {event}\ndata: {body}\n\n" if use_sse else body + "\n"
+    
+    async def events():
+        started = time.perf_counter()
+        errors = 0
+        async for position, result, error in parse_pipeline.iter_completed(uploads, wanted):
+            filename = uploads[position].filename
+            if error is not None:
+                errors += 1
+                status_code, detail = _parse_error(filename, error)
+                yield encode("error", {
+                    "index": position, "filename": filename, "status_code": status_code, "detail": detail
+                })
+            else:
+                yield encode("result", {
+                    "index": position, "filename": filename, "digest": uploads[position].digest,
+                    "data": result.model_dump(mode="json")
+                })
+        yield encode("done", {
+            "count": len(uploads) - errors,
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        })
+    
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/api/resumes/{digest}")
+async def get_resume_sections(digest: str, sections: Optional[str] = None):
+    """Sections of an earlier upload, parsed from its cached text without re-uploading"""
+    wanted = _parse_sections(sections)
+    try:
+        result = await parse_pipeline.parse_cached(digest, RESUME_SECTIONS if wanted is None else wanted)
+    except Exception as e:
+        status_code, detail = _parse_error(digest, e)
+        raise HTTPException(status_code=status_code, detail=detail)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Resume not cached; upload it again")
+    return _json_response({"success": True, "digest": digest, "data": result})
+
+
+def _require_index() -> ResumeIndex:
+    if search_index is None:
+        raise HTTPException(status_code=404, detail="Search is not enabled (set SEARCH_INDEX_PATH)")
+    return search_index
+
+
+@app.get("/api/search")
+async def search_resumes(q: str, limit: int = 20, offset: int = 0, rank: str = "bm25",
+                         _: None = Depends(_require_search_reader)):
+    """Find indexed resumes by skill, category and description words, e.g. `python OR golang -php`"""
+    index = _require_index()
+    if rank not in ("bm25", "none"):
+        raise HTTPException(status_code=400, detail="rank must be 'bm25' or 'none'")
+    if not 1 <= limit <= 100 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be 1-100 and offset non-negative")
+    started = time.perf_counter()
+    try:
+        found = await run_in_threadpool(index.search, q, limit, offset, rank)
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**found, "took_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+@app.get("/api/search/stats")
+async def search_stats(_: None = Depends(_require_search_reader)):
+    """Indexed resume, term and token counts"""
+    return await run_in_threadpool(_require_index().get_stats)
+
+
+@app.put("/api/search/resumes/{key}")
+async def index_resume(key: str, resume: ParsedResume, filename: Optional[str] = None,
+                       _: None = Depends(_require_admin)):
+    """Add a parsed resume to the index, or replace the one under `key`"""
+    await run_in_threadpool(_require_index().add, key, resume, filename)
+    return {"success": True, "key": key}
+
+
+@app.get("/api/search/resumes/{key}")
+async def get_indexed_resume(key: str, _: None = Depends(_require_search_reader)):
+    """An indexed resume (uploads are indexed under their digest)"""
+    resume = await run_in_threadpool(_require_index().get, key)
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Resume not in the index")
+    return _json_response({"success": True, "key": key, "data": resume})
+
+
+@app.delete("/api/search/resumes/{key}")
+async def delete_indexed_resume(key: str, _: None = Depends(_require_admin)):
+    """Remove a resume from the index"""
+    if not await run_in_threadpool(_require_index().delete, key):
+        raise HTTPException(status_code=404, detail="Resume not in the index")
+    return {"success": True}
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Parse cache hit/miss counters for this worker"""
+    return parse_cache.get_stats()
+
+
+@app.get("/api/admission/stats")
+async def admission_stats():
+    """Active, queued, admitted and rejected request counts per endpoint class"""
+    return {name: gate.get_stats() for name, gate in admission_gates.items()}
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus text exposition of this worker's counters and histograms"""
+    stats = parse_cache.get_stats()
+    metrics.PARSE_CACHE_HIT_RATIO.set(stats["hit_rate"])
+    metrics.PARSE_CACHE_MEMORY_BYTES.set(stats["memory_bytes"])
+    metrics.EXPORT_CACHE_MEMORY_BYTES.set(exporter.cache.size)
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.delete("/api/cache")
+async def invalidate_cache(_: None = Depends(_require_admin)):
+    """Drop all cached parse results"""
+    removed = parse_cache.invalidate()
+    return {"success": True, "removed": removed}
+
+
+@app.post("/api/admin/profiling")
+async def start_profiling(seconds: float = 60, format: str = profiler.FORMATS[0], _: None = Depends(_require_admin)):
+    """Profile every request handled by this worker for the next `seconds`"""
+    if not 0 < seconds <= 3600:
+        raise HTTPException(status_code=400, detail="seconds must be between 0 and 3600")
+    if format not in profiler.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(profiler.FORMATS)}")
+    profile_window.enable(seconds, format)
+    return {"profiling_until": profile_window.until, "format": format}
+
+
+@app.delete("/api/admin/profiling")
+async def stop_profiling(_: None = Depends(_require_admin)):
+    profile_window.disable()
+    return {"success": True}
+
+
+@app.get("/api/admin/profiles")
+async def list_profiles(_: None = Depends(_require_admin)):
+    """Stored profiles, newest first, each with its input's SHA-256 and size"""
+    return {"profiles": await run_in_threadpool(profile_store.list)}
+
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, _: None = Depends(_require_admin)):
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if path.endswith(".json") else "text/plain"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
+
+
+async def _cached_resumes(digests: List[str], sections: List[str]) -> List[ParsedResume]:
+    """Earlier uploads from the parse cache: the client never sends them back, though each is decoded and validated"""
+    results = await asyncio.gather(
+        *(parse_pipeline.parse_cached(digest, sections) for digest in digests), return_exceptions=True
+    )
+    for digest, result in zip(digests, results):
+        if isinstance(result, Exception):
+            status_code, detail = _parse_error(digest, result)
+            raise HTTPException(status_code=status_code, detail=detail)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Resume {digest} not cached; upload it again")
+    return results
 
 
 @app.post("/api/merge")
 async def merge_resumes(request: MergeRequest):
-    """Merge multiple parsed resumes into one"""
-    if len(request.resumes) < 2:
+    """Merge multiple parsed resumes into one
+    
+    Resumes come inline or, for uploads still in the parse cache, as
+    `digests` (cheaper for large batches: nothing to send, and cache entries
+    decode in one pydantic-core pass rather than through request parsing).
+    """
+    settings = request.settings or MergeSettings()
+    resumes = request.resumes
+    if request.digests:
+        resumes = resumes + await _cached_resumes(request.digests, settings.include_sections)
+    if len(resumes) < 2:
         raise HTTPException(status_code=400, detail="Need at least 2 resumes to merge")
     
     try:
-        merged_resume = merger.merge(request.resumes, request.settings)
-        
-        return MergeResponse(
-            success=True,
-            merged_resume=merged_resume
+        # Off the event loop, so queued requests and health checks stay responsive
+        merged_resume = await run_in_threadpool(
+            profiler.call, "merge", lambda: request.model_dump_json().encode(),
+            merger.merge, resumes, settings
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error merging resumes: {str(e)}")
+    
+    return _json_response(MergeResponse(
+        success=True,
+        merged_resume=merged_resume
+    ))
+
+
+def _get_session(session_id: str) -> MergeSession:
+    session = merge_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Merge session not found or expired")
+    return session
+
+
+async def _session_response(session: MergeSession, added: Optional[List[str]] = None) -> Response:
+    try:
+        merged_resume = await run_in_threadpool(session.merge, merger)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error merging resumes: {str(e)}")
+    return _json_response(MergeSessionResponse(
+        success=True,
+        session_id=session.id,
+        resume_ids=list(session.resumes),
+        added=added or [],
+        merged_resume=merged_resume
+    ))
+
+
+async def _add_to_session(session: MergeSession, resumes: List[ParsedResume]) -> List[str]:
+    try:
+        return await run_in_threadpool(merge_sessions.add, session, resumes)
+    except SessionFull as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
+@app.post("/api/merge/sessions")
+async def create_merge_session(request: MergeSessionRequest):
+    """Start an incremental merge; resumes added later are folded in without re-merging the rest"""
+    session = merge_sessions.create(request.settings or MergeSettings())
+    try:
+        added = await _add_to_session(session, request.resumes)
+    except HTTPException:
+        merge_sessions.delete(session.id)
+        raise
+    return await _session_response(session, added)
+
+
+@app.get("/api/merge/sessions/{session_id}")
+async def get_merge_session(session_id: str):
+    """The session's current merged resume"""
+    return await _session_response(_get_session(session_id))
+
+
+@app.post("/api/merge/sessions/{session_id}/resumes")
+async def add_session_resumes(session_id: str, request: SessionResumesRequest):
+    """Add resumes to a session and return the updated merge"""
+    session = _get_session(session_id)
+    added = await _add_to_session(session, request.resumes)
+    return await _session_response(session, added)
+
+
+@app.delete("/api/merge/sessions/{session_id}/resumes/{resume_id}")
+async def remove_session_resume(session_id: str, resume_id: str):
+    """Take one resume out of a session and return the updated merge"""
+    session = _get_session(session_id)
+    if not await run_in_threadpool(session.remove, resume_id):
+        raise HTTPException(status_code=404, detail="Resume not in this session")
+    return await _session_response(session)
+
+
+@app.delete("/api/merge/sessions/{session_id}")
+async def delete_merge_session(session_id: str):
+    """Drop a session and its state"""
+    if not merge_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Merge session not found or expired")
+    return {"success": True}
+
+
+@app.get("/api/merge/sessions")
+async def merge_session_stats():
+    """Session counts and memory use for this worker"""
+    return merge_sessions.get_stats()
+
+
+EXPORT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header names the given ETag
+    
+    Only concrete tags count: `*` asks whether anything exists, which says
+    nothing about the rendering the client holds (and a POST can't be 304).
+    """
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _iter_chunks(data: bytes):
+    view = memoryview(data)
+    for start in range(0, len(view), STREAM_CHUNK_SIZE):
+        yield bytes(view[start:start + STREAM_CHUNK_SIZE])
+
+
+@app.get("/api/templates")
+async def list_templates():
+    """Available export layouts"""
+    return {"default": DEFAULT_TEMPLATE, "templates": list(TEMPLATES)}
+
+
+BATCH_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "zip": "application/zip"}
+
+
+async def _batch_groups(request: Request):
+    """Groups from an NDJSON body (spooled, then parsed line by line) or from one JSON document"""
+    ndjson = request.headers.get("content-type", "").startswith("application/x-ndjson")
+    max_bytes = config.BATCH_MAX_BYTES if ndjson else config.BATCH_MAX_JSON_BYTES
+    try:
+        if int(request.headers.get("content-length") or 0) > max_bytes:
+            raise BatchTooLarge(
+                f"Batch body exceeds {max_bytes} bytes" + ("" if ndjson else "; send groups as NDJSON instead")
+            )
+        if ndjson:
+            # The body can't be read lazily once the response has started, so it is spooled first
+            body = await spool(request.stream(), config.BATCH_SPOOL_BYTES, max_bytes)
+            return ndjson_groups(body, config.BATCH_MAX_LINE_BYTES, config.BATCH_MAX_GROUPS)
+        body = await read_body(request.stream(), max_bytes)
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    try:
+        batch = BatchRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch: {str(e)}")
+    if len(batch.groups) > config.BATCH_MAX_GROUPS:
+        raise HTTPException(status_code=413, detail=f"More than {config.BATCH_MAX_GROUPS} groups in one batch")
+    return listed_groups(batch.groups)
+
+
+def _batch_error(error: Exception) -> str:
+    if isinstance(error, BatchError):
+        return str(error)
+    if isinstance(error, BatchTimeout):
+        return f"Timed out after {config.BATCH_TIMEOUT:.0f}s"
+    return f"Error processing group: {str(error)}"
+
+
+def _batch_response(groups, process, format: str, result_fields, result_files) -> StreamingResponse:
+    """Stream a batch as NDJSON events or a ZIP archive, entry by entry as groups finish
+    
+    `result_fields(result)` gives the NDJSON fields for a finished group and
+    `result_files(result)` its (extension, bytes, compress) ZIP entries.
+    """
+    results = run_batch(groups, process, config.BATCH_CONCURRENCY)
+    
+    async def ndjson():
+        started = time.perf_counter()
+        count = errors = 0
+        async for index, group, result, error in results:
+            event = {"index": index, "id": group.id if group is not None else None}
+            if error is None:
+                count += 1
+                event.update(event="result", **result_fields(result))
+            else:
+                errors += 1
+                event.update(event="error", detail=_batch_error(error))
+            yield json.dumps(event) + "\n"
+        yield json.dumps({
+            "event": "done",
+            "count": count,
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }) + "\n"
+    
+    async def archive():
+        started = time.perf_counter()
+        stream = ZipStream()
+        manifest = []
+        async for index, group, result, error in results:
+            names = []
+            if error is None:
+                for extension, data, compress in result_files(result):
+                    names.append(f"{entry_name(index, group)}.{extension}")
+                    yield stream.add(names[-1], data, compress)
+            manifest.append(manifest_entry(index, group, names, None if error is None else _batch_error(error)))
+        yield stream.add("manifest.json", encode_manifest(manifest, started))
+        yield stream.close()
+    
+    if format == "zip":
+        headers = {"Content-Disposition": 'attachment; filename="batch.zip"'}
+        return StreamingResponse(archive(), media_type=BATCH_MEDIA_TYPES["zip"], headers=headers)
+    return StreamingResponse(ndjson(), media_type=BATCH_MEDIA_TYPES["ndjson"], headers={"Cache-Control": "no-cache"})
+
+
+@app.post("/api/merge/batch")
+async def merge_batch(request: Request, format: str = "ndjson"):
+    """Merge many candidates' resumes in one request
+    
+    The body is `{"groups": [...]}`, or NDJSON with one group per line
+    (`Content-Type: application/x-ndjson`), which is never held in memory whole.
+    Groups are merged in parallel on the batch worker pool; results stream back as
+    NDJSON events or, with `?format=zip`, as `<index>-<id>.json` entries plus
+    a manifest.json. A failed group reports its own error.
+    """
+    if format not in BATCH_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'zip'")
+    groups = await _batch_groups(request)
+    
+    async def merge_group(group: BatchGroup):
+        if len(group.resumes) < 2:
+            raise BatchError("Need at least 2 resumes to merge")
+        merged, _ = await batch_executor.merge_export(group.resumes, group.settings or MergeSettings(), [], "")
+        return merged
+    
+    return _batch_response(
+        groups, merge_group, format,
+        lambda merged: {"merged_resume": merged.model_dump(mode="json")},
+        lambda merged: [("json", encode_json(merged), True)]
+    )
+
+
+@app.post("/api/export/batch")
+async def export_batch(request: Request, formats: str = "pdf", template: str = DEFAULT_TEMPLATE, format: str = "zip"):
+    """Merge and render many candidates in one request
+    
+    Takes groups like /api/merge/batch (a group with a single resume is
+    rendered as is) and streams back a ZIP of `<index>-<id>.<pdf|docx>` files
+    plus a manifest.json, or NDJSON events with base64 `files` with
+    `?format=ndjson`.
+    """
+    if format not in BATCH_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'zip'")
+    format_list = [f.strip() for f in formats.split(",") if f.strip()]
+    if not format_list or any(f not in EXPORT_MEDIA_TYPES for f in format_list):
+        raise HTTPException(status_code=400, detail="Formats must be 'pdf' and/or 'docx'")
+    if template not in TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unknown template: {template}. Choose from {', '.join(TEMPLATES)}")
+    groups = await _batch_groups(request)
+    
+    async def render_group(group: BatchGroup):
+        if not group.resumes:
+            raise BatchError("Group has no resumes")
+        _, files = await batch_executor.merge_export(
+            group.resumes, group.settings or MergeSettings(), format_list, template
+        )
+        return files
+    
+    return _batch_response(
+        groups, render_group, format,
+        lambda files: {"files": {name: base64.b64encode(data).decode() for name, data in files.items()}},
+        lambda files: [(name, data, False) for name, data in files.items()]
+    )
 
 
 @app.post("/api/export/{format}")
-async def export_resume(format: str, resume_data: dict):
+async def export_resume(format: str, resume_data: dict, request: Request, template: str = DEFAULT_TEMPLATE):
     """Export merged resume as PDF or DOCX"""
-    if format not in ["pdf", "docx"]:
+    if format not in EXPORT_MEDIA_TYPES:
         raise HTTPException(status_code=400, detail="Format must be 'pdf' or 'docx'")
+    if template not in TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unknown template: {template}. Choose from {', '.join(TEMPLATES)}")
+    
+    key = exporter.cache_key(resume_data, format, template)
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    
+    # Client already has this exact rendering
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
     
     try:
-        output_path = exporter.export(resume_data, format)
-        
-        return FileResponse(
-            output_path,
-            media_type="application/pdf" if format == "pdf" else "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            filename=f"merged_resume.{format}"
+        data = await run_in_threadpool(
+            profiler.call, f"export_{format}", lambda: json.dumps(resume_data, sort_keys=True).encode(),
+            exporter.export, resume_data, format, key, template
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error exporting resume: {str(e)}")
+    
+    headers["Content-Length"] = str(len(data))
+    headers["Content-Disposition"] = f'attachment; filename="merged_resume.{format}"'
+    return StreamingResponse(_iter_chunks(data), media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(
+    files: List[UploadFile] = File(...),
+    settings: Optional[str] = Form(None),
+    formats: str = Form("pdf"),
+    template: str = Form(DEFAULT_TEMPLATE)
+):
+    """Queue upload -> parse -> merge -> export and return immediately"""
+    try:
+        merge_settings = MergeSettings.model_validate_json(settings) if settings else MergeSettings()
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid settings: {str(e)}")
+    _check_sections(merge_settings.include_sections)
+    
+    format_list = [f.strip() for f in formats.split(",") if f.strip()]
+    if any(f not in EXPORT_MEDIA_TYPES for f in format_list):
+        raise HTTPException(status_code=400, detail="Formats must be 'pdf' and/or 'docx'")
+    if template not in TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unknown template: {template}. Choose from {', '.join(TEMPLATES)}")
+    
+    uploads = await _ingest_files(files)
+    # Writes every upload into SQLite; keep that off the event loop
+    job_id = await run_in_threadpool(job_runner.store.create, uploads, merge_settings, format_list, template)
+    job_runner.submit(job_id)
+    
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Poll a job's status"""
+    job = await run_in_threadpool(job_runner.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    merged = job.pop("merged")
+    if job["status"] == DONE:
+        job["merged_resume"] = ParsedResume.model_validate_json(merged)
+    return _json_response(job)
+
+
+@app.delete("/api/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """Delete a finished or failed job and everything stored with it"""
+    job = await run_in_threadpool(job_runner.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] in (QUEUED, RUNNING):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}; delete it once it has finished")
+    await run_in_threadpool(job_runner.store.delete, job_id)
+    return {"success": True}
+
+
+@app.get("/api/jobs/{job_id}/result/{format}")
+async def get_job_result(job_id: str, format: str, template: Optional[str] = None):
+    """Download a finished job's export; other formats/templates are rendered from the stored merge"""
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Format must be 'pdf' or 'docx'")
+    
+    job = await run_in_threadpool(job_runner.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job["merged"]:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}, result not ready")
+    
+    template = template or job["template"]
+    if template not in TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unknown template: {template}. Choose from {', '.join(TEMPLATES)}")
+    
+    merged = ParsedResume.model_validate_json(job["merged"])
+    try:
+        data = await job_runner.render(job_id, merged, format, template)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting resume: {str(e)}")
+    
+    headers = {"Content-Disposition": f'attachment; filename="merged_resume.{format}"'}
+    return Response(content=data, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,10 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 
 
+# Sections that can be parsed and merged independently (see MergeSettings.include_sections)
+RESUME_SECTIONS = ["personal_info", "skills", "experience", "education", "projects"]
+
+
 class PersonalInfo(BaseModel):
     name: Optional[str] = None
     email: Optional[str] = None
@@ -57,17 +61,48 @@ class ParsedResume(BaseModel):
 
 
 class MergeSettings(BaseModel):
-    include_sections: List[str] = ["personal_info", "skills", "experience", "education", "projects"]
+    include_sections: List[str] = RESUME_SECTIONS
     max_skills: int = 30
-    sort_experience_by: str = "date"  # "date" or "relevance"
+    sort_experience_by: str = "date"  # "date" or "relevance" (to job_description)
+    job_description: Optional[str] = None  # Relevance mode also ranks bullets, projects and skills against it
     deduplicate_threshold: int = 85  # Fuzzy match threshold (0-100)
+    bullet_dedup_threshold: int = 70  # Shingle similarity for near-duplicate bullets (0-100, above 100 keeps all)
 
 
 class MergeRequest(BaseModel):
-    resumes: List[ParsedResume]
+    resumes: List[ParsedResume] = []
+    # Earlier uploads by digest, merged after `resumes` from the server's own parse cache
+    digests: List[str] = []
     settings: Optional[MergeSettings] = MergeSettings()
 
 
 class MergeResponse(BaseModel):
     success: bool
     merged_resume: ParsedResume
+
+
+class BatchGroup(BaseModel):
+    id: Optional[str] = None  # Names the group's output files
+    resumes: List[ParsedResume]
+    settings: Optional[MergeSettings] = MergeSettings()
+
+
+class BatchRequest(BaseModel):
+    groups: List[BatchGroup]
+
+
+class MergeSessionRequest(BaseModel):
+    resumes: List[ParsedResume] = []
+    settings: Optional[MergeSettings] = MergeSettings()
+
+
+class SessionResumesRequest(BaseModel):
+    resumes: List[ParsedResume]
+
+
+class MergeSessionResponse(BaseModel):
+    success: bool
+    session_id: str
+    resume_ids: List[str]
+    added: List[str] = []
+    merged_resume: ParsedResume
@@ -0,0 +1,46 @@
+"""Production entrypoint.
+
+    python serve.py                       # PORT / WEB_CONCURRENCY / WARMUP from the environment
+    python serve.py --workers 2 --warmup
+
+Heavy backends are imported lazily, so a worker starts quickly and the first
+request that needs each backend pays for loading it. --warmup (WARMUP=1)
+moves that cost into startup: each worker imports the backends, builds the
+export templates and starts its parse processes before accepting traffic.
+Workers log their import and warm-up time at startup and the latency of the
+first request to each route; the same numbers are on /metrics
+(resume_startup_seconds, resume_first_request_seconds).
+
+`python main.py` is still the auto-reloading development server.
+"""
+import argparse
+import os
+
+import uvicorn
+
+import config
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    arg_parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    arg_parser.add_argument("--workers", type=int, default=config.WEB_CONCURRENCY, help="uvicorn worker processes")
+    arg_parser.add_argument("--warmup", action=argparse.BooleanOptionalAction, default=config.WARMUP,
+                            help="preload backends before accepting traffic")
+    args = arg_parser.parse_args()
+
+    # A single worker runs in this process; with more, each worker re-imports config from the environment
+    config.WARMUP = args.warmup
+    os.environ["WARMUP"] = "1" if args.warmup else "0"
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
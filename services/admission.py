@@ -0,0 +1,115 @@
+"""Admission control for CPU-heavy endpoints.
+
+Each endpoint class (parse, merge, export) gets a gate: a fixed number of
+requests run at once, a bounded FIFO queue waits behind them, and a request
+that can't be queued, or waits longer than the queue-time budget, is turned
+away with `Overloaded` (503 + Retry-After) instead of piling on more work.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from services import metrics
+
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+
+
+class Overloaded(Exception):
+    """The gate can't take the request now; retry after `retry_after` seconds"""
+
+    def __init__(self, gate: str, reason: str, retry_after: int):
+        super().__init__(f"Server busy ({gate}): {reason.replace('_', ' ')}")
+        self.gate = gate
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """At most `limit` holders, at most `queue_size` waiters, each waiting at most `queue_timeout`"""
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Moving average of how long a holder keeps its slot, for Retry-After
+        self._service_time = 1.0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {QUEUE_FULL: 0, QUEUE_TIMEOUT: 0}
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until the queue ahead of a new request has likely drained"""
+        return max(1, math.ceil((self.queued + 1) * self._service_time / self.limit))
+
+    def _reject(self, reason: str):
+        self.rejected[reason] += 1
+        metrics.ADMISSION_REJECTED.inc(gate=self.name, reason=reason)
+        raise Overloaded(self.name, reason, self.retry_after())
+
+    def _update_gauges(self):
+        metrics.ADMISSION_ACTIVE.set(self.active, gate=self.name)
+        metrics.ADMISSION_QUEUED.set(self.queued, gate=self.name)
+
+    async def acquire(self) -> float:
+        """Take a slot, waiting in the queue if needed; returns the acquisition time"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+        else:
+            if self.queued >= self.queue_size:
+                self._reject(QUEUE_FULL)
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._update_gauges()
+            try:
+                await asyncio.wait_for(waiter, self.queue_timeout)
+            except BaseException as e:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just as we gave up on it
+                    self._pass_on()
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._update_gauges()
+                if isinstance(e, asyncio.TimeoutError):
+                    self._reject(QUEUE_TIMEOUT)
+                raise
+
+        self.admitted += 1
+        self._update_gauges()
+        return time.perf_counter()
+
+    def release(self, acquired: float):
+        """Give the slot back (`acquired` is what acquire() returned)"""
+        self._service_time = 0.8 * self._service_time + 0.2 * (time.perf_counter() - acquired)
+        self._pass_on()
+
+    def _pass_on(self):
+        # Hand the slot straight to the next waiter so a newcomer can't jump the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self.active -= 1
+        self._update_gauges()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "active": self.active,
+            "queued": self.queued,
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "queue_timeout": self.queue_timeout,
+        }
@@ -0,0 +1,205 @@
+"""Batch merge/export: many candidate groups per request, results streamed as they finish.
+
+Groups arrive as NDJSON, one group per line, or as one JSON document. An
+NDJSON body is spooled (to disk past a threshold, up to a total cap) and parsed
+a line at a time; a JSON document is only accepted up to a smaller size.
+At most `window` groups are in flight at once, and each result is written out
+before another group is read, so memory is bounded by the window rather than
+by the size of the batch. A group that fails reports its own error; the rest
+of the batch carries on.
+"""
+import asyncio
+import json
+import re
+import tempfile
+import time
+import zipfile
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, ValidationError
+
+from models.schemas import BatchGroup
+
+# Index of the group in the request, then the group or why it couldn't be read
+GroupItem = Tuple[int, Union[BatchGroup, Exception]]
+
+
+class BatchError(Exception):
+    """A group failed; the message is reported in its entry"""
+
+
+class BatchTooLarge(Exception):
+    """The request body is over its size limit (413)"""
+
+
+def _describe_validation(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'group'}: {e['msg']}" for e in error.errors()[:3])
+
+
+def _parse_group(line: bytes) -> Union[BatchGroup, Exception]:
+    try:
+        return BatchGroup.model_validate_json(line)
+    except ValidationError as e:
+        return BatchError(f"Invalid group: {_describe_validation(e)}")
+
+
+async def read_body(chunks: AsyncIterator[bytes], max_bytes: int) -> bytes:
+    """A streamed body in memory, refused once it passes `max_bytes`"""
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if len(body) > max_bytes:
+            raise BatchTooLarge(f"JSON batch body exceeds {max_bytes} bytes; send groups as NDJSON instead")
+    return bytes(body)
+
+
+async def spool(chunks: AsyncIterator[bytes], max_memory: int, max_bytes: int) -> BinaryIO:
+    """Copy a streamed body into a temporary file, in memory up to `max_memory` bytes, refused past `max_bytes`"""
+    body = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise BatchTooLarge(f"Batch body exceeds {max_bytes} bytes")
+            body.write(chunk)
+    except BaseException:
+        body.close()
+        raise
+    body.seek(0)
+    return body
+
+
+async def ndjson_groups(body: BinaryIO, max_line_bytes: int, max_groups: int) -> AsyncIterator[GroupItem]:
+    """Groups from a spooled NDJSON body, one line at a time; closes `body` when done
+
+    Lines are read (possibly from disk) and validated in a thread, off the event loop.
+    """
+    index = 0
+    try:
+        while line := await asyncio.to_thread(body.readline, max_line_bytes + 1):
+            if len(line) > max_line_bytes:
+                # No way to find the next group without reading this line whole
+                yield index, BatchError(f"Line longer than {max_line_bytes} bytes; batch truncated here")
+                return
+            if line.strip() and index >= max_groups:
+                yield index, BatchError(f"More than {max_groups} groups; batch truncated here")
+                return
+            if line.strip():
+                yield index, await asyncio.to_thread(_parse_group, line)
+                index += 1
+    finally:
+        body.close()
+
+
+async def listed_groups(groups: Iterable[BatchGroup]) -> AsyncIterator[GroupItem]:
+    for index, group in enumerate(groups):
+        yield index, group
+
+
+async def run_batch(
+    groups: AsyncIterator[GroupItem],
+    process: Callable[[BatchGroup], Awaitable[Any]],
+    window: int
+) -> AsyncIterator[Tuple[int, Optional[BatchGroup], Any, Optional[Exception]]]:
+    """Yield (index, group, result, error) in completion order, with at most `window` groups in flight"""
+
+    async def tagged(index: int, group: BatchGroup):
+        try:
+            return index, group, await process(group), None
+        except Exception as e:
+            return index, group, None, e
+
+    pending = set()
+    try:
+        async for index, group in groups:
+            if isinstance(group, Exception):
+                yield index, None, None, group
+                continue
+            pending.add(asyncio.ensure_future(tagged(index, group)))
+            if len(pending) >= window:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # Client went away: don't keep rendering for nobody
+        for task in pending:
+            task.cancel()
+
+
+def entry_name(index: int, group: Optional[BatchGroup]) -> str:
+    """File name stem for a group's outputs: its position, plus its id made path-safe"""
+    group_id = group.id if group is not None else None
+    if not group_id:
+        return f"{index:05d}"
+    return f"{index:05d}-{re.sub(r'[^A-Za-z0-9._-]+', '_', group_id)[:80]}"
+
+
+class _Sink:
+    """Write-only file object that hands written bytes back to the caller"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ZipStream:
+    """Build a ZIP archive incrementally; each call returns the bytes ready to send.
+
+    The output is never seeked, so zipfile writes data descriptors after each
+    entry, and only the entry being added is held in memory.
+    """
+
+    def __init__(self):
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w")
+
+    def add(self, name: str, data: bytes, compress: bool = True) -> bytes:
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        # PDF and DOCX are compressed already
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self._zip.writestr(info, data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._sink.drain()
+
+
+def manifest_entry(index: int, group: Optional[BatchGroup], files: List[str],
+                   error: Optional[str]) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {"index": index, "id": group.id if group is not None else None}
+    if error is None:
+        entry.update(status="ok", files=files)
+    else:
+        entry.update(status="error", detail=error)
+    return entry
+
+
+def encode_json(model: BaseModel) -> bytes:
+    return model.model_dump_json(indent=2).encode()
+
+
+def encode_manifest(entries: List[Dict[str, Any]], started: float) -> bytes:
+    errors = sum(1 for entry in entries if entry["status"] == "error")
+    return json.dumps({
+        "count": len(entries) - errors,
+        "errors": errors,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "entries": sorted(entries, key=lambda entry: entry["index"]),
+    }, indent=2).encode()
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from models.schemas import RESUME_SECTIONS, ParsedResume
+from services import metrics
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of the raw uploaded bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class LRUCache:
+    """In-memory LRU cache of bytes values, evicting by total size"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class DiskCache:
+    """SQLite-backed cache that several worker processes can share"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        # WAL lets readers in other processes proceed while one worker writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT NOT NULL, version TEXT NOT NULL, value BLOB NOT NULL,"
+            " PRIMARY KEY (key, version))"
+        )
+
+    def get(self, key: str, version: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND version = ?", (key, version)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, version: str, value: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, version, value) VALUES (?, ?, ?)",
+                (key, version, value)
+            )
+
+    def prune(self, keep_version: str) -> int:
+        """Delete entries written by any other parser version"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM entries WHERE version != ?", (keep_version,))
+        return cursor.rowcount
+
+    def clear(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM entries")
+        return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class _StoredEntry(BaseModel):
+    """The layout to_json() writes, so an entry decodes in one pydantic-core pass"""
+
+    text: str
+    sections: List[str]
+    resume: ParsedResume
+
+
+class ParseEntry:
+    """A file's extracted text plus the sections parsed from it so far"""
+
+    def __init__(self, text: str, sections: Iterable[str], resume: ParsedResume):
+        self.text = text
+        self.sections = set(sections)
+        self.resume = resume
+
+    def missing(self, sections: Iterable[str]) -> set:
+        return set(sections) - self.sections
+
+    def add(self, sections: Iterable[str], resume: ParsedResume):
+        """Fold in sections parsed later from the same text"""
+        sections = set(sections)
+        self.resume = self.resume.model_copy(update={name: getattr(resume, name) for name in sections})
+        self.sections |= sections
+
+    def select(self, sections: Iterable[str]) -> ParsedResume:
+        """The resume with only `sections` filled in"""
+        dropped = set(RESUME_SECTIONS) - set(sections)
+        if not dropped:
+            # Entries are decoded afresh on every get(), so there is no shared copy to protect
+            return self.resume
+        defaults = ParsedResume(personal_info={})
+        return self.resume.model_copy(update={name: getattr(defaults, name) for name in dropped})
+
+    def to_json(self) -> bytes:
+        return json.dumps({
+            "text": self.text,
+            "sections": sorted(self.sections),
+            "resume": self.resume.model_dump(mode="json"),
+        }).encode()
+
+    @classmethod
+    def from_json(cls, value: bytes) -> "ParseEntry":
+        """Decode an entry written by to_json()
+
+        It is still validated: model_construct rebuilds the nested models in
+        Python and measures slower than pydantic-core validating the bytes
+        directly, with no json.loads dicts in between.
+        """
+        stored = _StoredEntry.model_validate_json(value)
+        return cls(stored.text, stored.sections, stored.resume)
+
+
+class ParseCache:
+    """Two-tier content-addressed cache of extracted text and parsed sections.
+
+    Entries are keyed by the SHA-256 of the uploaded file and stamped with the
+    parser fingerprint, so changing skill keywords or parsing rules makes old
+    entries unreachable; prune() then reclaims their space.
+    """
+
+    # Bump when the stored entry layout changes
+    FORMAT = "2"
+
+    def __init__(self, version: str, memory_bytes: int = 64 * 1024 * 1024, disk_path: Optional[str] = None):
+        self.version = f"{version}.{self.FORMAT}"
+        self.memory = LRUCache(memory_bytes)
+        self.disk = DiskCache(disk_path) if disk_path else None
+        self.stats: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _memory_key(self, digest: str) -> str:
+        return f"{self.version}:{digest}"
+
+    def _from_memory(self, digest: str) -> Optional[ParseEntry]:
+        value = self.memory.get(self._memory_key(digest))
+        if value is None:
+            return None
+        self.stats["memory_hits"] += 1
+        metrics.CACHE_LOOKUPS.inc(cache="parse", result="memory_hit")
+        return ParseEntry.from_json(value)
+
+    def _from_disk(self, digest: str, value: Optional[bytes]) -> Optional[ParseEntry]:
+        if value is None:
+            self.stats["misses"] += 1
+            metrics.CACHE_LOOKUPS.inc(cache="parse", result="miss")
+            return None
+        self.stats["disk_hits"] += 1
+        metrics.CACHE_LOOKUPS.inc(cache="parse", result="disk_hit")
+        self.memory.put(self._memory_key(digest), value)
+        return ParseEntry.from_json(value)
+
+    def get(self, digest: str) -> Optional[ParseEntry]:
+        entry = self._from_memory(digest)
+        if entry is not None:
+            return entry
+        return self._from_disk(digest, self.disk.get(digest, self.version) if self.disk is not None else None)
+
+    async def get_async(self, digest: str) -> Optional[ParseEntry]:
+        """get() for the event loop: the memory tier inline, the disk read in a thread"""
+        entry = self._from_memory(digest)
+        if entry is not None:
+            return entry
+        value = await asyncio.to_thread(self.disk.get, digest, self.version) if self.disk is not None else None
+        return self._from_disk(digest, value)
+
+    def put(self, digest: str, entry: ParseEntry):
+        value = entry.to_json()
+        self.memory.put(self._memory_key(digest), value)
+        if self.disk is not None:
+            self.disk.put(digest, self.version, value)
+
+    async def put_async(self, digest: str, entry: ParseEntry):
+        """put() for the event loop: the memory tier inline, the disk write in a thread"""
+        value = entry.to_json()
+        self.memory.put(self._memory_key(digest), value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.put, digest, self.version, value)
+
+    def prune(self) -> int:
+        """Drop disk entries from older parser versions"""
+        return self.disk.prune(self.version) if self.disk is not None else 0
+
+    def invalidate(self) -> int:
+        """Drop every cached result, e.g. after hand-editing parsing rules"""
+        self.memory.clear()
+        return self.disk.clear() if self.disk is not None else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = sum(self.stats.values())
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.size,
+            "disk_entries": self.disk.count() if self.disk is not None else 0,
+            "version": self.version,
+        }
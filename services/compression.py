@@ -0,0 +1,76 @@
+"""Negotiated gzip for large, complete responses.
+
+Only responses that declare their length and have a compressible content type
+(JSON, text) are compressed, once they reach `minimum_size` bytes. Streamed
+responses (NDJSON, SSE, batch ZIPs) carry no Content-Length and pass through
+untouched, so their events still go out as they happen; PDF and DOCX bodies
+are compressed already.
+"""
+import gzip
+from typing import List
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (an explicit q=0 refuses it)"""
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        if name.strip() not in ("gzip", "*"):
+            continue
+        quality = params.strip().removeprefix("q=")
+        try:
+            return not params.strip() or float(quality) > 0
+        except ValueError:
+            return True
+    return False
+
+
+class GZipMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 4096, level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.minimum_size:
+            await self.app(scope, receive, send)
+            return
+        if not accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            await self.app(scope, receive, send)
+            return
+
+        start: List[Message] = []
+        chunks: List[bytes] = []
+
+        async def send_compressed(message: Message):
+            if message["type"] == "http.response.start":
+                if self._compressible(Headers(raw=message["headers"])):
+                    # Held back until the whole body is here
+                    start.append(message)
+                    return
+            elif message["type"] == "http.response.body" and start:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                body = gzip.compress(b"".join(chunks), compresslevel=self.level)
+                headers = MutableHeaders(raw=start[0]["headers"])
+                headers["Content-Encoding"] = "gzip"
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                await send(start[0])
+                message = {"type": "http.response.body", "body": body}
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, headers: Headers) -> bool:
+        length = headers.get("content-length")
+        return (
+            length is not None and int(length) >= self.minimum_size
+            and "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        )
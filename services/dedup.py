@@ -0,0 +1,358 @@
+import re
+from typing import Dict, Hashable, Iterable, Iterator, List, Set, Tuple
+
+# Rows of the similarity matrix computed per cdist call, to bound memory
+BLOCK_SIZE = 2048
+
+
+class UnionFind:
+    """Disjoint sets whose root is always the smallest member index"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Keeping the smaller index as root makes labels independent of merge order
+            if root_a < root_b:
+                self.parent[root_b] = root_a
+            else:
+                self.parent[root_a] = root_b
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def similar_pairs(queries: List[str], choices: List[str], threshold: int, workers: int = -1) -> Iterator[Tuple[int, int]]:
+    """(query index, choice index) of every pair scoring at least `threshold`"""
+    # Imported here: numpy and rapidfuzz add noticeably to worker start-up
+    import numpy as np
+    from rapidfuzz import fuzz, process
+
+    if not queries or not choices or threshold > 100:
+        return
+    for start in range(0, len(queries), BLOCK_SIZE):
+        scores = process.cdist(
+            queries[start:start + BLOCK_SIZE],
+            choices,
+            scorer=fuzz.ratio,
+            score_cutoff=threshold,
+            dtype=np.uint8,
+            workers=workers
+        )
+        rows, cols = np.nonzero(scores >= threshold)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            yield row + start, col
+
+
+def cluster_names(names: List[str], threshold: int, workers: int = -1) -> List[int]:
+    """Group near-duplicate names, returning a cluster label per input name.
+
+    Exact duplicates are folded by hashing first, so only distinct names reach
+    the fuzzy stage. Those are compared all-pairs with one vectorized
+    rapidfuzz cdist (multi-threaded through `workers`), and every pair scoring
+    at least `threshold` is unioned. The label of each name is the index of the
+    first name in its cluster, so clusters come out in first-appearance order.
+    """
+    first_index = {}
+    unique_positions = []
+    for position, name in enumerate(names):
+        if name not in first_index:
+            first_index[name] = position
+            unique_positions.append(position)
+
+    unique_names = [names[position] for position in unique_positions]
+    sets = UnionFind(len(unique_names))
+
+    if len(unique_names) > 1:
+        for row, col in similar_pairs(unique_names, unique_names, threshold, workers):
+            if col > row:
+                sets.union(row, col)
+
+    unique_labels = [unique_positions[sets.find(i)] for i in range(len(unique_names))]
+    label_of = dict(zip(unique_names, unique_labels))
+    return [label_of[name] for name in names]
+
+
+class Clusters:
+    """Connected components of a similarity graph, kept up to date as items come and go.
+
+    Distinct items are nodes, joined wherever `_pairs()` reports a match.
+    Adding k items only matches them against those already present, and
+    removing an item re-walks only its own component, which may split.
+    Subclasses define what matches.
+    """
+
+    def __init__(self):
+        self._counts: Dict[Hashable, int] = {}
+        self._edges: Dict[Hashable, Set[Hashable]] = {}
+        self._component: Dict[Hashable, int] = {}
+        self._members: Dict[int, Set[Hashable]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def label(self, item: Hashable) -> int:
+        return self._component[item]
+
+    def _pairs(self, new: List[Hashable], present: List[Hashable]) -> Iterator[Tuple[Hashable, Hashable]]:
+        """Matching (new item, item) pairs, the second from `present` or `new`"""
+        raise NotImplementedError
+
+    def _forget(self, item: Hashable):
+        """Drop any lookup state `_pairs()` keeps for an item that is gone"""
+
+    def add(self, items: Iterable[Hashable]):
+        new = []
+        for item in items:
+            if item in self._counts:
+                self._counts[item] += 1
+            else:
+                self._counts[item] = 1
+                new.append(item)
+        if not new:
+            return
+
+        present = list(self._edges)
+        for item in new:
+            self._edges[item] = set()
+            self._new_component({item})
+        for a, b in self._pairs(new, present):
+            if a != b:
+                self._edges[a].add(b)
+                self._edges[b].add(a)
+                self._join(a, b)
+
+    def remove(self, items: Iterable[Hashable]):
+        affected = set()
+        for item in items:
+            self._counts[item] -= 1
+            if self._counts[item]:
+                continue
+            del self._counts[item]
+            self._forget(item)
+            for other in self._edges.pop(item):
+                if other in self._edges:
+                    self._edges[other].discard(item)
+            component = self._component.pop(item)
+            self._members[component].discard(item)
+            affected.add(component)
+
+        # What is left of each touched component may have fallen apart
+        for component in affected:
+            remaining = self._members.pop(component)
+            while remaining:
+                start = remaining.pop()
+                reached = {start}
+                stack = [start]
+                while stack:
+                    for other in self._edges[stack.pop()]:
+                        if other not in reached:
+                            reached.add(other)
+                            stack.append(other)
+                remaining -= reached
+                self._new_component(reached)
+
+    def _new_component(self, items: Set[Hashable]):
+        component = self._next_id
+        self._next_id += 1
+        self._members[component] = items
+        for item in items:
+            self._component[item] = component
+
+    def _join(self, a: Hashable, b: Hashable):
+        keep, drop = self._component[a], self._component[b]
+        if keep == drop:
+            return
+        # Relabel the smaller side
+        if len(self._members[keep]) < len(self._members[drop]):
+            keep, drop = drop, keep
+        moved = self._members.pop(drop)
+        for item in moved:
+            self._component[item] = keep
+        self._members[keep] |= moved
+
+
+class NameClusters(Clusters):
+    """The clusters of cluster_names(), kept up to date as names come and go.
+
+    A name's cluster is its connected component under pairs scoring at least
+    `threshold`, which is exactly what cluster_names() computes from scratch.
+    Adding k names scores them against the n already present (k x n rather
+    than re-running n x n).
+    """
+
+    def __init__(self, threshold: int, workers: int = -1):
+        super().__init__()
+        self.threshold = threshold
+        self.workers = workers
+
+    def _pairs(self, new: List[str], present: List[str]) -> Iterator[Tuple[str, str]]:
+        choices = present + new
+        for row, col in similar_pairs(new, choices, self.threshold, self.workers):
+            yield new[row], choices[col]
+
+
+# MinHash/LSH for near-duplicate text: signature length, split into bands of equal rows
+MINHASH_PERMUTATIONS = 32
+MINHASH_BANDS = 8
+# Character shingles of normalized text, each hashed from its code points to 32 bits
+SHINGLE_SIZE = 4
+# Candidate pairs estimated this many points below the threshold are not checked (about 3 std devs)
+MINHASH_MARGIN = 25
+# Shingles hashed per numpy pass, to bound memory (each takes MINHASH_PERMUTATIONS words)
+MINHASH_CHUNK = 1 << 15
+# Each bucket member is paired with at most this many earlier members, so a large bucket of
+# variants of one text stays linear; clusters are transitive, so neighbours link them anyway
+MINHASH_NEIGHBOURS = 4
+# Unicode letters and digits, so non-Latin and accented text keeps its words
+_WORD = re.compile(r"[^\W_]+")
+_SHINGLE_MIX = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def shingle_arrays(texts: List[str]):
+    """(shingles, ends): every text's character 4-gram hashes as uint32, concatenated; text i ends at ends[i].
+
+    A text shorter than a shingle is one shingle padded with newlines, so
+    every text has at least one.
+    """
+    import numpy as np
+
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    # Newlines never occur in normalized text, so no shingle spans two texts unnoticed
+    data = np.frombuffer(("\n".join(texts) + "\n" * SHINGLE_SIZE).encode("utf-32-le"), dtype=np.uint32)
+    data = data.astype(np.uint64)
+    # Code points are at most 21 bits; mix four with odd multipliers and keep the high 32 bits
+    mixed = data[:-3] * _SHINGLE_MIX[0] + data[1:-2] * _SHINGLE_MIX[1] + data[2:-1] * _SHINGLE_MIX[2] + data[3:]
+    mixed *= _SHINGLE_MIX[3]
+    packed = (mixed >> np.uint64(32)).astype(np.uint32)
+
+    offsets = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+    counts = np.maximum(lengths - SHINGLE_SIZE + 1, 1)
+    ends = np.cumsum(counts)
+    starts = np.repeat(offsets - (ends - counts), counts) + np.arange(ends[-1] if len(ends) else 0)
+    return packed[starts], ends
+
+
+def minhash_signatures(shingles, ends):
+    """MinHash signature of each text's shingles, as an (n, MINHASH_PERMUTATIONS) uint32 array"""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    # Multiply-shift hashing: the high 32 bits of a * h + b (mod 2**64), with a odd
+    a = rng.integers(0, 1 << 63, MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, MINHASH_PERMUTATIONS, dtype=np.uint64)
+    values = shingles.astype(np.uint64)
+    signatures = np.empty((MINHASH_PERMUTATIONS, len(ends)), dtype=np.uint64)
+
+    first = 0
+    while first < len(ends):
+        start = ends[first - 1] if first else 0
+        # Whole texts only, at least one per pass
+        last = max(first + 1, int(np.searchsorted(ends, start + MINHASH_CHUNK, side="right")))
+        # One row per permutation, so each text's minimum is a contiguous reduction
+        hashed = np.multiply.outer(a, values[start:ends[last - 1]])
+        hashed += b[:, None]
+        hashed >>= np.uint64(32)
+        text_starts = np.concatenate(([start], ends[first:last - 1])) - start
+        signatures[:, first:last] = np.minimum.reduceat(hashed, text_starts, axis=1)
+        first = last
+    return signatures.T.astype(np.uint32)
+
+
+def near_duplicates(texts: List[str], groups: List[int], threshold: int) -> List[int]:
+    """Label each text with the index of the first near-duplicate in its group (its own index if none).
+
+    Texts only match within the same group. Exact duplicates (after
+    normalization) are folded first. The rest get MinHash signatures, and LSH
+    banding over all groups at once proposes candidate pairs: texts sharing a
+    band in the same group. Only those pairs are checked, by exact Jaccard
+    similarity of their shingles against `threshold` (0-100), so the cost
+    grows with the number of texts rather than the number of pairs.
+    """
+    import numpy as np
+
+    labels = list(range(len(texts)))
+    if threshold > 100 or not texts:
+        return labels
+
+    first_index: Dict[Tuple[int, str], int] = {}
+    unique: List[int] = []
+    for position, (group, text) in enumerate(zip(groups, texts)):
+        key = (group, normalize_text(text))
+        if not key[1]:
+            # No words (symbols only): nothing to compare, so never a duplicate
+            continue
+        if key in first_index:
+            labels[position] = first_index[key]
+        else:
+            first_index[key] = position
+            unique.append(position)
+    if len(unique) < 2:
+        return labels
+
+    keys = list(first_index)
+    shingles, ends = shingle_arrays([text for _, text in keys])
+    signatures = minhash_signatures(shingles, ends)
+    unique_groups = np.asarray([group for group, _ in keys], dtype=np.uint32)
+
+    sets: Dict[int, Set[int]] = {}
+
+    def shingle_set(k: int) -> Set[int]:
+        if k not in sets:
+            sets[k] = set(shingles[(ends[k - 1] if k else 0):ends[k]].tolist())
+        return sets[k]
+
+    # Candidate pairs from every band, as left * n + right codes, each checked once
+    n = len(unique)
+    codes = []
+    for band in np.split(signatures, MINHASH_BANDS, axis=1):
+        # A bucket is a (group, band values) combination; only shared buckets matter
+        _, buckets = np.unique(np.column_stack([unique_groups, band]), axis=0, return_inverse=True)
+        buckets = buckets.ravel()
+        shared = np.flatnonzero(np.bincount(buckets)[buckets] > 1)
+        order = shared[np.argsort(buckets[shared], kind="stable")]
+        # Every later member of a bucket pairs with the few members just before it
+        same = buckets[order[1:]] == buckets[order[:-1]]
+        gap = 1
+        while same.any() and gap <= MINHASH_NEIGHBOURS:
+            codes.append(order[:-gap][same] * n + order[gap:][same])
+            gap += 1
+            same = same[:-1] & (buckets[order[gap:]] == buckets[order[:-gap]])
+
+    found = UnionFind(n)
+    if not codes:
+        return labels
+    left, right = np.divmod(np.unique(np.concatenate(codes)), n)
+    # The share of equal signature values estimates each pair's similarity: pairs well below the
+    # threshold are dropped, identical signatures (about 1e-5 likely at 70%) need no check
+    estimate = (signatures[left] == signatures[right]).mean(axis=1) * 100
+    keep = estimate >= threshold - MINHASH_MARGIN
+    for left, right, certain in zip(left[keep].tolist(), right[keep].tolist(), (estimate[keep] == 100).tolist()):
+        if found.find(left) == found.find(right):
+            continue
+        if not certain:
+            a, b = shingle_set(left), shingle_set(right)
+            common = len(a & b)
+            if common * 100 < threshold * (len(a) + len(b) - common):
+                continue
+        found.union(left, right)
+
+    # Folded duplicates point at a unique text; relabel through its cluster
+    label_of = {position: unique[found.find(k)] for k, position in enumerate(unique)}
+    return [label_of.get(label, label) for label in labels]
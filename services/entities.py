@@ -0,0 +1,200 @@
+"""Entity resolution for experience and education entries.
+
+The same job or degree is often written differently across resumes: "Sr.
+Engineer | Acme Inc" and "Senior Engineer | ACME" are one entry. Organization
+and role names are normalized first (case, punctuation, legal suffixes, common
+abbreviations), and identical normalized records are folded. The rest are
+blocked by organization token and year, so a record is only compared with
+those that share a distinctive organization token and a year within one of its
+own (or have no year). Within a block, both names must score at least the
+threshold with rapidfuzz. Matches are unioned, so clusters are transitive and
+labeled by their first record, like cluster_names().
+
+A record with no role is never matched. A record with no organization (or the
+parser's placeholder for one) only folds with records of the exact same role
+and year, since without an organization a similar title says little.
+"""
+import re
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from models.schemas import Education, Experience
+from services.dedup import Clusters, UnionFind
+
+# Unicode letters and digits, so non-Latin and accented names keep their words
+_WORD = re.compile(r"[^\W_]+")
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+
+LEGAL_SUFFIXES = frozenset("inc incorporated llc llp ltd limited corp corporation co company plc gmbh ag sa pvt".split())
+# What ResumeParser writes when a line names no organization
+PLACEHOLDER_ORGANIZATIONS = frozenset(["unknown", "parsed from resume"])
+FILLER_WORDS = frozenset("the of and at in for a an".split())
+# Too common in organization names to narrow a block on their own
+GENERIC_TOKENS = frozenset(
+    "technologies technology tech solutions systems services group global international labs software "
+    "consulting partners holdings enterprises digital university college institute school".split()
+)
+ABBREVIATIONS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "eng": "engineer", "engr": "engineer", "mgr": "manager",
+    "dev": "developer", "asst": "assistant", "assoc": "associate", "dir": "director", "admin": "administrator",
+    "vp": "vice president", "svp": "senior vice president", "cto": "chief technology officer",
+    "ceo": "chief executive officer", "swe": "software engineer", "sde": "software development engineer",
+    "univ": "university", "inst": "institute", "intl": "international", "dept": "department",
+    "bs": "bachelor science", "bsc": "bachelor science", "ba": "bachelor arts", "btech": "bachelor technology",
+    "be": "bachelor engineering", "ms": "master science", "msc": "master science", "ma": "master arts",
+    "mtech": "master technology", "meng": "master engineering", "mba": "master business administration",
+    "phd": "doctor philosophy", "bachelors": "bachelor", "masters": "master",
+}
+
+# (organization, role, year) with names already normalized
+Record = Tuple[str, str, Optional[int]]
+
+
+def normalize_words(text: str, drop: frozenset = FILLER_WORDS) -> str:
+    """Lowercase words with dots dropped (B.S. -> bs), abbreviations expanded and `drop` removed"""
+    words = []
+    for word in _WORD.findall(text.lower().replace(".", "")):
+        words.extend(ABBREVIATIONS.get(word, word).split())
+    return " ".join(word for word in words if word not in drop)
+
+
+def normalize_organization(name: str) -> str:
+    if name.strip().lower() in PLACEHOLDER_ORGANIZATIONS:
+        return ""
+    return normalize_words(name, FILLER_WORDS | LEGAL_SUFFIXES)
+
+
+def normalize_role(title: str) -> str:
+    """Title or degree words; years are left to the record's year (parsed titles often carry the dates)"""
+    return normalize_words(_YEAR.sub(" ", title))
+
+
+def year_of(date: Optional[str]) -> Optional[int]:
+    match = _YEAR.search(date or "")
+    return int(match.group()) if match else None
+
+
+def experience_record(exp: Experience) -> Record:
+    # Parsed entries have no start_date; their dates are on the title line
+    return normalize_organization(exp.company), normalize_role(exp.title), year_of(exp.start_date) or year_of(exp.title)
+
+
+def education_record(edu: Education) -> Record:
+    return (normalize_organization(edu.institution), normalize_role(edu.degree),
+            year_of(edu.graduation_date) or year_of(edu.degree))
+
+
+def blocking_tokens(organization: str) -> Set[str]:
+    tokens = set(organization.split())
+    return (tokens - GENERIC_TOKENS) or tokens
+
+
+def matches(a: Record, b: Record, threshold: int) -> bool:
+    """Whether two records in the same block name the same entity"""
+    from rapidfuzz import fuzz
+
+    if a[0] != b[0] and fuzz.token_set_ratio(a[0], b[0]) < threshold:
+        return False
+    return a[1] == b[1] or fuzz.token_sort_ratio(a[1], b[1]) >= threshold
+
+
+class BlockIndex:
+    """Records by blocking token and year: the candidates a record is compared with.
+
+    Two records share a block when they share a blocking token and their
+    years are within one of each other, or either has no year.
+    """
+
+    def __init__(self):
+        self._by_year: Dict[Tuple[str, int], Set[Hashable]] = {}
+        self._by_token: Dict[str, Set[Hashable]] = {}
+        self._undated: Dict[str, Set[Hashable]] = {}
+
+    def candidates(self, record: Record) -> Set[Hashable]:
+        organization, _, year = record
+        found: Set[Hashable] = set()
+        for token in blocking_tokens(organization):
+            if year is None:
+                found.update(self._by_token.get(token, ()))
+            else:
+                for nearby in (year - 1, year, year + 1):
+                    found.update(self._by_year.get((token, nearby), ()))
+                found.update(self._undated.get(token, ()))
+        return found
+
+    def _sets(self, record: Record) -> Iterator[Set[Hashable]]:
+        organization, _, year = record
+        for token in blocking_tokens(organization):
+            yield self._by_token.setdefault(token, set())
+            if year is None:
+                yield self._undated.setdefault(token, set())
+            else:
+                yield self._by_year.setdefault((token, year), set())
+
+    def add(self, key: Hashable, record: Record):
+        for keys in self._sets(record):
+            keys.add(key)
+
+    def discard(self, key: Hashable, record: Record):
+        for keys in self._sets(record):
+            keys.discard(key)
+
+
+def resolve_entities(records: List[Record], threshold: int) -> List[int]:
+    """Cluster records naming the same entity; each gets the index of the first record in its cluster"""
+    first_index: Dict[Record, int] = {}
+    unique: List[int] = []
+    labels = list(range(len(records)))
+    for position, record in enumerate(records):
+        if not record[1]:
+            continue
+        if record in first_index:
+            labels[position] = first_index[record]
+        else:
+            first_index[record] = position
+            unique.append(position)
+
+    keys = list(first_index)
+    found = UnionFind(len(keys))
+    # Records seen so far; each record is compared with earlier ones only
+    blocks = BlockIndex()
+    for k, record in enumerate(keys):
+        if not record[0]:
+            continue
+        for other in sorted(blocks.candidates(record)):
+            if found.find(other) != found.find(k) and matches(record, keys[other], threshold):
+                found.union(other, k)
+        blocks.add(k, record)
+
+    label_of = {position: unique[found.find(k)] for k, position in enumerate(unique)}
+    return [label_of.get(label, label) for label in labels]
+
+
+class EntityClusters(Clusters):
+    """The clusters of resolve_entities(), kept up to date as records come and go.
+
+    Matches are symmetric, so a record's cluster is its connected component
+    under matching pairs in a shared block, whichever order the records came
+    in. Records with no role never match; labels() gives each its own label.
+    """
+
+    def __init__(self, threshold: int):
+        super().__init__()
+        self.threshold = threshold
+        self._blocks = BlockIndex()
+
+    def _pairs(self, new: List[Record], present: List[Record]) -> Iterator[Tuple[Record, Record]]:
+        for record in new:
+            # No organization: identical records fold into one node, nothing else matches
+            if not record[0] or not record[1]:
+                continue
+            for other in self._blocks.candidates(record):
+                if matches(record, other, self.threshold):
+                    yield record, other
+            self._blocks.add(record, record)
+
+    def _forget(self, record: Record):
+        if record[0] and record[1]:
+            self._blocks.discard(record, record)
+
+    def labels(self, records: List[Record]) -> List[Hashable]:
+        return [self.label(record) if record[1] else ("unmatched", i) for i, record in enumerate(records)]
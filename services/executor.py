@@ -0,0 +1,231 @@
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from services import metrics, profiler
+
+from services.parser import ResumeParser
+from models.schemas import MergeSettings, ParsedResume
+
+
+# Threads used in place of worker processes when max_workers <= 0
+DEV_THREADS = 4
+
+
+class ParseTimeout(Exception):
+    """Raised when a single file takes longer than the configured timeout"""
+
+
+class BatchTimeout(Exception):
+    """Raised when merging and rendering one batch group takes longer than the batch timeout"""
+
+
+# One parser per worker process, created on first use
+_worker_parser: Optional[ResumeParser] = None
+
+
+def _get_worker_parser() -> ResumeParser:
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ResumeParser()
+    return _worker_parser
+
+
+def _parse_job(data: bytes, file_type: str, sections: Optional[List[str]] = None, profile_interval: float = 0.0):
+    """Entry point executed inside a worker process.
+
+    Returns the extracted text (cached so more sections can be parsed later)
+    and the parsed sections, with the metric updates made while parsing,
+    which the API process replays into its own registry, and a sampled
+    profile of the parse when `profile_interval` is set.
+    """
+    parser = _get_worker_parser()
+    with metrics.collect() as recording:
+        if not profile_interval:
+            text = parser.extract_text(io.BytesIO(data), file_type)
+            return text, parser.parse_text(text, sections), recording, None
+        with profiler.sample("parse", profile_interval) as profile:
+            text = parser.extract_text(io.BytesIO(data), file_type)
+            result = parser.parse_text(text, sections)
+    return text, result, recording, profile
+
+
+def _parse_text_job(text: str, sections: List[str]):
+    """Parse more sections from already-extracted text"""
+    with metrics.collect() as recording:
+        result = _get_worker_parser().parse_text(text, sections)
+    return result, recording
+
+
+_worker_batch = None
+
+
+def _merge_export_job(resumes: List[ParsedResume], settings: MergeSettings, formats: List[str], template: str):
+    """Merge one candidate's resumes (a single resume is used as is) and render it in each format"""
+    global _worker_batch
+    if _worker_batch is None:
+        import config
+        from services.exporter import ResumeExporter
+        from services.merger import ResumeMerger
+        from services.relevance import RelevanceRanker
+        from services.search import ResumeIndex
+
+        # Relevance ranking reads IDF from the same search index as the API process
+        index = ResumeIndex(config.SEARCH_INDEX_PATH) if config.SEARCH_INDEX_PATH else None
+        # Batch entries are distinct candidates, so worker-side render caching would rarely hit
+        _worker_batch = ResumeMerger(ranker=RelevanceRanker(index)), ResumeExporter(cache_bytes=0)
+    merger, exporter = _worker_batch
+    with metrics.collect() as recording:
+        merged = merger.merge(resumes, settings) if len(resumes) > 1 else resumes[0]
+        resume_data = merged.model_dump(mode="json")
+        files = {format: exporter.export(resume_data, format, template=template) for format in formats}
+    return merged, files, recording
+
+
+def _warm_worker() -> int:
+    """Load the parser and its backends in a worker before it sees real work"""
+    from services.warmup import warm_parser
+
+    # Metric updates made while warming are discarded
+    with metrics.collect():
+        warm_parser(_get_worker_parser())
+    return os.getpid()
+
+
+class WorkerPool:
+    """Run CPU-bound jobs off the event loop in a process pool, each under a timeout"""
+
+    # Raised, naming the activity, when a job exceeds the timeout; threads are named for dev mode
+    timeout_error: type = TimeoutError
+    activity = "Running"
+    thread_name = "worker"
+
+    def __init__(self, max_workers: int = 1, timeout: float = 30.0, max_tasks_per_child: int = 0,
+                 warm_workers: bool = False):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child or None
+        # Warm every worker process as it starts, including ones recycled later
+        self.warm_workers = warm_workers
+        self._pool: Optional[Executor] = None
+        # Jobs wait here rather than in the pool's queue, so one is only submitted when a worker is
+        # free and its timeout counts running time, not time spent queued behind other jobs
+        self._slots = asyncio.Semaphore(max_workers if max_workers > 0 else DEV_THREADS)
+
+    def _create_pool(self) -> Executor:
+        if self.max_workers <= 0:
+            # Development mode: still off the event loop, but in-process
+            return ThreadPoolExecutor(max_workers=DEV_THREADS, thread_name_prefix=self.thread_name)
+
+        initializer = _warm_worker if self.warm_workers else None
+        if self.max_tasks_per_child:
+            # Worker recycling is not supported with the "fork" start method
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                max_tasks_per_child=self.max_tasks_per_child,
+                initializer=initializer
+            )
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=initializer)
+
+    def start(self):
+        if self._pool is None:
+            self._pool = self._create_pool()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _replace_pool(self, old_pool: Executor):
+        """Swap in a fresh pool for `old_pool`, leaving in-flight jobs on it to finish"""
+        if old_pool is not self._pool:
+            # Another job already replaced it
+            return
+        self._pool = self._create_pool()
+
+        old_pool.shutdown(wait=False, cancel_futures=False)
+        if isinstance(old_pool, ProcessPoolExecutor):
+            # Give healthy jobs a grace period, then kill whatever is still stuck
+            loop = asyncio.get_running_loop()
+            loop.call_later(self.timeout, self._terminate, old_pool)
+
+    @staticmethod
+    def _terminate(pool: Executor):
+        # ProcessPoolExecutor has no public API for killing a wedged worker
+        for process in list((pool._processes or {}).values()):
+            if process.is_alive():
+                process.terminate()
+
+    async def run(self, fn, *args):
+        """Run fn(*args) in the pool, enforcing the per-job timeout"""
+        async with self._slots:
+            self.start()
+            pool = self._pool
+            future = asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+            try:
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                # The worker is wedged on this job; stop routing work to it
+                self._replace_pool(pool)
+                raise self.timeout_error(f"{self.activity} exceeded {self.timeout:.0f}s")
+            except BrokenProcessPool:
+                # A worker died (OOM kill, segfault in a native lib); recover for the next request
+                self._replace_pool(pool)
+                raise
+
+
+
+class ParseExecutor(WorkerPool):
+    """Parse resumes in a process pool"""
+
+    timeout_error = ParseTimeout
+    activity = "Parsing"
+    thread_name = "parse"
+
+    async def warm_up(self):
+        """Start every worker now and wait until each has loaded its parser"""
+        self.start()
+        await asyncio.gather(*(self.run(_warm_worker) for _ in range(max(1, self.max_workers))))
+
+    async def parse(self, data: bytes, file_type: str,
+                    sections: Optional[List[str]] = None) -> Tuple[str, ParsedResume]:
+        """Extract and parse an in-memory resume in a worker, profiling it if the request asked for that"""
+        session = profiler.current()
+        interval = session.interval if session is not None else 0.0
+        text, result, recording, profile = await self.run(_parse_job, data, file_type, sections, interval)
+        metrics.replay(recording)
+        if profile is not None:
+            session.record(profile, data, file_type=file_type)
+        return text, result
+
+    async def parse_text(self, text: str, sections: List[str]) -> ParsedResume:
+        """Parse sections from text extracted earlier"""
+        result, recording = await self.run(_parse_text_job, text, sections)
+        metrics.replay(recording)
+        return result
+
+
+class BatchExecutor(WorkerPool):
+    """Merge and render batch groups in a pool of their own.
+
+    Batch groups have their own workers, slots and timeout, so a long batch
+    neither queues uploads behind it nor, when a group times out, replaces
+    the pool that parses them.
+    """
+
+    timeout_error = BatchTimeout
+    activity = "Merging and rendering"
+    thread_name = "batch"
+
+    async def merge_export(self, resumes: List[ParsedResume], settings: MergeSettings, formats: List[str],
+                           template: str) -> Tuple[ParsedResume, Dict[str, bytes]]:
+        """Merge a group and render it, in a worker, so the pool spreads groups over CPUs"""
+        merged, files, recording = await self.run(_merge_export_job, resumes, settings, formats, template)
+        metrics.replay(recording)
+        return merged, files
@@ -1,60 +1,64 @@
-import os
-from typing import Dict, Any
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from docx import Document
-from docx.shared import Pt, RGBColor
+import hashlib
+import io
+import json
+from typing import Dict, Any, Optional
+from services import metrics
+from services.cache import LRUCache
+from services.templates import DEFAULT_TEMPLATE, ExportTemplate, get_template
 
 
 class ResumeExporter:
     """Export merged resume to PDF or DOCX"""
     
-    def __init__(self):
-        self.output_dir = "exports"
-        os.makedirs(self.output_dir, exist_ok=True)
+    # Bump when the rendering code changes, so cached documents are not reused
+    # (individual templates carry their own version too)
+    TEMPLATE_VERSION = "2"
     
-    def export(self, resume_data: Dict[str, Any], format: str) -> str:
-        """Export resume in specified format"""
+    def __init__(self, cache_bytes: int = 32 * 1024 * 1024):
+        # Rendered documents, keyed by cache_key(); bounded by total size
+        self.cache = LRUCache(cache_bytes)
+    
+    def cache_key(self, resume_data: Dict[str, Any], format: str, template: str = DEFAULT_TEMPLATE) -> str:
+        """Content hash of everything that determines the rendered bytes"""
+        layout = get_template(template)
+        canonical = json.dumps(resume_data, sort_keys=True, separators=(",", ":"), default=str)
+        stamp = f"{format}:{self.TEMPLATE_VERSION}:{layout.name}:{layout.version}"
+        return hashlib.sha256(f"{stamp}:{canonical}".encode()).hexdigest()
+    
+    def export(self, resume_data: Dict[str, Any], format: str, key: Optional[str] = None,
+               template: str = DEFAULT_TEMPLATE) -> bytes:
+        """Export resume in specified format, reusing a cached rendering when possible"""
+        if format not in ("pdf", "docx"):
+            raise ValueError("Unsupported format")
+        
+        layout = get_template(template)
+        key = key or self.cache_key(resume_data, format, template)
+        cached = self.cache.get(key)
+        if cached is not None:
+            metrics.CACHE_LOOKUPS.inc(cache="export", result="hit")
+            return cached
+        metrics.CACHE_LOOKUPS.inc(cache="export", result="miss")
+        
         if format == "pdf":
-            return self._export_pdf(resume_data)
-        elif format == "docx":
-            return self._export_docx(resume_data)
+            data = self._export_pdf(resume_data, layout)
         else:
-            raise ValueError("Unsupported format")
+            data = self._export_docx(resume_data, layout)
+        
+        metrics.EXPORT_BYTES.inc(len(data), format=format)
+        self.cache.put(key, data)
+        return data
     
-    def _export_pdf(self, resume_data: Dict[str, Any]) -> str:
+    @metrics.timed("export_pdf")
+    def _export_pdf(self, resume_data: Dict[str, Any], layout: ExportTemplate) -> bytes:
         """Export to PDF using ReportLab"""
-        output_path = os.path.join(self.output_dir, "merged_resume.pdf")
-        
-        doc = SimpleDocTemplate(output_path, pagesize=letter)
-        styles = getSampleStyleSheet()
+        output = io.BytesIO()
+        doc = layout.pdf_document(output)
         story = []
         
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=12
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#333333'),
-            spaceAfter=6,
-            spaceBefore=12
-        )
-        
         # Personal Info
         personal = resume_data.get('personal_info', {})
         if personal.get('name'):
-            story.append(Paragraph(personal['name'], title_style))
+            story.append(layout.title(personal['name']))
         
         contact_info = []
         if personal.get('email'):
@@ -62,54 +66,53 @@ class ResumeExporter:
         if personal.get('phone'):
             contact_info.append(personal['phone'])
         if contact_info:
-            story.append(Paragraph(" | ".join(contact_info), styles['Normal']))
+            story.append(layout.paragraph(" | ".join(contact_info)))
         
-        story.append(Spacer(1, 0.2*inch))
+        story.append(layout.section_spacer())
         
         # Skills
         skills = resume_data.get('skills', [])
         if skills:
-            story.append(Paragraph("SKILLS", heading_style))
-            skill_names = [s['name'] for s in skills[:20]]  # Top 20 skills
-            story.append(Paragraph(", ".join(skill_names), styles['Normal']))
-            story.append(Spacer(1, 0.2*inch))
+            story.append(layout.heading("SKILLS"))
+            skill_names = [s['name'] for s in skills[:layout.max_skills]]  # Top-ranked skills
+            story.append(layout.paragraph(", ".join(skill_names)))
+            story.append(layout.section_spacer())
         
         # Experience
         experiences = resume_data.get('experience', [])
         if experiences:
-            story.append(Paragraph("EXPERIENCE", heading_style))
+            story.append(layout.heading("EXPERIENCE"))
             for exp in experiences:
                 title_company = f"<b>{exp['title']}</b> - {exp['company']}"
-                story.append(Paragraph(title_company, styles['Normal']))
+                story.append(layout.paragraph(title_company))
                 
-                for desc in exp.get('description', [])[:3]:  # Limit descriptions
-                    story.append(Paragraph(f"• {desc}", styles['Normal']))
+                for desc in exp.get('description', [])[:layout.max_bullets]:  # Top-ranked bullets
+                    story.append(layout.paragraph(f"• {desc}"))
                 
-                story.append(Spacer(1, 0.1*inch))
+                story.append(layout.entry_spacer())
         
         # Education
         education = resume_data.get('education', [])
         if education:
-            story.append(Paragraph("EDUCATION", heading_style))
+            story.append(layout.heading("EDUCATION"))
             for edu in education:
                 edu_text = f"<b>{edu['degree']}</b> - {edu['institution']}"
-                story.append(Paragraph(edu_text, styles['Normal']))
+                story.append(layout.paragraph(edu_text))
         
         # Build PDF
         doc.build(story)
-        return output_path
+        return output.getvalue()
     
-    def _export_docx(self, resume_data: Dict[str, Any]) -> str:
+    @metrics.timed("export_docx")
+    def _export_docx(self, resume_data: Dict[str, Any], layout: ExportTemplate) -> bytes:
         """Export to DOCX"""
-        output_path = os.path.join(self.output_dir, "merged_resume.docx")
-        
-        doc = Document()
+        # Heading sizes and fonts come pre-set in the template's base document
+        doc = layout.new_docx()
         
         # Personal Info
         personal = resume_data.get('personal_info', {})
         if personal.get('name'):
-            name_para = doc.add_heading(personal['name'], level=1)
-            name_para.runs[0].font.size = Pt(24)
+            doc.add_heading(personal['name'], level=1)
         
         contact_info = []
         if personal.get('email'):
@@ -123,7 +126,7 @@ class ResumeExporter:
         skills = resume_data.get('skills', [])
         if skills:
             doc.add_heading('SKILLS', level=2)
-            skill_names = [s['name'] for s in skills[:20]]
+            skill_names = [s['name'] for s in skills[:layout.max_skills]]
             doc.add_paragraph(", ".join(skill_names))
         
         # Experience
@@ -132,7 +135,7 @@ class ResumeExporter:
             doc.add_heading('EXPERIENCE', level=2)
             for exp in experiences:
                 doc.add_paragraph(f"{exp['title']} - {exp['company']}", style='Heading 3')
-                for desc in exp.get('description', [])[:3]:
+                for desc in exp.get('description', [])[:layout.max_bullets]:
                     doc.add_paragraph(f"• {desc}")
         
         # Education
@@ -142,5 +145,6 @@ class ResumeExporter:
             for edu in education:
                 doc.add_paragraph(f"{edu['degree']} - {edu['institution']}")
         
-        doc.save(output_path)
-        return output_path
+        output = io.BytesIO()
+        doc.save(output)
+        return output.getvalue()
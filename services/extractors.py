@@ -0,0 +1,232 @@
+import re
+import threading
+import zipfile
+from typing import BinaryIO, Dict, Iterator, List, Type, Union
+
+Source = Union[str, BinaryIO]
+
+
+class PdfBackend:
+    """Text-extraction backend for PDFs, yielding one page of text at a time"""
+
+    name = ""
+
+    def iter_pages(self, source: Source) -> Iterator[str]:
+        raise NotImplementedError
+
+
+# PDFium is not thread-safe, even across documents, and dev mode parses in threads
+_pdfium_lock = threading.Lock()
+
+
+class PdfiumBackend(PdfBackend):
+    """Fast extraction through PDFium's native text API (no layout analysis)"""
+
+    name = "pdfium"
+
+    def iter_pages(self, source: Source) -> Iterator[str]:
+        import pypdfium2 as pdfium
+
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(source)
+            pages = len(pdf)
+        try:
+            for index in range(pages):
+                # Held per page, not across the yield, so other threads' documents interleave
+                with _pdfium_lock:
+                    page = pdf[index]
+                    text_page = page.get_textpage()
+                    try:
+                        text = text_page.get_text_range()
+                    finally:
+                        # Release native page memory before moving on
+                        text_page.close()
+                        page.close()
+                yield text.replace("\r\n", "\n").replace("\r", "\n")
+        finally:
+            with _pdfium_lock:
+                pdf.close()
+
+
+class PdfplumberBackend(PdfBackend):
+    """High-fidelity extraction through pdfplumber's layout analysis"""
+
+    name = "pdfplumber"
+
+    def iter_pages(self, source: Source) -> Iterator[str]:
+        import pdfplumber
+
+        with pdfplumber.open(source) as pdf:
+            for page in pdf.pages:
+                try:
+                    text = page.extract_text() or ""
+                finally:
+                    # Drop the parsed layout objects for pages we are done with
+                    page.close()
+                yield text
+
+
+PDF_BACKENDS: Dict[str, Type[PdfBackend]] = {
+    PdfiumBackend.name: PdfiumBackend,
+    PdfplumberBackend.name: PdfplumberBackend,
+}
+
+
+def get_pdf_backend(name: str) -> PdfBackend:
+    try:
+        return PDF_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown PDF backend: {name}. Choose from {', '.join(PDF_BACKENDS)}")
+
+
+class DocxBackend:
+    """Text-extraction backend for DOCX files, yielding one line per paragraph"""
+
+    name = ""
+
+    def iter_lines(self, source: Source) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class PythonDocxBackend(DocxBackend):
+    """Body paragraphs through python-docx's full object model"""
+
+    name = "python-docx"
+
+    def iter_lines(self, source: Source) -> Iterator[str]:
+        from docx import Document
+
+        for para in Document(source).paragraphs:
+            yield para.text
+
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+def _part_order(name: str):
+    match = re.search(r"(\d+)\.xml$", name)
+    return int(match.group(1)) if match else 0
+
+
+class StreamingDocxBackend(DocxBackend):
+    """Iterparse word/document.xml (plus headers and footers) straight from the zip.
+
+    Lines come out in reading order: headers, body, footers. Table rows are
+    emitted as one line with cells joined by " | ", and text boxes are read
+    once (their VML fallback copy is skipped). Elements are cleared as soon
+    as they are consumed, so memory stays flat regardless of document size.
+    """
+
+    name = "stream"
+
+    def iter_lines(self, source: Source) -> Iterator[str]:
+        with zipfile.ZipFile(source) as archive:
+            names = archive.namelist()
+            headers = sorted((n for n in names if re.match(r"word/header\d*\.xml$", n)), key=_part_order)
+            footers = sorted((n for n in names if re.match(r"word/footer\d*\.xml$", n)), key=_part_order)
+
+            # First-page/even/default headers often repeat the same text
+            seen = set()
+            for part in headers:
+                for line in self._iter_part(archive, part):
+                    if line not in seen:
+                        seen.add(line)
+                        yield line
+
+            yield from self._iter_part(archive, "word/document.xml")
+
+            seen = set()
+            for part in footers:
+                for line in self._iter_part(archive, part):
+                    if line not in seen:
+                        seen.add(line)
+                        yield line
+
+    def _iter_part(self, archive: zipfile.ZipFile, part: str) -> Iterator[str]:
+        from lxml import etree
+
+        paragraph_tag = W_NS + "p"
+        text_tag = W_NS + "t"
+        tab_tag = W_NS + "tab"
+        break_tag = W_NS + "br"
+        row_tag = W_NS + "tr"
+        cell_tag = W_NS + "tc"
+
+        # Paragraph buffers (text boxes nest paragraphs inside paragraphs)
+        paragraphs: List[List[str]] = []
+        # Open table rows and cells; each cell collects its paragraphs' text
+        rows: List[List[str]] = []
+        cells: List[List[str]] = []
+        fallback_depth = 0
+
+        with archive.open(part) as xml:
+            for event, elem in etree.iterparse(
+                xml, events=("start", "end"),
+                tag=(paragraph_tag, text_tag, tab_tag, break_tag, row_tag, cell_tag, MC_FALLBACK)
+            ):
+                tag = elem.tag
+                if tag == MC_FALLBACK:
+                    fallback_depth += 1 if event == "start" else -1
+                    continue
+                if fallback_depth:
+                    continue
+
+                if event == "start":
+                    if tag == paragraph_tag:
+                        paragraphs.append([])
+                    elif tag == row_tag:
+                        rows.append([])
+                    elif tag == cell_tag:
+                        cells.append([])
+                    continue
+
+                if tag == text_tag:
+                    if paragraphs and elem.text:
+                        paragraphs[-1].append(elem.text)
+                elif tag == tab_tag:
+                    if paragraphs:
+                        paragraphs[-1].append(" ")
+                elif tag == break_tag:
+                    if paragraphs:
+                        paragraphs[-1].append("\n")
+                elif tag == paragraph_tag:
+                    line = "".join(paragraphs.pop()).strip()
+                    if line:
+                        if cells:
+                            cells[-1].append(line)
+                        else:
+                            yield line
+                elif tag == cell_tag:
+                    cell = " ".join(cells.pop())
+                    if rows:
+                        rows[-1].append(cell)
+                elif tag == row_tag:
+                    line = " | ".join(cell for cell in rows.pop() if cell)
+                    if line:
+                        if cells:
+                            # Nested table: the row belongs to the enclosing cell
+                            cells[-1].append(line)
+                        else:
+                            yield line
+
+                if tag in (paragraph_tag, row_tag):
+                    elem.clear()
+                    # Drop already-processed siblings so the tree never grows
+                    parent = elem.getparent()
+                    if parent is not None:
+                        while elem.getprevious() is not None:
+                            del parent[0]
+
+
+DOCX_BACKENDS: Dict[str, Type[DocxBackend]] = {
+    StreamingDocxBackend.name: StreamingDocxBackend,
+    PythonDocxBackend.name: PythonDocxBackend,
+}
+
+
+def get_docx_backend(name: str) -> DocxBackend:
+    try:
+        return DOCX_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown DOCX backend: {name}. Choose from {', '.join(DOCX_BACKENDS)}")
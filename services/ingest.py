@@ -0,0 +1,126 @@
+import hashlib
+import io
+import zipfile
+from typing import Optional
+
+from services import metrics
+
+CHUNK_SIZE = 64 * 1024
+
+# Magic bytes for the formats we accept; DOCX is a ZIP container
+MAGIC_BYTES = {
+    b"%PDF-": "pdf",
+    b"PK\x03\x04": "docx",
+}
+SNIFF_BYTES = max(len(magic) for magic in MAGIC_BYTES)
+# The part every Word document has; any other ZIP is not a DOCX
+DOCX_MAIN_PART = "word/document.xml"
+
+
+class UploadRejected(Exception):
+    """Raised when an upload fails validation before it is parsed"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class IngestedFile:
+    """An upload held in memory, with its sniffed type and content hash"""
+
+    def __init__(self, filename: str, file_type: str, data: bytes, digest: str):
+        self.filename = filename
+        self.file_type = file_type
+        self.data = data
+        self.digest = digest
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+class ByteBudget:
+    """Byte allowance shared by all files in one request"""
+
+    def __init__(self, max_bytes: int):
+        self.remaining = max_bytes
+
+    def consume(self, count: int):
+        self.remaining -= count
+        if self.remaining < 0:
+            raise UploadRejected(413, "Upload exceeds the total size limit for one request")
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    for magic, file_type in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return file_type
+    return None
+
+
+def is_docx(data: bytes) -> bool:
+    """Whether a ZIP upload is a Word document; only its central directory is read"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            archive.getinfo(DOCX_MAIN_PART)
+        return True
+    except (zipfile.BadZipFile, KeyError):
+        return False
+
+
+def format_size(size: int) -> str:
+    """10MB, 1.5MB, 512KB or 100 bytes"""
+    for unit, scale in (("MB", 1024 * 1024), ("KB", 1024)):
+        if size >= scale:
+            return f"{size / scale:.1f}".rstrip("0").rstrip(".") + unit
+    return f"{size} bytes"
+
+
+async def ingest_upload(file, budget: ByteBudget, max_file_bytes: int) -> IngestedFile:
+    """Read an UploadFile in chunks, validating and hashing as it streams in.
+
+    The type is decided from magic bytes before the rest of the file is
+    buffered, and both the per-file and per-request limits are enforced per
+    chunk, so an oversized or mislabelled upload is rejected early. A ZIP is
+    only taken for a DOCX once the whole file shows it has a Word document part.
+    """
+    hasher = hashlib.sha256()
+    buffer = io.BytesIO()
+    file_type = None
+    size = 0
+
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+
+        size += len(chunk)
+        if size > max_file_bytes:
+            raise UploadRejected(413, f"{file.filename} exceeds the {format_size(max_file_bytes)} file size limit")
+        budget.consume(len(chunk))
+
+        if file_type is None:
+            buffer.write(chunk)
+            if buffer.tell() < SNIFF_BYTES:
+                continue
+            file_type = sniff_format(buffer.getvalue()[:SNIFF_BYTES])
+            if file_type is None:
+                raise UploadRejected(
+                    400,
+                    f"Invalid file type: {file.filename}. Only PDF and DOCX are supported."
+                )
+            hasher.update(buffer.getvalue())
+            continue
+
+        hasher.update(chunk)
+        buffer.write(chunk)
+
+    if file_type is None:
+        raise UploadRejected(400, f"{file.filename} is empty or truncated")
+    data = buffer.getvalue()
+    if file_type == "docx" and not is_docx(data):
+        raise UploadRejected(400, f"Invalid file type: {file.filename} is a ZIP archive but not a DOCX document.")
+
+    metrics.UPLOAD_BYTES.inc(size, format=file_type)
+    return IngestedFile(file.filename, file_type, data, hasher.hexdigest())
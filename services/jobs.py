@@ -0,0 +1,327 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from models.schemas import MergeSettings, ParsedResume
+from services.exporter import ResumeExporter
+from services.ingest import IngestedFile
+from services.merger import ResumeMerger
+from services.pipeline import ParsePipeline
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Seconds between sweeps for expired jobs
+SWEEP_INTERVAL = 300.0
+# A running job belongs to the worker process that claimed it while that worker renews its lease every
+# HEARTBEAT_INTERVAL seconds; a job whose lease has gone stale (its worker died) may be claimed by another
+HEARTBEAT_INTERVAL = 15.0
+JOB_LEASE = 60.0
+
+
+class JobStore:
+    """SQLite persistence for jobs, their inputs and their stage outputs"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                stage TEXT,
+                error TEXT,
+                settings TEXT NOT NULL,
+                formats TEXT NOT NULL,
+                template TEXT NOT NULL,
+                merged TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                owner TEXT,
+                heartbeat REAL
+            );
+            CREATE TABLE IF NOT EXISTS job_files (
+                job_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                filename TEXT NOT NULL,
+                file_type TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (job_id, position)
+            );
+            CREATE TABLE IF NOT EXISTS job_outputs (
+                job_id TEXT NOT NULL,
+                format TEXT NOT NULL,
+                template TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (job_id, format, template)
+            );
+            """
+        )
+        # Databases created before jobs were claimed by a worker
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+
+    def create(self, files: List[IngestedFile], settings: MergeSettings, formats: List[str], template: str) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, settings, formats, template, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, settings.model_dump_json(), json.dumps(formats), template, now, now)
+            )
+            self._conn.executemany(
+                "INSERT INTO job_files (job_id, position, filename, file_type, digest, data) VALUES (?, ?, ?, ?, ?, ?)",
+                [(job_id, i, f.filename, f.file_type, f.digest, f.data) for i, f in enumerate(files)]
+            )
+            self._conn.execute("COMMIT")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            outputs = self._conn.execute(
+                "SELECT format, template FROM job_outputs WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        job = dict(row)
+        # Which worker runs it is internal
+        del job["owner"], job["heartbeat"]
+        job["settings"] = json.loads(job["settings"])
+        job["formats"] = json.loads(job["formats"])
+        job["outputs"] = [{"format": o["format"], "template": o["template"]} for o in outputs]
+        return job
+
+    def update(self, job_id: str, owner: Optional[str] = None, **fields) -> bool:
+        """Set fields on a job; with `owner`, only while that worker still holds it"""
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        query = f"UPDATE jobs SET {assignments} WHERE id = ?"
+        params = [*fields.values(), job_id]
+        if owner is not None:
+            query += " AND owner = ?"
+            params.append(owner)
+        with self._lock:
+            return self._conn.execute(query, params).rowcount > 0
+
+    def claim(self, job_id: str, owner: str, lease: float) -> bool:
+        """Atomically take a queued job, or a running one whose lease has expired, for `owner`"""
+        now = time.time()
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, heartbeat = ?, updated = ?"
+                " WHERE id = ? AND (status = ? OR (status = ? AND (heartbeat IS NULL OR heartbeat < ?)))",
+                (RUNNING, owner, now, now, job_id, QUEUED, RUNNING, now - lease)
+            ).rowcount > 0
+
+    def renew(self, owner: str):
+        """Extend the lease on every job `owner` is running"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = ?", (time.time(), owner, RUNNING)
+            )
+
+    def files(self, job_id: str) -> List[IngestedFile]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filename, file_type, digest, data FROM job_files WHERE job_id = ? ORDER BY position",
+                (job_id,)
+            ).fetchall()
+        return [IngestedFile(r["filename"], r["file_type"], r["data"], r["digest"]) for r in rows]
+
+    def drop_files(self, job_id: str):
+        """Inputs are only needed until the job has been merged"""
+        with self._lock:
+            self._conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+
+    def get_output(self, job_id: str, format: str, template: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM job_outputs WHERE job_id = ? AND format = ? AND template = ?",
+                (job_id, format, template)
+            ).fetchone()
+        return row["data"] if row else None
+
+    def put_output(self, job_id: str, format: str, template: str, data: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_outputs (job_id, format, template, data) VALUES (?, ?, ?, ?)",
+                (job_id, format, template, data)
+            )
+
+    def delete(self, job_id: str) -> bool:
+        """Remove a job with its inputs and outputs"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            deleted = self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount
+            self._conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM job_outputs WHERE job_id = ?", (job_id,))
+            self._conn.execute("COMMIT")
+        return deleted > 0
+
+    def expire(self, ttl: float) -> int:
+        """Delete finished and failed jobs last updated more than `ttl` seconds ago"""
+        deadline = time.time() - ttl
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) AND updated < ?", (DONE, FAILED, deadline)
+            ).fetchall()
+        for row in rows:
+            self.delete(row["id"])
+        return len(rows)
+
+    def claimable(self, lease: float) -> List[str]:
+        """Queued jobs, and running jobs whose worker stopped renewing their lease (died or restarted)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND (heartbeat IS NULL OR heartbeat < ?))"
+                " ORDER BY created",
+                (QUEUED, RUNNING, time.time() - lease)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+
+class JobFailed(Exception):
+    """A stage failed; the message is recorded on the job"""
+
+
+class JobRunner:
+    """Run upload -> parse -> merge -> export jobs in the background on a bounded pool"""
+
+    def __init__(self, store: JobStore, pipeline: ParsePipeline, merger: ResumeMerger,
+                 exporter: ResumeExporter, workers: int = 2, ttl: float = 0.0):
+        self.store = store
+        self.pipeline = pipeline
+        self.merger = merger
+        self.exporter = exporter
+        self.workers = workers
+        # Finished and failed jobs are deleted this many seconds after their last update (0 keeps them)
+        self.ttl = ttl
+        # Identifies this worker process's claims; every web worker shares the jobs database
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._tasks = set()
+        # Jobs this worker has a task for, so recovery doesn't submit them twice
+        self._submitted = set()
+
+    def start(self):
+        self._slots = asyncio.Semaphore(self.workers)
+        self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._track(asyncio.create_task(self._maintain()))
+        if self.ttl:
+            self._track(asyncio.create_task(self._sweep()))
+
+    async def shutdown(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, job_id: str):
+        if job_id in self._submitted:
+            return
+        self._submitted.add(job_id)
+        task = asyncio.create_task(self._run(job_id))
+        task.add_done_callback(lambda _: self._submitted.discard(job_id))
+        self._track(task)
+
+    def _track(self, task: asyncio.Task):
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _maintain(self):
+        """Renew the leases on this worker's jobs and pick up jobs left queued or abandoned by a dead worker"""
+        while True:
+            await self._db(self.store.renew, self.owner)
+            for job_id in await self._db(self.store.claimable, JOB_LEASE):
+                self.submit(job_id)
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    async def _sweep(self):
+        while True:
+            await self._db(self.store.expire, self.ttl)
+            await asyncio.sleep(min(self.ttl, SWEEP_INTERVAL))
+
+    async def _db(self, fn, *args, **kwargs):
+        """Store calls block on SQLite (and move upload and export bytes), so they run off the event loop"""
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def _in_thread(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._threads, fn, *args)
+
+    async def _run(self, job_id: str):
+        async with self._slots:
+            # Another worker may have taken it (or finished it) already
+            if not await self._db(self.store.claim, job_id, self.owner, JOB_LEASE):
+                return
+            job = await self._db(self.store.get, job_id)
+            if job is None:
+                return
+            try:
+                merged = await self._merge_stage(job)
+                for format in job["formats"]:
+                    await self.render(job_id, merged, format, job["template"])
+            except Exception as e:
+                failed = await self._db(
+                    self.store.update, job_id, owner=self.owner, status=FAILED, stage=None, error=str(e)
+                )
+                if failed:
+                    # Nothing will retry it
+                    await self._db(self.store.drop_files, job_id)
+                return
+            await self._db(self.store.update, job_id, owner=self.owner, status=DONE, stage=None, error=None)
+
+    async def _merge_stage(self, job: Dict[str, Any]) -> ParsedResume:
+        job_id = job["id"]
+        # Merged output survives restarts, so an interrupted export doesn't redo parse/merge
+        if job["merged"]:
+            return ParsedResume.model_validate_json(job["merged"])
+
+        await self._db(self.store.update, job_id, owner=self.owner, stage="parse")
+        settings = MergeSettings.model_validate(job["settings"])
+        files = await self._db(self.store.files, job_id)
+        # Sections the merge leaves out aren't parsed at all
+        results = await self.pipeline.parse_many(files, settings.include_sections)
+        for upload, result in zip(files, results):
+            if isinstance(result, Exception):
+                raise JobFailed(f"Error parsing {upload.filename}: {str(result)}")
+
+        await self._db(self.store.update, job_id, owner=self.owner, stage="merge")
+        merged = await self._in_thread(self.merger.merge, results, settings)
+        stored = await self._db(
+            self.store.update, job_id, owner=self.owner, merged=merged.model_dump_json(), stage="export"
+        )
+        if not stored:
+            raise JobFailed("Job was taken over by another worker")
+        await self._db(self.store.drop_files, job_id)
+        return merged
+
+    async def render(self, job_id: str, merged: ParsedResume, format: str, template: str) -> bytes:
+        """Export a merged job in a format, storing the bytes with the job"""
+        data = await self._db(self.store.get_output, job_id, format, template)
+        if data is None:
+            data = await self._in_thread(self.exporter.export, merged.model_dump(), format, None, template)
+            await self._db(self.store.put_output, job_id, format, template, data)
+        return data
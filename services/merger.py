@@ -1,34 +1,103 @@
-from typing import List, Dict, Any
-from rapidfuzz import fuzz, process
+from typing import Hashable, List, Dict, Any, Optional
 from models.schemas import ParsedResume, Skill, Experience, Education, Project, PersonalInfo, MergeSettings
-from collections import defaultdict
+from services import metrics
+from services.dedup import cluster_names, near_duplicates, normalize_name
+from services.entities import Record, education_record, experience_record, resolve_entities
+from services.relevance import RelevanceRanker
+
+
+class Deduplicator:
+    """How merge() finds duplicates, computed from scratch for every merge
+    
+    Merge sessions pass one that keeps this state between merges instead
+    (services/sessions.py). Labels only group items: items sharing a label are
+    duplicates, and groups come out in order of their first item.
+    """
+    
+    def __init__(self, workers: int = -1):
+        self.workers = workers
+    
+    def names(self, section: str, names: List[str], threshold: int) -> List[Hashable]:
+        """Cluster labels for normalized skill or project names"""
+        return cluster_names(names, threshold, self.workers)
+    
+    def entities(self, section: str, records: List[Record], threshold: int) -> List[Hashable]:
+        """Cluster labels for experience or education records"""
+        return resolve_entities(records, threshold)
+    
+    def bullets(self, entries: List[List[str]], threshold: int) -> List[List[bool]]:
+        """Which bullets of each merged entry to keep (not a near-duplicate of an earlier one)"""
+        return near_duplicate_flags(entries, threshold)
+
+
+def near_duplicate_flags(entries: List[List[str]], threshold: int) -> List[List[bool]]:
+    # Bullets are only compared within their own entry, all entries at once
+    bullets = [bullet for bullets in entries for bullet in bullets]
+    groups = [i for i, bullets in enumerate(entries) for _ in bullets]
+    labels = near_duplicates(bullets, groups, threshold)
+    kept = iter([label == i for i, label in enumerate(labels)])
+    return [[next(kept) for _ in bullets] for bullets in entries]
 
 
 class ResumeMerger:
     """Intelligent resume merging with deduplication"""
     
-    def merge(self, resumes: List[ParsedResume], settings: MergeSettings) -> ParsedResume:
-        """Merge multiple resumes into one"""
-        
-        # Merge each section
-        merged_personal = self._merge_personal_info([r.personal_info for r in resumes])
-        merged_skills = self._merge_skills([r.skills for r in resumes], settings.deduplicate_threshold)
-        merged_experience = self._merge_experience([r.experience for r in resumes])
-        merged_education = self._merge_education([r.education for r in resumes])
-        merged_projects = self._merge_projects([r.projects for r in resumes], settings.deduplicate_threshold)
-        
-        # Apply settings
-        if settings.max_skills and len(merged_skills) > settings.max_skills:
-            merged_skills = merged_skills[:settings.max_skills]
-        
-        return ParsedResume(
-            personal_info=merged_personal,
-            skills=merged_skills,
-            experience=merged_experience,
-            education=merged_education,
-            projects=merged_projects
-        )
+    def __init__(self, workers: int = -1, ranker: Optional[RelevanceRanker] = None):
+        # Threads used by rapidfuzz for the similarity matrix (-1 = all cores)
+        self.workers = workers
+        # Orders content by relevance to a job description (sort_experience_by="relevance")
+        self.ranker = ranker or RelevanceRanker()
+        self.dedup = Deduplicator(workers)
     
+    def merge(
+        self,
+        resumes: List[ParsedResume],
+        settings: MergeSettings,
+        dedup: Optional[Deduplicator] = None
+    ) -> ParsedResume:
+        """Merge multiple resumes into one
+        
+        `dedup` supplies the duplicate clusters instead of computing them here
+        (merge sessions keep them up to date incrementally).
+        """
+        dedup = dedup or self.dedup
+        include = set(settings.include_sections)
+        
+        # Merge each included section; excluded ones stay empty
+        merged = ParsedResume(personal_info=PersonalInfo())
+        if 'personal_info' in include:
+            merged.personal_info = self._merge_personal_info([r.personal_info for r in resumes])
+        if 'skills' in include:
+            merged.skills = self._merge_skills([r.skills for r in resumes], settings.deduplicate_threshold, dedup)
+        if 'experience' in include:
+            merged.experience = self._merge_experience(
+                [r.experience for r in resumes], settings.deduplicate_threshold, settings.bullet_dedup_threshold,
+                dedup
+            )
+        if 'education' in include:
+            merged.education = self._merge_education(
+                [r.education for r in resumes], settings.deduplicate_threshold, dedup
+            )
+        if 'projects' in include:
+            merged.projects = self._merge_projects(
+                [r.projects for r in resumes], settings.deduplicate_threshold, dedup
+            )
+        
+        # Without a job description there is nothing to rank against; keep date order
+        if settings.sort_experience_by == 'relevance' and settings.job_description:
+            merged = self._rank(merged, settings.job_description)
+        
+        # Apply settings (after ranking, so the skills kept are the most relevant)
+        if settings.max_skills and len(merged.skills) > settings.max_skills:
+            merged.skills = merged.skills[:settings.max_skills]
+        
+        return merged
+    
+    @metrics.timed("merge_relevance")
+    def _rank(self, merged: ParsedResume, job_description: str) -> ParsedResume:
+        return self.ranker.rank(merged, job_description)
+    
+    @metrics.timed("merge_personal_info")
     def _merge_personal_info(self, infos: List[PersonalInfo]) -> PersonalInfo:
         """Merge personal info - use most complete data"""
         merged = PersonalInfo()
@@ -51,71 +120,69 @@ class ResumeMerger:
         
         return merged
     
-    def _merge_skills(self, skill_lists: List[List[Skill]], threshold: int = 85) -> List[Skill]:
+    @metrics.timed("merge_skills")
+    def _merge_skills(self, skill_lists: List[List[Skill]], threshold: int = 85,
+                      dedup: Optional[Deduplicator] = None) -> List[Skill]:
         """Merge skills with fuzzy deduplication and ranking"""
-        skill_map = {}
+        all_skills = [skill for skills in skill_lists for skill in skills]
+        labels = (dedup or self.dedup).names('skills', [normalize_name(s.name) for s in all_skills], threshold)
         
-        for skills in skill_lists:
-            for skill in skills:
-                normalized_name = skill.name.lower().strip()
-                
-                # Try to find existing similar skill
-                matched_key = None
-                if skill_map:
-                    match = process.extractOne(
-                        normalized_name,
-                        skill_map.keys(),
-                        scorer=fuzz.ratio,
-                        score_cutoff=threshold
-                    )
-                    if match:
-                        matched_key = match[0]
-                
-                if matched_key:
-                    # Update existing skill
-                    skill_map[matched_key]['frequency'] += 1
-                    skill_map[matched_key]['confidence'] = max(
-                        skill_map[matched_key]['confidence'],
-                        skill.confidence
-                    )
-                else:
-                    # Add new skill
-                    skill_map[normalized_name] = {
-                        'name': skill.name,
-                        'category': skill.category,
-                        'frequency': 1,
-                        'confidence': skill.confidence
-                    }
+        skill_map = {}
+        for label, skill in zip(labels, all_skills):
+            if label in skill_map:
+                # Update existing skill; each resume contributes how often it mentions the skill
+                skill_map[label]['frequency'] += skill.frequency
+                skill_map[label]['confidence'] = max(skill_map[label]['confidence'], skill.confidence)
+            else:
+                # First member names the cluster
+                skill_map[label] = {
+                    'name': skill.name,
+                    'category': skill.category,
+                    'frequency': skill.frequency,
+                    'confidence': skill.confidence
+                }
         
         # Convert back to Skill objects and sort by frequency and confidence
-        merged_skills = [
-            Skill(
-                name=data['name'],
-                category=data['category'],
-                frequency=data['frequency'],
-                confidence=data['confidence']
-            )
-            for data in skill_map.values()
-        ]
+        merged_skills = [Skill(**data) for data in skill_map.values()]
         
         # Sort: higher frequency and confidence first
         merged_skills.sort(key=lambda s: (s.frequency, s.confidence), reverse=True)
         
         return merged_skills
     
-    def _merge_experience(self, exp_lists: List[List[Experience]]) -> List[Experience]:
-        """Merge work experience, removing duplicates"""
-        seen_signatures = set()
-        merged_experience = []
+    @metrics.timed("merge_experience")
+    def _merge_experience(
+        self, exp_lists: List[List[Experience]], threshold: int = 85, bullet_threshold: int = 70,
+        dedup: Optional[Deduplicator] = None
+    ) -> List[Experience]:
+        """Merge work experience, resolving the same job written differently and dropping near-duplicate bullets"""
+        dedup = dedup or self.dedup
+        all_experience = [exp for experiences in exp_lists for exp in experiences]
+        labels = dedup.entities('experience', [experience_record(e) for e in all_experience], threshold)
+        clusters: Dict[int, List[Experience]] = {}
+        for label, exp in zip(labels, all_experience):
+            clusters.setdefault(label, []).append(exp)
         
-        for experiences in exp_lists:
-            for exp in experiences:
-                # Create signature for deduplication
-                signature = f"{exp.company.lower()}_{exp.title.lower()}_{exp.start_date or ''}"
-                
-                if signature not in seen_signatures:
-                    merged_experience.append(exp)
-                    seen_signatures.add(signature)
+        merged_experience = []
+        for members in clusters.values():
+            # First member wins; later ones fill what it is missing
+            first = members[0]
+            technologies = {}
+            for exp in members:
+                for tech in exp.technologies:
+                    technologies.setdefault(tech.lower(), tech)
+            merged_experience.append(first.model_copy(update={
+                'location': first.location or next((e.location for e in members if e.location), None),
+                'start_date': first.start_date or next((e.start_date for e in members if e.start_date), None),
+                'end_date': first.end_date or next((e.end_date for e in members if e.end_date), None),
+                'current': any(e.current for e in members),
+                'description': [bullet for exp in members for bullet in exp.description],
+                'technologies': list(technologies.values()),
+            }))
+        
+        kept = dedup.bullets([exp.description for exp in merged_experience], bullet_threshold)
+        for exp, flags in zip(merged_experience, kept):
+            exp.description = [bullet for bullet, keep in zip(exp.description, flags) if keep]
         
         # Sort by date (most recent first) - handle None dates
         merged_experience.sort(
@@ -125,49 +192,50 @@ class ResumeMerger:
         
         return merged_experience
     
-    def _merge_education(self, edu_lists: List[List[Education]]) -> List[Education]:
-        """Merge education, removing duplicates"""
-        seen = set()
-        merged_education = []
+    @metrics.timed("merge_education")
+    def _merge_education(self, edu_lists: List[List[Education]], threshold: int = 85,
+                         dedup: Optional[Deduplicator] = None) -> List[Education]:
+        """Merge education, resolving the same degree written differently"""
+        all_education = [edu for educations in edu_lists for edu in educations]
+        labels = (dedup or self.dedup).entities(
+            'education', [education_record(e) for e in all_education], threshold
+        )
+        clusters: Dict[int, List[Education]] = {}
+        for label, edu in zip(labels, all_education):
+            clusters.setdefault(label, []).append(edu)
         
-        for educations in edu_lists:
-            for edu in educations:
-                key = f"{edu.institution.lower()}_{edu.degree.lower()}"
-                
-                if key not in seen:
-                    merged_education.append(edu)
-                    seen.add(key)
+        merged_education = []
+        for members in clusters.values():
+            first = members[0]
+            merged_education.append(first.model_copy(update={
+                field: getattr(first, field) or next((getattr(e, field) for e in members if getattr(e, field)), None)
+                for field in ('location', 'graduation_date', 'gpa')
+            }))
         
         return merged_education
     
-    def _merge_projects(self, proj_lists: List[List[Project]], threshold: int = 85) -> List[Project]:
+    @metrics.timed("merge_projects")
+    def _merge_projects(self, proj_lists: List[List[Project]], threshold: int = 85,
+                        dedup: Optional[Deduplicator] = None) -> List[Project]:
         """Merge projects with fuzzy matching"""
-        project_map = {}
-        
-        for projects in proj_lists:
-            for proj in projects:
-                normalized_name = proj.name.lower().strip()
-                
-                # Try fuzzy matching
-                matched_key = None
-                if project_map:
-                    match = process.extractOne(
-                        normalized_name,
-                        project_map.keys(),
-                        scorer=fuzz.ratio,
-                        score_cutoff=threshold
-                    )
-                    if match:
-                        matched_key = match[0]
-                
-                if matched_key:
-                    # Merge descriptions if different
-                    existing = project_map[matched_key]
-                    if proj.description != existing.description:
-                        existing.description += f" | {proj.description}"
-                    # Merge technologies
-                    existing.technologies = list(set(existing.technologies + proj.technologies))
-                else:
-                    project_map[normalized_name] = proj
-        
-        return list(project_map.values())
+        all_projects = [proj for projects in proj_lists for proj in projects]
+        labels = (dedup or self.dedup).names('projects', [normalize_name(p.name) for p in all_projects], threshold)
+        
+        # Accumulate on plain values and build each Project once; pydantic attribute writes are slow
+        groups = {}
+        for label, proj in zip(labels, all_projects):
+            group = groups.get(label)
+            if group is None:
+                groups[label] = [proj, proj.description, dict.fromkeys(proj.technologies)]
+                continue
+            
+            # Merge descriptions if different
+            if proj.description != group[1]:
+                group[1] += f" | {proj.description}"
+            # Merge technologies, keeping first-seen order
+            group[2].update(dict.fromkeys(proj.technologies))
+        
+        return [
+            first.model_copy(update={'description': description, 'technologies': list(technologies)}, deep=True)
+            for first, description, technologies in groups.values()
+        ]
@@ -0,0 +1,304 @@
+"""Dependency-free Prometheus metrics and per-request Server-Timing.
+
+Work that runs in a parse worker process can't touch the API process's
+registry, so inside `collect()` every update is recorded instead of applied;
+the worker returns the recording and the API process `replay()`s it, which
+updates the registry and the current request's Server-Timing in one go.
+"""
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Updates recorded inside collect(), as (metric name, labels, value)
+_recording: ContextVar[Optional[List[Tuple[str, LabelKey, float]]]] = ContextVar("metrics_recording", default=None)
+# Stage durations for the current HTTP request, for the Server-Timing header
+_request_timings: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+
+    def _record(self, value: float, labels: Dict[str, str]) -> bool:
+        """Record instead of applying when inside collect()"""
+        recording = _recording.get()
+        if recording is None:
+            return False
+        recording.append((self.name, _label_key(labels), value))
+        return True
+
+    def apply(self, value: float, key: LabelKey):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, value: float = 1, **labels):
+        if not self._record(value, labels):
+            self.apply(value, _label_key(labels))
+
+    def apply(self, value: float, key: LabelKey):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, value: float = 1, **labels):
+        self.apply(value, _label_key(labels))
+
+    def dec(self, value: float = 1, **labels):
+        self.apply(-value, _label_key(labels))
+
+    def apply(self, value: float, key: LabelKey):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(key)} {value}" for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        if not self._record(value, labels):
+            self.apply(value, _label_key(labels))
+
+    def apply(self, value: float, key: LabelKey):
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[bisect.bisect_left(self.buckets, value)] += 1
+            state[-1] += value
+
+    def render(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, state in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    bucket_labels = _format_labels(key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                cumulative += state[len(self.buckets)]
+                bucket_labels = _format_labels(key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {state[-1]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def _add(self, metric: Metric) -> Metric:
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._add(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._add(Gauge(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram("resume_stage_seconds", "Time spent in each pipeline stage")
+DOCUMENTS = REGISTRY.counter("resume_documents_total", "Documents parsed, by format")
+PAGES = REGISTRY.counter("resume_pdf_pages_total", "PDF pages extracted")
+UPLOAD_BYTES = REGISTRY.counter("resume_upload_bytes_total", "Bytes received in uploads, by format")
+CACHE_LOOKUPS = REGISTRY.counter("resume_cache_lookups_total", "Cache lookups, by cache and result")
+EXPORT_BYTES = REGISTRY.counter("resume_export_bytes_total", "Bytes rendered by exports, by format")
+HTTP_SECONDS = REGISTRY.histogram("resume_http_request_seconds", "HTTP request latency, by route and status")
+PARSE_CACHE_HIT_RATIO = REGISTRY.gauge("resume_parse_cache_hit_ratio", "Parse cache hits / lookups since startup")
+PARSE_CACHE_MEMORY_BYTES = REGISTRY.gauge("resume_parse_cache_memory_bytes", "Bytes held by the in-memory parse cache")
+ADMISSION_ACTIVE = REGISTRY.gauge("resume_admission_active", "Requests holding a slot, by endpoint class")
+ADMISSION_QUEUED = REGISTRY.gauge("resume_admission_queued", "Requests waiting for a slot, by endpoint class")
+ADMISSION_REJECTED = REGISTRY.counter("resume_admission_rejected_total", "Requests turned away with 503, by endpoint class and reason")
+STARTUP_SECONDS = REGISTRY.gauge("resume_startup_seconds", "Time spent importing the app and warming up, by phase")
+FIRST_REQUEST_SECONDS = REGISTRY.gauge("resume_first_request_seconds", "Latency of the first request to each route")
+EXPORT_CACHE_MEMORY_BYTES = REGISTRY.gauge("resume_export_cache_memory_bytes", "Bytes held by the export render cache")
+
+
+class RequestTimings:
+    """Stage durations for one request.
+
+    Each stage has the sum of its durations. Stages timed in this process
+    also keep their (start, end) intervals, so when several run at once (the
+    files of one upload) the header can report the wall-clock time they
+    covered instead of a sum that exceeds the request itself.
+    """
+
+    def __init__(self):
+        self.sums: Dict[str, float] = {}
+        self.intervals: Dict[str, List[Tuple[float, float]]] = {}
+
+    def add(self, stage: str, seconds: float, started: Optional[float] = None):
+        self.sums[stage] = self.sums.get(stage, 0.0) + seconds
+        if started is not None:
+            self.intervals.setdefault(stage, []).append((started, started + seconds))
+
+    def span(self, stage: str) -> Optional[float]:
+        """Wall-clock seconds covered by the stage's intervals, overlaps counted once"""
+        intervals = sorted(self.intervals.get(stage, ()))
+        if not intervals:
+            return None
+        covered = 0.0
+        start, end = intervals[0]
+        for next_start, next_end in intervals[1:]:
+            if next_start > end:
+                covered += end - start
+                start = next_start
+            end = max(end, next_end)
+        return covered + end - start
+
+
+def _observe_stage(stage: str, seconds: float, started: Optional[float] = None):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if _recording.get() is None:
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.add(stage, seconds, started)
+
+
+@contextmanager
+def timer(stage: str) -> Iterator[None]:
+    """Time a block as a pipeline stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _observe_stage(stage, time.perf_counter() - started, started)
+
+
+def timed(stage: str):
+    """Decorator form of timer()"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def collect() -> Iterator[List[Tuple[str, LabelKey, float]]]:
+    """Record metric updates made inside the block instead of applying them"""
+    recording: List[Tuple[str, LabelKey, float]] = []
+    token = _recording.set(recording)
+    try:
+        yield recording
+    finally:
+        _recording.reset(token)
+
+
+def replay(recording: List[Tuple[str, LabelKey, float]]):
+    """Apply updates recorded by collect(), typically in another process"""
+    for name, key, value in recording:
+        metric = REGISTRY.metrics.get(name)
+        if metric is None:
+            continue
+        metric.apply(value, key)
+        if metric is STAGE_SECONDS:
+            timings = _request_timings.get()
+            if timings is not None:
+                timings.add(dict(key)["stage"], value)
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """Collect stage durations for one request (see server_timing_header)"""
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def server_timing_header(timings: RequestTimings, total: Optional[float] = None) -> str:
+    """Each stage's wall-clock time; a stage whose runs overlapped also gets `<stage>-sum`, its summed durations
+
+    Stages replayed from worker processes have no intervals and are summed.
+    """
+    entries = []
+    for stage, seconds in timings.sums.items():
+        span = timings.span(stage)
+        # Within a microsecond: the runs did not overlap, so span and sum agree
+        if span is None or seconds - span < 1e-6:
+            entries.append(f"{stage};dur={seconds * 1000:.1f}")
+            continue
+        entries.append(f"{stage};dur={span * 1000:.1f}")
+        entries.append(f'{stage}-sum;dur={seconds * 1000:.1f};desc="{stage}, summed over concurrent runs"')
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
@@ -1,198 +1,230 @@
+import hashlib
+import json
+import os
 import re
-from typing import Dict, Any, List
-import pdfplumber
-from docx import Document
-from models.schemas import ParsedResume, PersonalInfo, Skill, Experience, Education, Project
+from typing import Dict, Any, Iterable, List, Optional, Union, BinaryIO
+import config
+from services import metrics
+from services.extractors import PythonDocxBackend, get_docx_backend, get_pdf_backend
+from services.sections import CONTACT_PATTERNS, SectionIndex, SectionSegmenter
+from services.skills import SkillMatcher
+from models.schemas import RESUME_SECTIONS, ParsedResume, PersonalInfo, Skill, Experience, Education, Project
 
 
 class ResumeParser:
     """Parse PDF and DOCX resumes into structured data"""
     
-    def __init__(self):
-        # Common regex patterns
-        self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        self.phone_pattern = r'(\+?\d{1,3}[-.\s]?)?$$?\d{3}$$?[-.\s]?\d{3}[-.\s]?\d{4}'
-        self.linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        self.github_pattern = r'github\.com/[\w-]+'
-        
-        # Common skill keywords (expand this list)
-        self.skill_keywords = {
-            'programming': ['python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'go', 'rust', 'typescript'],
-            'frontend': ['react', 'vue', 'angular', 'html', 'css', 'tailwind', 'bootstrap', 'sass', 'next.js', 'nuxt'],
-            'backend': ['node.js', 'express', 'django', 'flask', 'fastapi', 'spring', 'rails', '.net'],
-            'database': ['postgresql', 'mysql', 'mongodb', 'redis', 'sqlite', 'dynamodb', 'firebase'],
-            'cloud': ['aws', 'azure', 'gcp', 'vercel', 'heroku', 'docker', 'kubernetes'],
-            'tools': ['git', 'jira', 'figma', 'postman', 'jenkins', 'github actions']
+    # Bump when parsing rules change in a way that alters output
+    VERSION = "3"
+    
+    # Sections whose headings must all appear before PDF extraction may stop early
+    REQUIRED_SECTIONS = ('experience', 'education', 'skills', 'projects')
+    
+    def __init__(self, pdf_backend: Optional[str] = None, max_pages: Optional[int] = None,
+                 max_chars: Optional[int] = None, tail_pages: Optional[int] = None,
+                 docx_backend: Optional[str] = None, section_headings: Optional[Dict[str, List[str]]] = None,
+                 skill_matcher: Optional[SkillMatcher] = None):
+        # PDF extraction backend and page budget (defaults come from config)
+        self.pdf_backend = get_pdf_backend(pdf_backend or config.PDF_BACKEND)
+        self.max_pages = config.PDF_MAX_PAGES if max_pages is None else max_pages
+        self.max_chars = config.PDF_MAX_CHARS if max_chars is None else max_chars
+        self.tail_pages = config.PDF_TAIL_PAGES if tail_pages is None else tail_pages
+        self.docx_backend = get_docx_backend(docx_backend or config.DOCX_BACKEND)
+        
+        # Section headings and contact fields, found in one pass over the lines
+        self.segmenter = SectionSegmenter(section_headings)
+        self.year_pattern = re.compile(r'\d{4}')
+        
+        # Skill taxonomy, loaded from a file and compiled into a single-pass matcher
+        self.skill_matcher = skill_matcher or SkillMatcher.from_file(
+            config.SKILL_TAXONOMY_PATH, config.SKILL_MATCHER_CACHE_DIR or None
+        )
+    
+    def fingerprint(self) -> str:
+        """Identify the parser configuration, for keying cached results"""
+        settings = {
+            "version": self.VERSION,
+            "pdf": [self.pdf_backend.name, self.max_pages, self.max_chars, self.tail_pages],
+            "docx": self.docx_backend.name,
+            "contact": CONTACT_PATTERNS,
+            "headings": self.segmenter.headings,
+            "skills": self.skill_matcher.digest,
         }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
     
-    def parse_resume(self, file_path: str) -> ParsedResume:
-        """Main parsing method"""
-        if file_path.endswith('.pdf'):
-            text = self._extract_from_pdf(file_path)
-        elif file_path.endswith('.docx'):
-            text = self._extract_from_docx(file_path)
+    def parse_resume(self, source: Union[str, BinaryIO], file_type: Optional[str] = None,
+                     sections: Optional[Iterable[str]] = None) -> ParsedResume:
+        """Main parsing method
+        
+        `source` is a file path or a binary file-like object. For file-like
+        objects pass `file_type` ("pdf" or "docx"); paths fall back to their
+        extension. `sections` limits parsing to those sections (default: all).
+        """
+        return self.parse_text(self.extract_text(source, file_type), sections)
+    
+    def extract_text(self, source: Union[str, BinaryIO], file_type: Optional[str] = None) -> str:
+        """Plain text of a document; everything else is parsed from this"""
+        if file_type is None and isinstance(source, str):
+            file_type = os.path.splitext(source)[1].lstrip('.').lower()
+        
+        if file_type == 'pdf':
+            text = self._extract_from_pdf(source)
+        elif file_type == 'docx':
+            text = self._extract_from_docx(source)
         else:
             raise ValueError("Unsupported file format")
-        
-        # Parse sections
-        personal_info = self._parse_personal_info(text)
-        skills = self._parse_skills(text)
-        experience = self._parse_experience(text)
-        education = self._parse_education(text)
-        projects = self._parse_projects(text)
-        
-        return ParsedResume(
-            personal_info=personal_info,
-            skills=skills,
-            experience=experience,
-            education=education,
-            projects=projects
-        )
-    
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF"""
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
+        metrics.DOCUMENTS.inc(format=file_type)
         return text
     
-    def _extract_from_docx(self, file_path: str) -> str:
+    def parse_text(self, text: str, sections: Optional[Iterable[str]] = None) -> ParsedResume:
+        """Parse the requested sections from extracted text; the rest keep their empty defaults"""
+        wanted = set(RESUME_SECTIONS if sections is None else sections)
+        unknown = wanted - set(RESUME_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+        
+        fields = {}
+        # Skills are mentioned throughout (e.g. in experience bullets), so scan everything
+        if 'skills' in wanted:
+            fields['skills'] = self._parse_skills(text)
+        if wanted - {'skills'}:
+            # Index sections once, then parse each from its own slice
+            with metrics.timer("segment"):
+                index = self.segmenter.segment(text)
+            if 'personal_info' in wanted:
+                fields['personal_info'] = self._parse_personal_info(index)
+            if 'experience' in wanted:
+                fields['experience'] = self._parse_experience(index.lines('experience'))
+            if 'education' in wanted:
+                fields['education'] = self._parse_education(index.lines('education'))
+            if 'projects' in wanted:
+                fields['projects'] = self._parse_projects(index.lines('projects'))
+        
+        return ParsedResume(personal_info=fields.pop('personal_info', PersonalInfo()), **fields)
+    
+    @metrics.timed("extract_pdf")
+    def _extract_from_pdf(self, source: Union[str, BinaryIO]) -> str:
+        """Extract text from PDF page by page, stopping early when the budget allows"""
+        pages = []
+        chars = 0
+        pending_sections = set(self.REQUIRED_SECTIONS)
+        complete_at = None
+        
+        for page_text in self.pdf_backend.iter_pages(source):
+            pages.append(page_text)
+            chars += len(page_text)
+            
+            if self.max_pages and len(pages) >= self.max_pages:
+                break
+            if self.max_chars and chars >= self.max_chars:
+                break
+            
+            # Once every section has started, the last one only needs a few more pages
+            if self.tail_pages >= 0:
+                if pending_sections:
+                    pending_sections -= {
+                        self.segmenter.heading(line.strip()) for line in page_text.split('\n')
+                    }
+                    if not pending_sections:
+                        complete_at = len(pages)
+                if complete_at is not None and len(pages) - complete_at >= self.tail_pages:
+                    break
+        
+        metrics.PAGES.inc(len(pages))
+        text = "\n".join(pages)
+        return text[:self.max_chars] if self.max_chars else text
+    
+    @metrics.timed("extract_docx")
+    def _extract_from_docx(self, source: Union[str, BinaryIO]) -> str:
         """Extract text from DOCX"""
-        doc = Document(file_path)
-        return "\n".join([para.text for para in doc.paragraphs])
+        try:
+            return "\n".join(self.docx_backend.iter_lines(source))
+        except Exception:
+            if isinstance(self.docx_backend, PythonDocxBackend):
+                raise
+            # Unusual packaging the streaming reader can't handle; python-docx is more forgiving
+            if hasattr(source, "seek"):
+                source.seek(0)
+            return "\n".join(PythonDocxBackend().iter_lines(source))
     
-    def _parse_personal_info(self, text: str) -> PersonalInfo:
+    @metrics.timed("parse_personal_info")
+    def _parse_personal_info(self, index: SectionIndex) -> PersonalInfo:
         """Extract personal information"""
-        lines = text.split('\n')
-        
-        # Assume first non-empty line is the name
-        name = next((line.strip() for line in lines if line.strip()), None)
-        
-        # Extract email
-        email_match = re.search(self.email_pattern, text)
-        email = email_match.group(0) if email_match else None
-        
-        # Extract phone
-        phone_match = re.search(self.phone_pattern, text)
-        phone = phone_match.group(0) if phone_match else None
-        
-        # Extract LinkedIn
-        linkedin_match = re.search(self.linkedin_pattern, text, re.IGNORECASE)
-        linkedin = linkedin_match.group(0) if linkedin_match else None
-        
-        # Extract GitHub
-        github_match = re.search(self.github_pattern, text, re.IGNORECASE)
-        github = github_match.group(0) if github_match else None
-        
         return PersonalInfo(
-            name=name,
-            email=email,
-            phone=phone,
-            linkedin=linkedin,
-            github=github
+            name=index.name,
+            email=index.contact.get('email'),
+            phone=index.contact.get('phone'),
+            linkedin=index.contact.get('linkedin'),
+            github=index.contact.get('github')
         )
     
+    @metrics.timed("parse_skills")
     def _parse_skills(self, text: str) -> List[Skill]:
-        """Extract skills using keyword matching"""
-        text_lower = text.lower()
+        """Extract skills by matching the taxonomy, counting each occurrence"""
         found_skills = []
         
-        for category, keywords in self.skill_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    found_skills.append(Skill(
-                        name=keyword.title(),
-                        category=category,
-                        frequency=1,
-                        confidence=0.9
-                    ))
+        for skill_id, count in self.skill_matcher.match(text).items():
+            skill = self.skill_matcher.skills[skill_id]
+            found_skills.append(Skill(
+                name=skill['name'],
+                category=skill['category'],
+                frequency=count,
+                confidence=0.9
+            ))
         
         return found_skills
     
-    def _parse_experience(self, text: str) -> List[Experience]:
+    @metrics.timed("parse_experience")
+    def _parse_experience(self, lines: List[str]) -> List[Experience]:
         """Extract work experience (basic implementation)"""
         experiences = []
+        current_exp = None
         
-        # Look for experience section
-        exp_patterns = [
-            r'(?:experience|work history|employment)(.*?)(?:education|skills|projects|$)',
-            r'(?:professional experience)(.*?)(?:education|skills|$)'
-        ]
-        
-        for pattern in exp_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                exp_text = match.group(1)
-                # Simple extraction - split by company/role indicators
-                lines = exp_text.split('\n')
-                
-                current_exp = None
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Heuristic: lines with dates often indicate new experience entry
-                    if re.search(r'\d{4}', line):
-                        if current_exp:
-                            experiences.append(current_exp)
-                        
-                        current_exp = Experience(
-                            title=line.split('|')[0].strip() if '|' in line else line,
-                            company=line.split('|')[1].strip() if '|' in line and len(line.split('|')) > 1 else "Unknown",
-                            description=[]
-                        )
-                    elif current_exp:
-                        current_exp.description.append(line)
-                
+        for line in lines:
+            # Heuristic: lines with dates often indicate new experience entry
+            if self.year_pattern.search(line):
                 if current_exp:
                     experiences.append(current_exp)
                 
-                break
+                parts = line.split('|')
+                current_exp = Experience(
+                    title=parts[0].strip(),
+                    company=parts[1].strip() if len(parts) > 1 else "Unknown",
+                    description=[]
+                )
+            elif current_exp:
+                current_exp.description.append(line)
+        
+        if current_exp:
+            experiences.append(current_exp)
         
         return experiences
     
-    def _parse_education(self, text: str) -> List[Education]:
+    @metrics.timed("parse_education")
+    def _parse_education(self, lines: List[str]) -> List[Education]:
         """Extract education"""
         education = []
         
-        # Look for education section
-        edu_pattern = r'(?:education)(.*?)(?:experience|skills|projects|$)'
-        match = re.search(edu_pattern, text, re.IGNORECASE | re.DOTALL)
-        
-        if match:
-            edu_text = match.group(1)
-            lines = edu_text.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if line and len(line) > 10:  # Skip short lines
-                    education.append(Education(
-                        degree=line,
-                        institution="Parsed from resume"
-                    ))
+        for line in lines:
+            if len(line) > 10:  # Skip short lines
+                education.append(Education(
+                    degree=line,
+                    institution="Parsed from resume"
+                ))
         
         return education
     
-    def _parse_projects(self, text: str) -> List[Project]:
+    @metrics.timed("parse_projects")
+    def _parse_projects(self, lines: List[str]) -> List[Project]:
         """Extract projects"""
         projects = []
         
-        # Look for projects section
-        proj_pattern = r'(?:projects)(.*?)(?:experience|education|skills|$)'
-        match = re.search(proj_pattern, text, re.IGNORECASE | re.DOTALL)
-        
-        if match:
-            proj_text = match.group(1)
-            lines = proj_text.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if line and len(line) > 10:
-                    projects.append(Project(
-                        name=line.split('-')[0].strip() if '-' in line else line,
-                        description=line.split('-')[1].strip() if '-' in line else line
-                    ))
+        for line in lines:
+            if len(line) > 10:
+                name, sep, description = line.partition('-')
+                projects.append(Project(
+                    name=name.strip() if sep else line,
+                    description=description.strip() if sep else line
+                ))
         
         return projects
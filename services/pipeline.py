@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import sqlite3
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from models.schemas import RESUME_SECTIONS, ParsedResume
+from services import metrics, profiler
+from services.cache import ParseCache, ParseEntry
+from services.executor import ParseExecutor
+from services.ingest import IngestedFile
+from services.search import ResumeIndex
+
+logger = logging.getLogger(__name__)
+
+
+class ParsePipeline:
+    """Turn ingested uploads into ParsedResume objects, consulting the parse cache first.
+
+    Only the requested sections are parsed. The extracted text is cached with
+    them, so asking for more sections of the same file later skips extraction
+    and parses just the missing ones.
+    """
+
+    def __init__(self, executor: ParseExecutor, cache: ParseCache, index: Optional[ResumeIndex] = None):
+        self.executor = executor
+        self.cache = cache
+        # Fully parsed uploads are also added to the search index, when there is one
+        self.index = index
+
+    async def parse_one(self, upload: IngestedFile, sections: Optional[List[str]] = None) -> ParsedResume:
+        sections = RESUME_SECTIONS if sections is None else list(sections)
+        # A profiled request wants to see the parse itself, not a cache hit
+        entry = await self.cache.get_async(upload.digest) if profiler.current() is None else None
+        if entry is not None:
+            result = await self._complete(upload.digest, entry, sections)
+        else:
+            # Wall time in the pool, including queueing and transfer to the worker
+            with metrics.timer("parse"):
+                text, result = await self.executor.parse(upload.data, upload.file_type, sections)
+            await self.cache.put_async(upload.digest, ParseEntry(text, sections, result))
+
+        if self.index is not None and set(sections) >= set(RESUME_SECTIONS):
+            await self._index(upload, result)
+        return result
+
+    async def _index(self, upload: IngestedFile, result: ParsedResume):
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.index.add, upload.digest, result, upload.filename, False
+            )
+        except sqlite3.Error:
+            # Search is a side feature; a broken index must not fail the upload
+            logger.exception("Could not index %s", upload.filename)
+
+    async def parse_cached(self, digest: str, sections: List[str]) -> Optional[ParsedResume]:
+        """Sections of an earlier upload, from its cached text; None once it has been evicted"""
+        entry = await self.cache.get_async(digest)
+        if entry is None:
+            return None
+        return await self._complete(digest, entry, sections)
+
+    async def _complete(self, digest: str, entry: ParseEntry, sections: List[str]) -> ParsedResume:
+        missing = entry.missing(sections)
+        if missing:
+            with metrics.timer("parse_text"):
+                result = await self.executor.parse_text(entry.text, sorted(missing))
+            entry.add(missing, result)
+            await self.cache.put_async(digest, entry)
+        return entry.select(sections)
+
+    def _schedule(self, uploads: List[IngestedFile], sections: Optional[List[str]]) -> List[asyncio.Future]:
+        """One task per distinct file; identical files in one request share it"""
+        tasks: Dict[str, asyncio.Future] = {}
+        for upload in uploads:
+            if upload.digest not in tasks:
+                tasks[upload.digest] = asyncio.ensure_future(self.parse_one(upload, sections))
+        return [tasks[upload.digest] for upload in uploads]
+
+    async def parse_many(self, uploads: List[IngestedFile],
+                         sections: Optional[List[str]] = None) -> List[Union[ParsedResume, Exception]]:
+        """Parse uploads concurrently; failures are returned, not raised"""
+        return await asyncio.gather(*self._schedule(uploads, sections), return_exceptions=True)
+
+    async def iter_completed(
+        self, uploads: List[IngestedFile], sections: Optional[List[str]] = None
+    ) -> AsyncIterator[Tuple[int, Optional[ParsedResume], Optional[Exception]]]:
+        """Yield (position, result, error) for each upload as soon as it finishes"""
+        futures = self._schedule(uploads, sections)
+
+        async def tagged(position: int, future: asyncio.Future):
+            try:
+                return position, await asyncio.shield(future), None
+            except Exception as e:
+                return position, None, e
+
+        try:
+            for next_done in asyncio.as_completed([tagged(i, f) for i, f in enumerate(futures)]):
+                yield await next_done
+        finally:
+            # Client went away mid-stream: stop work nobody will read
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,254 @@
+"""Opt-in stack-sampling profiler for parse, merge and export calls.
+
+A background thread samples the profiled thread's Python stack every
+`interval` seconds, so overhead is bounded by the sampling rate rather than
+by how many calls the code makes. Profiles record only the input's SHA-256
+and size; the document itself is never written anywhere.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+FORMATS = ("speedscope", "collapsed")
+
+# (function, file, first line) from the outermost frame to the innermost
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+
+def _short_path(path: str) -> str:
+    for prefix in sorted(sys.path, key=len, reverse=True):
+        if prefix and path.startswith(prefix + os.sep):
+            return path[len(prefix) + 1:]
+    return path
+
+
+class Profile:
+    """Sampled stacks for one profiled call"""
+
+    def __init__(self, stage: str, interval: float):
+        self.stage = stage
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+        self.tags: Dict[str, Any] = {}
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format, for flamegraph.pl / speedscope / inferno
+
+        The first line is a comment holding the stage and tags as JSON; it ends
+        in "}" rather than a count, so the tools skip it as a malformed stack.
+        """
+        lines = ["# " + json.dumps({"stage": self.stage, **self.tags}, sort_keys=True)]
+        for stack, count in self.samples.most_common():
+            names = ";".join(f"{name} ({path}:{line})" for name, path, line in stack)
+            lines.append(f"{names} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> Dict[str, Any]:
+        """A "sampled" profile in speedscope's file format"""
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[Frame, int] = {}
+        samples, weights = [], []
+        for stack, count in self.samples.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.stage} {self.tags.get('sha256', '')[:12]}",
+            "exporter": "resume-merger",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.stage,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": samples,
+                "weights": weights,
+            }],
+            "tags": self.tags,
+        }
+
+
+class StackSampler(threading.Thread):
+    """Sample one thread's stack until stopped"""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, _short_path(code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        self.join()
+        return self.samples
+
+
+@contextmanager
+def sample(stage: str, interval: float) -> Iterator[Profile]:
+    """Profile the calling thread for the duration of the block"""
+    profile = Profile(stage, interval)
+    sampler = StackSampler(threading.get_ident(), interval)
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        yield profile
+    finally:
+        profile.samples = sampler.stop()
+        profile.duration = time.perf_counter() - started
+
+
+class ProfileStore:
+    """Profiles written to a directory, oldest deleted beyond `keep`"""
+
+    def __init__(self, directory: str, keep: int = 100):
+        self.directory = directory
+        self.keep = keep
+
+    def _paths(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(name for name in os.listdir(self.directory) if not name.endswith(".tmp"))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def save(self, profile: Profile, format: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + f"{int(now * 1000) % 1000:03d}"
+        profile_id = f"{stamp}-{profile.stage}-{uuid.uuid4().hex[:8]}"
+        if format == "collapsed":
+            path = os.path.join(self.directory, f"{profile_id}.collapsed.txt")
+            body = profile.collapsed()
+        else:
+            path = os.path.join(self.directory, f"{profile_id}.speedscope.json")
+            body = json.dumps(profile.speedscope())
+        with open(path + ".tmp", "w") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)
+
+        paths = self._paths()
+        for stale in paths[:max(0, len(paths) - self.keep)]:
+            os.remove(stale)
+        return profile_id
+
+    @staticmethod
+    def _tags(path: str) -> Dict[str, Any]:
+        """The input's SHA-256, size and other tags, from the collapsed header or the speedscope document"""
+        try:
+            with open(path) as f:
+                if path.endswith(".collapsed.txt"):
+                    header = f.readline()
+                    return json.loads(header[2:]) if header.startswith("# ") else {}
+                return json.load(f).get("tags", {})
+        except (OSError, ValueError):
+            return {}
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [
+            {"id": os.path.basename(path).split(".")[0], "file": os.path.basename(path), "bytes": os.path.getsize(path),
+             "tags": self._tags(path)}
+            for path in reversed(self._paths())
+        ]
+
+    def path(self, profile_id: str) -> Optional[str]:
+        for path in self._paths():
+            if os.path.basename(path).split(".")[0] == profile_id:
+                return path
+        return None
+
+
+class ProfileSession:
+    """Profiling settings and results for one request"""
+
+    def __init__(self, store: ProfileStore, format: str, interval: float):
+        self.store = store
+        self.format = format
+        self.interval = interval
+        self.profile_ids: List[str] = []
+
+    def record(self, profile: Profile, payload: bytes, **tags):
+        profile.tags.update(sha256=hashlib.sha256(payload).hexdigest(), size=len(payload), **tags)
+        self.profile_ids.append(self.store.save(profile, self.format))
+
+
+class ProfileWindow:
+    """Profile every request in this process until a deadline"""
+
+    def __init__(self):
+        self.until = 0.0
+        self.format = FORMATS[0]
+
+    def enable(self, seconds: float, format: str):
+        self.until = time.time() + seconds
+        self.format = format
+
+    def disable(self):
+        self.until = 0.0
+
+    def active(self) -> bool:
+        return time.time() < self.until
+
+
+_session: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+def current() -> Optional[ProfileSession]:
+    return _session.get()
+
+
+@contextmanager
+def activate(session: Optional[ProfileSession]) -> Iterator[Optional[ProfileSession]]:
+    token = _session.set(session)
+    try:
+        yield session
+    finally:
+        _session.reset(token)
+
+
+@contextmanager
+def profiled(stage: str, payload: Callable[[], bytes]) -> Iterator[None]:
+    """Profile the block if the current request asked for it.
+
+    `payload` is only called when profiling, to hash and measure the input.
+    """
+    session = current()
+    if session is None:
+        yield
+        return
+    with sample(stage, session.interval) as profile:
+        yield
+    session.record(profile, payload())
+
+
+def call(stage: str, payload: Callable[[], bytes], fn, *args):
+    """fn(*args) under profiled(); for handing to a thread pool"""
+    with profiled(stage, payload):
+        return fn(*args)
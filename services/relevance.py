@@ -0,0 +1,164 @@
+"""Rank resume content against a job description.
+
+Experience entries, their bullets, projects and skills are scored with BM25 in
+one vectorized pass per merge. Every text is tokenized once and skill aliases
+from the taxonomy are folded into one term per skill, so "k8s" in a bullet
+counts for "Kubernetes" in the job description. Tokens the job description
+doesn't contain are dropped, and the remaining (text, term) pairs become a
+term-frequency matrix that numpy scores in a few array operations. Each kind of
+text is length-normalized against its own average.
+
+IDF comes from the search index's document frequencies once it holds enough
+resumes (cached per process for a while), otherwise from the texts being ranked.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import config
+from models.schemas import ParsedResume
+from services.dedup import normalize_name
+from services.search import B, K1, STOPWORDS, ResumeIndex
+from services.skills import SkillMatcher, tokenize
+
+# Text kinds, normalized for length separately
+EXPERIENCE, BULLET, PROJECT, SKILL = range(4)
+
+
+class CorpusIdf:
+    """Document frequencies from the search index, cached for `ttl` seconds"""
+
+    def __init__(self, index: ResumeIndex, ttl: float = 300.0, min_documents: int = 50):
+        self.index = index
+        self.ttl = ttl
+        # Below this many resumes the corpus says little; rank with local statistics instead
+        self.min_documents = min_documents
+        self._lock = threading.Lock()
+        self._documents = 0
+        self._df: Dict[str, int] = {}
+        self._loaded = float("-inf")
+
+    def lookup(self, terms: List[str]) -> Optional[Tuple[int, List[int]]]:
+        """(corpus size, document frequency of each term), or None if the corpus is too small"""
+        with self._lock:
+            if time.monotonic() - self._loaded > self.ttl:
+                self._df.clear()
+                self._documents = 0
+                self._loaded = time.monotonic()
+            missing = [term for term in terms if term not in self._df]
+            if missing or not self._documents:
+                documents, found = self.index.document_frequencies(missing)
+                self._documents = self._documents or documents
+                self._df.update(dict.fromkeys(missing, 0))
+                self._df.update(found)
+            if self._documents < self.min_documents:
+                return None
+            return self._documents, [self._df[term] for term in terms]
+
+
+class RelevanceRanker:
+    """BM25 relevance of resume content to a job description"""
+
+    def __init__(self, index: Optional[ResumeIndex] = None, matcher: Optional[SkillMatcher] = None):
+        self.corpus = CorpusIdf(index, config.RELEVANCE_IDF_TTL, config.RELEVANCE_MIN_CORPUS) if index else None
+        # The taxonomy is loaded on first use
+        self._matcher = matcher
+        self._skill_terms: List[str] = []
+
+    @property
+    def matcher(self) -> SkillMatcher:
+        if self._matcher is None:
+            self._matcher = SkillMatcher.from_file(config.SKILL_TAXONOMY_PATH, config.SKILL_MATCHER_CACHE_DIR or None)
+        if not self._skill_terms:
+            # Same spelling as the search index's skill terms, so corpus frequencies line up
+            self._skill_terms = ["skill:" + normalize_name(skill["name"]) for skill in self._matcher.skills]
+        return self._matcher
+
+    def terms(self, text: str) -> List[str]:
+        """Index terms of a text: one per skill mention, one per remaining non-stopword"""
+        matcher = self.matcher
+        tokens = tokenize(text)
+        terms = []
+        position = 0
+        for start, length, skill_id in matcher.spans(tokens):
+            terms.extend("word:" + word for word in tokens[position:start] if word not in STOPWORDS)
+            terms.append(self._skill_terms[skill_id])
+            position = start + length
+        terms.extend("word:" + word for word in tokens[position:] if word not in STOPWORDS)
+        return terms
+
+    def score(self, query: str, documents: List[List[str]], kinds: List[int]):
+        """BM25 score of each document (a list of terms()) against `query`, as a numpy array"""
+        import numpy as np
+
+        vocabulary = {term: column for column, term in enumerate(dict.fromkeys(self.terms(query)))}
+        if not vocabulary or not documents:
+            return np.zeros(len(documents))
+
+        lengths = np.fromiter(map(len, documents), dtype=np.float64, count=len(documents))
+        # Column of every term in every document (-1 when the query doesn't have it), flattened
+        columns = np.fromiter((vocabulary.get(term, -1) for terms in documents for term in terms),
+                              dtype=np.int64, count=int(lengths.sum()))
+        rows = np.repeat(np.arange(len(documents)), lengths.astype(np.int64))
+        matched = columns >= 0
+        cells = rows[matched] * len(vocabulary) + columns[matched]
+        tf = np.bincount(cells, minlength=len(documents) * len(vocabulary)).reshape(len(documents), len(vocabulary))
+
+        kinds = np.asarray(kinds)
+        average = np.bincount(kinds, lengths) / np.maximum(np.bincount(kinds), 1)
+        norm = K1 * (1 - B + B * lengths / np.maximum(average[kinds], 1))
+        return (tf * (K1 + 1) / (tf + norm[:, None])) @ self._idf(list(vocabulary), tf > 0)
+
+    def _idf(self, terms: List[str], present):
+        import numpy as np
+
+        frequencies = self.corpus.lookup(terms) if self.corpus is not None else None
+        if frequencies is None:
+            documents, df = present.shape[0], present.sum(axis=0)
+        else:
+            documents, df = frequencies[0], np.asarray(frequencies[1])
+        return np.log(1 + (documents - df + 0.5) / (df + 0.5))
+
+    def rank(self, resume: ParsedResume, job_description: str) -> ParsedResume:
+        """Reorder experience (and each entry's bullets), projects and skills, most relevant first.
+
+        The sorts are stable, so equally relevant items keep their merge order.
+        """
+        import numpy as np
+
+        # Each text is tokenized once; an experience entry's document reuses its bullets' terms
+        bullets = [[self.terms(bullet) for bullet in exp.description] for exp in resume.experience]
+        documents: List[List[str]] = [
+            self.terms(" ".join([exp.title, *exp.technologies])) + [term for terms in exp_bullets for term in terms]
+            for exp, exp_bullets in zip(resume.experience, bullets)
+        ]
+        kinds = [EXPERIENCE] * len(documents)
+        for exp_bullets in bullets:
+            documents.extend(exp_bullets)
+            kinds.extend([BULLET] * len(exp_bullets))
+        for proj in resume.projects:
+            documents.append(self.terms(" ".join([proj.name, proj.description, *proj.technologies])))
+            kinds.append(PROJECT)
+        documents.extend(self.terms(skill.name) for skill in resume.skills)
+        kinds.extend([SKILL] * len(resume.skills))
+
+        scores = self.score(job_description, documents, kinds)
+        split = np.cumsum([len(resume.experience), sum(len(exp.description) for exp in resume.experience),
+                           len(resume.projects)])
+        experience_scores, bullet_scores, project_scores, skill_scores = np.split(scores, split)
+
+        def ranked(items: list, item_scores) -> list:
+            return [items[i] for i in np.argsort(-item_scores, kind="stable")]
+
+        experience = []
+        bullet_start = 0
+        for exp in resume.experience:
+            bullets = bullet_scores[bullet_start:bullet_start + len(exp.description)]
+            bullet_start += len(exp.description)
+            experience.append(exp.model_copy(update={"description": ranked(exp.description, bullets)}))
+
+        return resume.model_copy(update={
+            "experience": ranked(experience, experience_scores),
+            "projects": ranked(resume.projects, project_scores),
+            "skills": ranked(resume.skills, skill_scores),
+        })
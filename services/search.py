@@ -0,0 +1,316 @@
+"""Searchable corpus of parsed resumes.
+
+An inverted index in SQLite: one posting row per (term, resume), clustered by
+term so a term's posting list is a single range scan. Terms come from each
+skill's normalized name and category, and from the words of experience and
+project descriptions. Inserts and deletes update the postings, document
+frequencies and corpus totals in one transaction, so the index never needs
+rebuilding.
+
+Query syntax (`QueryError` on anything unusable):
+
+    python docker              both; a bare word matches a skill name or a description word
+    python OR golang           either
+    -php                       excluding
+    skill:"machine learning"   a skill name (a quoted bare value means the same)
+    category:cloud             a skill category
+    text:kubernetes            a description word only
+
+Matches are ranked by BM25, or newest first with `rank="none"`.
+"""
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.schemas import ParsedResume
+from services.dedup import normalize_name
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+QUERY_PATTERN = re.compile(r'(-?)(?:(skill|category|text):)?("[^"]*"|\S+)')
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or our that the their this to "
+    "was were will with we i my".split()
+)
+
+
+class QueryError(ValueError):
+    """The query has no positive terms or can't be parsed"""
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+
+
+def document_terms(resume: ParsedResume) -> Counter:
+    """Term frequencies for one resume"""
+    terms: Counter = Counter()
+    for skill in resume.skills:
+        terms["skill:" + normalize_name(skill.name)] += 1
+        if skill.category:
+            terms["category:" + normalize_name(skill.category)] += 1
+    for exp in resume.experience:
+        for bullet in exp.description:
+            terms.update("word:" + word for word in tokenize(bullet))
+    for proj in resume.projects:
+        terms.update("word:" + word for word in tokenize(proj.description))
+    return terms
+
+
+def parse_query(query: str) -> Tuple[List[List[str]], List[str]]:
+    """(clauses, excluded): a match has a term from every clause and none of the excluded terms"""
+    clauses: List[List[str]] = []
+    excluded: List[str] = []
+    join_next = False
+    for negate, field, value in QUERY_PATTERN.findall(query):
+        if value == "OR" and not negate and not field:
+            join_next = bool(clauses)
+            continue
+        quoted = value.startswith('"')
+        value = value.strip('"')
+        if field == "skill" or (not field and quoted):
+            terms = ["skill:" + normalize_name(value)] if value.strip() else []
+        elif field == "category":
+            terms = ["category:" + normalize_name(value)] if value.strip() else []
+        else:
+            words = tokenize(value)
+            terms = ["word:" + word for word in words]
+            if not field and len(words) == 1:
+                terms.append("skill:" + normalize_name(value))
+        if not terms:
+            continue
+        if negate:
+            excluded.extend(terms)
+        elif join_next:
+            clauses[-1].extend(terms)
+        else:
+            clauses.append(terms)
+        join_next = False
+    if not clauses:
+        raise QueryError("Query needs at least one term to match")
+    return clauses, excluded
+
+
+class ResumeIndex:
+    """Inverted index over parsed resumes, keyed by a caller-chosen string (the upload digest)"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                filename TEXT,
+                name TEXT,
+                length INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                added REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                PRIMARY KEY (term, doc)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS corpus (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                documents INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO corpus (id, documents, length) VALUES (0, 0, 0);
+            """
+        )
+
+    def add(self, key: str, resume: ParsedResume, filename: Optional[str] = None, replace: bool = True):
+        """Index a resume, replacing any earlier one under the same key (or keeping it, with replace=False)"""
+        self.add_many([(key, resume, filename)], replace)
+
+    def add_many(self, items: List[Tuple[str, ParsedResume, Optional[str]]], replace: bool = True):
+        """add() for many resumes in one transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key, resume, filename in items:
+                    if replace or not self._conn.execute("SELECT 1 FROM documents WHERE key = ?", (key,)).fetchone():
+                        self._insert(key, resume, filename)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _insert(self, key: str, resume: ParsedResume, filename: Optional[str]):
+        terms = document_terms(resume)
+        length = sum(terms.values())
+        self._delete(key)
+        doc = self._conn.execute(
+            "INSERT INTO documents (key, filename, name, length, data, added) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, filename, resume.personal_info.name, length, resume.model_dump_json(), time.time())
+        ).lastrowid
+        # Document length rides along in each posting so scoring never touches the documents table
+        self._conn.executemany(
+            "INSERT INTO postings (term, doc, tf, length) VALUES (?, ?, ?, ?)",
+            [(term, doc, tf, length) for term, tf in terms.items()]
+        )
+        self._conn.executemany(
+            "INSERT INTO terms (term, df) VALUES (?, 1) ON CONFLICT (term) DO UPDATE SET df = df + 1",
+            [(term,) for term in terms]
+        )
+        self._conn.execute("UPDATE corpus SET documents = documents + 1, length = length + ? WHERE id = 0", (length,))
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = self._delete(key)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return deleted
+
+    def _delete(self, key: str) -> bool:
+        row = self._conn.execute("SELECT id, length FROM documents WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        doc = row["id"]
+        self._conn.execute(
+            "UPDATE terms SET df = df - 1 WHERE term IN (SELECT term FROM postings WHERE doc = ?)", (doc,)
+        )
+        self._conn.execute(
+            "DELETE FROM terms WHERE df <= 0 AND term IN (SELECT term FROM postings WHERE doc = ?)", (doc,)
+        )
+        self._conn.execute("DELETE FROM postings WHERE doc = ?", (doc,))
+        self._conn.execute("DELETE FROM documents WHERE id = ?", (doc,))
+        self._conn.execute(
+            "UPDATE corpus SET documents = documents - 1, length = length - ? WHERE id = 0", (row["length"],)
+        )
+        return True
+
+    def get(self, key: str) -> Optional[ParsedResume]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM documents WHERE key = ?", (key,)).fetchone()
+        return ParsedResume.model_validate_json(row["data"]) if row else None
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, rank: str = "bm25") -> Dict[str, Any]:
+        """One page of matches (BM25 order, or newest first with rank="none") and the total match count"""
+        clauses, excluded = parse_query(query)
+        with self._lock:
+            rows = self._match(clauses, excluded, limit, offset, rank == "none")
+            # Past the last page the total has to be counted separately
+            counted = rows or (offset and self._match(clauses, excluded, 1, 0, True))
+            total = counted[0][2] if counted else 0
+            results = self._describe([(doc, None if rank == "none" else score) for doc, score, _ in rows])
+        return {"total": total, "results": results}
+
+    def _match(self, clauses: List[List[str]], excluded: List[str], limit: int, offset: int,
+               newest_first: bool) -> List[Tuple[int, float, int]]:
+        """(doc, BM25 score, total matches) for one page.
+
+        A single pass over the postings of the query terms: each term carries
+        a bitmask of the clauses it satisfies, a document matches when its
+        terms cover every clause, and its score is summed in the same GROUP BY.
+        When one clause is much rarer than the rest, only its documents are
+        visited, through (term, doc) key lookups.
+        """
+        positive = sorted({term for clause in clauses for term in clause})
+        corpus = self._conn.execute("SELECT documents, length FROM corpus WHERE id = 0").fetchone()
+        average_length = corpus["length"] / corpus["documents"] if corpus["documents"] else 1.0
+        frequency = {
+            row["term"]: row["df"] for row in self._conn.execute(
+                f"SELECT term, df FROM terms WHERE term IN ({', '.join('?' * len(positive))})", positive
+            )
+        }
+        clause_frequency = [sum(frequency.get(term, 0) for term in clause) for clause in clauses]
+        if not all(clause_frequency):
+            return []
+
+        weights = []
+        for term, df in frequency.items():
+            idf = math.log(1 + (corpus["documents"] - df + 0.5) / (df + 0.5))
+            mask = sum(1 << i for i, clause in enumerate(clauses) if term in clause)
+            weights.extend((term, idf, mask))
+        params: List[Any] = [*weights]
+        sql = f"WITH query (term, idf, mask) AS (VALUES {', '.join('(?, ?, ?)' for _ in frequency)})"
+        select = (
+            " SELECT p.doc, SUM(q.idf * p.tf * ? / (p.tf + ? * (1 - ? + ? * p.length / ?))) AS score,"
+            " COUNT(*) OVER ()"
+        )
+        rarest = clause_frequency.index(min(clause_frequency))
+        if len(clauses) > 1 and clause_frequency[rarest] * 4 < sum(frequency.values()):
+            # Selective query: look up the other terms only for the rarest clause's documents
+            terms = [term for term in clauses[rarest] if term in frequency]
+            sql += (
+                f", driver (doc) AS (SELECT DISTINCT doc FROM postings WHERE term IN ({', '.join('?' * len(terms))}))"
+                + select + " FROM driver d CROSS JOIN query q JOIN postings p ON p.term = q.term AND p.doc = d.doc"
+            )
+            params.extend(terms)
+        else:
+            sql += select + " FROM query q JOIN postings p ON p.term = q.term"
+        params.extend([K1 + 1, K1, B, B, average_length])
+        if excluded:
+            sql += (" WHERE NOT EXISTS (SELECT 1 FROM postings x WHERE x.doc = p.doc"
+                    f" AND x.term IN ({', '.join('?' * len(excluded))}))")
+            params.extend(excluded)
+        sql += " GROUP BY p.doc"
+        if len(clauses) > 1:
+            sql += " HAVING " + " AND ".join(f"MAX(q.mask & {1 << i})" for i in range(len(clauses)))
+        sql += " ORDER BY p.doc DESC" if newest_first else " ORDER BY score DESC, p.doc DESC"
+        return self._conn.execute(sql + " LIMIT ? OFFSET ?", (*params, limit, offset)).fetchall()
+
+    def _describe(self, ranked: List[Tuple[int, Optional[float]]]) -> List[Dict[str, Any]]:
+        if not ranked:
+            return []
+        ids = [doc for doc, _ in ranked]
+        rows = {
+            row["id"]: row for row in self._conn.execute(
+                f"SELECT id, key, filename, name, added FROM documents WHERE id IN ({', '.join('?' * len(ids))})", ids
+            )
+        }
+        return [
+            {
+                "key": rows[doc]["key"],
+                "filename": rows[doc]["filename"],
+                "name": rows[doc]["name"],
+                "score": round(score, 4) if score is not None else None,
+                "added": rows[doc]["added"],
+            }
+            for doc, score in ranked
+        ]
+
+    def document_frequencies(self, terms: List[str]) -> Tuple[int, Dict[str, int]]:
+        """Number of indexed resumes, and how many contain each of `terms` (absent terms are left out)"""
+        placeholders = ",".join("?" * len(terms))
+        with self._lock:
+            documents = self._conn.execute("SELECT documents FROM corpus WHERE id = 0").fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT term, df FROM terms WHERE term IN ({placeholders})", terms
+            ).fetchall() if terms else []
+        return documents, {row["term"]: row["df"] for row in rows}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            corpus = self._conn.execute("SELECT documents, length FROM corpus WHERE id = 0").fetchone()
+            terms = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        return {"documents": corpus["documents"], "terms": terms, "tokens": corpus["length"]}
@@ -0,0 +1,103 @@
+import re
+from typing import Dict, List, Optional
+
+# Heading vocabulary: section -> heading lines that start it (case-insensitive)
+DEFAULT_HEADINGS: Dict[str, List[str]] = {
+    'summary': ['summary', 'professional summary', 'profile', 'objective', 'about me'],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'work history',
+        'employment', 'employment history'
+    ],
+    'education': ['education', 'academic background', 'education and training'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'key skills', 'technologies'],
+    'projects': ['projects', 'personal projects', 'selected projects', 'key projects'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications'],
+    'languages': ['languages'],
+}
+
+# Headings are short; longer lines are never tested against the vocabulary
+MAX_HEADING_LENGTH = 40
+
+CONTACT_PATTERNS = {
+    'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b',
+    'linkedin': r'linkedin\.com/in/[\w-]+',
+    'github': r'github\.com/[\w-]+',
+    'phone': r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
+}
+
+
+class SectionIndex:
+    """Lines of a resume grouped by section, plus contact fields found on the way"""
+
+    def __init__(self):
+        self.name: Optional[str] = None
+        self.contact: Dict[str, str] = {}
+        self.sections: Dict[str, List[str]] = {}
+
+    def lines(self, section: str) -> List[str]:
+        return self.sections.get(section, [])
+
+    def text(self, section: str) -> str:
+        return "\n".join(self.lines(section))
+
+    def __contains__(self, section: str) -> bool:
+        return section in self.sections
+
+
+class SectionSegmenter:
+    """Split resume text into sections in a single pass over its lines"""
+
+    def __init__(self, headings: Optional[Dict[str, List[str]]] = None):
+        self.headings = headings or DEFAULT_HEADINGS
+        self._section_for = {
+            alias.lower(): section
+            for section, aliases in self.headings.items()
+            for alias in aliases
+        }
+        aliases = sorted(self._section_for, key=len, reverse=True)
+        self._heading_re = re.compile(
+            r'\s*(' + '|'.join(re.escape(alias).replace(r'\ ', r'\s+') for alias in aliases) + r')\s*:?\s*',
+            re.IGNORECASE
+        )
+        # One alternation finds every contact field kind in a single scan of a line
+        self._contact_re = re.compile(
+            '|'.join(f'(?P<{field}>{pattern})' for field, pattern in CONTACT_PATTERNS.items()),
+            re.IGNORECASE
+        )
+
+    def heading(self, line: str) -> Optional[str]:
+        """Section name if the line is a heading, else None"""
+        if len(line) > MAX_HEADING_LENGTH:
+            return None
+        match = self._heading_re.fullmatch(line)
+        if not match:
+            return None
+        return self._section_for[' '.join(match.group(1).lower().split())]
+
+    def segment(self, text: str) -> SectionIndex:
+        index = SectionIndex()
+        current: Optional[List[str]] = None
+
+        for raw_line in text.split('\n'):
+            line = raw_line.strip()
+            if not line:
+                continue
+
+            if index.name is None:
+                # Assume first non-empty line is the name
+                index.name = line
+
+            section = self.heading(line)
+            if section is not None:
+                # A repeated heading continues the same section
+                current = index.sections.setdefault(section, [])
+                continue
+
+            if len(index.contact) < len(CONTACT_PATTERNS):
+                for match in self._contact_re.finditer(line):
+                    index.contact.setdefault(match.lastgroup, match.group(0))
+
+            if current is not None:
+                current.append(line)
+
+        return index
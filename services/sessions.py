@@ -0,0 +1,199 @@
+"""Incremental merge sessions.
+
+A session holds a candidate's resumes and the duplicate state derived from
+them: fuzzy clusters of skill and project names, resolved experience and
+education entities, and the kept bullets of each merged job. Adding or removing
+one resume only scores the names and records that changed, and only re-checks
+the bullets of jobs whose bullets changed, instead of re-clustering everything.
+The merge itself is then a linear pass through ResumeMerger with that state,
+which gives exactly what a full /api/merge of the same resumes, in the same
+order, would. The merged result is kept until the session's resumes change.
+
+Sessions live in the worker's memory: they expire after `ttl` idle seconds
+and the least recently used are dropped when the total exceeds `max_bytes`.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from models.schemas import MergeSettings, ParsedResume
+from services.dedup import NameClusters, normalize_name
+from services.entities import EntityClusters, Record, education_record, experience_record
+from services.merger import Deduplicator, ResumeMerger, near_duplicate_flags
+
+
+class SessionFull(Exception):
+    """Adding the resumes would take the session past the store's memory cap"""
+
+
+class IncrementalDeduplicator(Deduplicator):
+    """Duplicate state of a session's resumes, updated as resumes come and go.
+
+    Names and records are clustered as they are added (NameClusters,
+    EntityClusters). Bullets are only compared within one merged entry, so an
+    entry's kept bullets depend on its bullets alone and are cached by them.
+    """
+
+    def __init__(self, settings: MergeSettings, workers: int = -1):
+        super().__init__(workers)
+        include = set(settings.include_sections)
+        threshold = settings.deduplicate_threshold
+        self._names = {
+            section: NameClusters(threshold, workers) for section in ("skills", "projects") if section in include
+        }
+        self._entities = {
+            section: EntityClusters(threshold) for section in ("experience", "education") if section in include
+        }
+        self._bullets: Dict[Tuple[str, ...], List[bool]] = {}
+
+    @staticmethod
+    def _items(section: str, resume: ParsedResume) -> List[Hashable]:
+        if section == "experience":
+            return [experience_record(exp) for exp in resume.experience]
+        if section == "education":
+            return [education_record(edu) for edu in resume.education]
+        return [normalize_name(item.name) for item in getattr(resume, section)]
+
+    def add(self, resume: ParsedResume):
+        for section, clusters in {**self._names, **self._entities}.items():
+            clusters.add(self._items(section, resume))
+
+    def remove(self, resume: ParsedResume):
+        for section, clusters in {**self._names, **self._entities}.items():
+            clusters.remove(self._items(section, resume))
+
+    def names(self, section: str, names: List[str], threshold: int) -> List[Hashable]:
+        clusters = self._names[section]
+        return [clusters.label(name) for name in names]
+
+    def entities(self, section: str, records: List[Record], threshold: int) -> List[Hashable]:
+        return self._entities[section].labels(records)
+
+    def bullets(self, entries: List[List[str]], threshold: int) -> List[List[bool]]:
+        keys = [tuple(bullets) for bullets in entries]
+        missing = list(dict.fromkeys(key for key in keys if key not in self._bullets))
+        cached = {key: self._bullets[key] for key in keys if key in self._bullets}
+        cached.update(zip(missing, near_duplicate_flags([list(key) for key in missing], threshold)))
+        # Only the entries of this merge stay cached
+        self._bullets = cached
+        return [cached[key] for key in keys]
+
+
+class MergeSession:
+    """One candidate's resumes plus the merge state derived from them"""
+
+    def __init__(self, session_id: str, settings: MergeSettings, workers: int = -1):
+        self.id = session_id
+        self.settings = settings
+        self.resumes: "OrderedDict[str, ParsedResume]" = OrderedDict()
+        self.size = 0
+        self.touched = time.monotonic()
+        self.lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+        self._dedup = IncrementalDeduplicator(settings, workers)
+        # (merger, result) of the last merge, until the resumes change
+        self._merged: Optional[Tuple[ResumeMerger, ParsedResume]] = None
+
+    def add(self, resumes: List[ParsedResume], max_bytes: int) -> List[str]:
+        sizes = [len(resume.model_dump_json()) for resume in resumes]
+        with self.lock:
+            if self.size + sum(sizes) > max_bytes:
+                raise SessionFull(f"Session would exceed {max_bytes} bytes")
+            resume_ids = []
+            for resume, size in zip(resumes, sizes):
+                resume_id = uuid.uuid4().hex[:12]
+                self.resumes[resume_id] = resume
+                self._sizes[resume_id] = size
+                self.size += size
+                self._dedup.add(resume)
+                resume_ids.append(resume_id)
+            self._merged = None
+            return resume_ids
+
+    def remove(self, resume_id: str) -> bool:
+        with self.lock:
+            resume = self.resumes.pop(resume_id, None)
+            if resume is None:
+                return False
+            self.size -= self._sizes.pop(resume_id)
+            self._dedup.remove(resume)
+            self._merged = None
+            return True
+
+    def merge(self, merger: ResumeMerger) -> ParsedResume:
+        with self.lock:
+            if self._merged is None or self._merged[0] is not merger:
+                merged = merger.merge(list(self.resumes.values()), self.settings, self._dedup)
+                self._merged = (merger, merged)
+            return self._merged[1]
+
+    def describe(self) -> Dict[str, Any]:
+        return {"session_id": self.id, "resume_ids": list(self.resumes), "bytes": self.size}
+
+
+class MergeSessionStore:
+    """Sessions of this worker, expired after `ttl` idle seconds and evicted LRU beyond `max_bytes`"""
+
+    def __init__(self, ttl: float, max_bytes: int, workers: int = -1):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self._sessions: "OrderedDict[str, MergeSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "expired": 0, "evicted": 0}
+
+    def _expire(self):
+        deadline = time.monotonic() - self.ttl
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.touched > deadline:
+                break
+            del self._sessions[session.id]
+            self.stats["expired"] += 1
+
+    def create(self, settings: MergeSettings) -> MergeSession:
+        session = MergeSession(uuid.uuid4().hex, settings, self.workers)
+        with self._lock:
+            self._expire()
+            self._sessions[session.id] = session
+            self.stats["created"] += 1
+        return session
+
+    def get(self, session_id: str) -> Optional[MergeSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.touched = time.monotonic()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def add(self, session: MergeSession, resumes: List[ParsedResume]) -> List[str]:
+        """Add resumes to a session, evicting idle sessions to make room"""
+        resume_ids = session.add(resumes, self.max_bytes)
+        with self._lock:
+            total = sum(s.size for s in self._sessions.values())
+            for stale in list(self._sessions.values()):
+                if total <= self.max_bytes:
+                    break
+                if stale is not session:
+                    del self._sessions[stale.id]
+                    total -= stale.size
+                    self.stats["evicted"] += 1
+        return resume_ids
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "sessions": len(self._sessions),
+                "bytes": sum(s.size for s in self._sessions.values()),
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Tokens keep the punctuation that is part of skill names: c++, c#, node.js, .net
+TOKEN_RE = re.compile(r'\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9][a-z0-9+#]*)*')
+
+# Bump when the matcher's data layout changes, so stale cache files are ignored
+MATCHER_FORMAT = 1
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """Multi-pattern skill matcher over a token-level phrase table.
+
+    Every alias in the taxonomy is tokenized into a phrase. Matching walks the
+    text's tokens once and, at each position, extends the candidate phrase only
+    while it is a known prefix, keeping the longest hit. Matches therefore
+    always fall on token boundaries ("go" never matches "good", "java" never
+    matches "javascript"), and the cost depends on the text length and the
+    longest alias, not on how many skills the taxonomy holds.
+    """
+
+    def __init__(self, skills: List[Dict], digest: str):
+        # skills[i] = {"name": ..., "category": ...}
+        self.skills = [{"name": s["name"], "category": s.get("category", "general")} for s in skills]
+        self.digest = digest
+        self.phrases: Dict[Tuple[str, ...], int] = {}
+        self.prefixes: Set[Tuple[str, ...]] = set()
+        self.max_phrase_length = 1
+
+        for skill_id, skill in enumerate(skills):
+            for alias in [skill["name"], *skill.get("aliases", [])]:
+                phrase = tuple(tokenize(alias))
+                if not phrase:
+                    continue
+                # The first entry to claim an alias wins
+                self.phrases.setdefault(phrase, skill_id)
+                for length in range(1, len(phrase)):
+                    self.prefixes.add(phrase[:length])
+                self.max_phrase_length = max(self.max_phrase_length, len(phrase))
+
+    @classmethod
+    def from_file(cls, path: str, cache_dir: Optional[str] = None) -> "SkillMatcher":
+        """Load a taxonomy file, reusing a pickled matcher from cache_dir when present"""
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()[:16]
+
+        cache_path = None
+        if cache_dir:
+            cache_path = os.path.join(cache_dir, f"skill_matcher_{MATCHER_FORMAT}_{digest}.pickle")
+            try:
+                with open(cache_path, "rb") as f:
+                    return pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+
+        matcher = cls(json.loads(raw)["skills"], digest)
+
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write atomically: several workers may build the same matcher at once
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+
+        return matcher
+
+    def match(self, text: str) -> Counter:
+        """Count occurrences of each skill id in text"""
+        return Counter(skill_id for _, _, skill_id in self.spans(tokenize(text)))
+
+    def spans(self, tokens: List[str]) -> Iterator[Tuple[int, int, int]]:
+        """(position, length, skill id) of each longest match in a token list, left to right"""
+        phrases = self.phrases
+        prefixes = self.prefixes
+        max_length = self.max_phrase_length
+
+        position = 0
+        total = len(tokens)
+        while position < total:
+            best_id = None
+            best_length = 0
+            for length in range(1, min(max_length, total - position) + 1):
+                candidate = tuple(tokens[position:position + length])
+                skill_id = phrases.get(candidate)
+                if skill_id is not None:
+                    best_id = skill_id
+                    best_length = length
+                if candidate not in prefixes:
+                    break
+
+            if best_id is None:
+                position += 1
+            else:
+                yield position, best_length, best_id
+                position += best_length
@@ -0,0 +1,180 @@
+import io
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+# ReportLab's unit (points per inch), kept here so importing this module stays cheap
+INCH = 72.0
+
+PDF_ATTRIBUTES = ('normal_style', 'title_style', 'heading_style')
+
+
+class ExportTemplate:
+    """An export layout, built once and reused for every export.
+
+    Holds the ReportLab paragraph styles and a pre-styled base DOCX (saved as
+    bytes and cloned per export), so a render only has to lay out content.
+    Both are built on first use, so ReportLab and python-docx are only
+    imported by processes that actually export (see warm_up()).
+    """
+
+    def __init__(self, name: str, version: str = "1", font: str = "Helvetica", bold_font: str = "Helvetica-Bold",
+                 docx_font: str = "Calibri", title_size: int = 24, heading_size: int = 14, body_size: int = 10,
+                 title_color: str = "#1a1a1a", heading_color: str = "#333333", margin: float = 1.0,
+                 section_gap: float = 0.2, entry_gap: float = 0.1, max_skills: int = 20, max_bullets: int = 3):
+        self.name = name
+        self.version = version
+        self.font = font
+        self.bold_font = bold_font
+        self.docx_font = docx_font
+        self.title_size = title_size
+        self.heading_size = heading_size
+        self.body_size = body_size
+        self.title_color = title_color
+        self.heading_color = heading_color
+        self.margin = margin * INCH
+        self.section_gap = section_gap * INCH
+        self.entry_gap = entry_gap * INCH
+        # How much of each list is rendered; lists arrive ranked, so these are the top items
+        self.max_skills = max_skills
+        self.max_bullets = max_bullets
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that haven't been built yet
+        if name in PDF_ATTRIBUTES:
+            self.build_pdf_styles()
+        elif name == 'docx_base':
+            self.build_docx_base()
+        else:
+            raise AttributeError(name)
+        return self.__dict__[name]
+
+    def warm_up(self):
+        """Build everything now instead of on the first export"""
+        self.build_pdf_styles()
+        self.build_docx_base()
+
+    def build_pdf_styles(self):
+        """ReportLab paragraph styles (the standard Type 1 fonts need no registration)"""
+        from reportlab.lib import colors
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+        sample = getSampleStyleSheet()
+        self.normal_style = ParagraphStyle(
+            f'{self.name}-Normal',
+            parent=sample['Normal'],
+            fontName=self.font,
+            fontSize=self.body_size,
+            leading=self.body_size * 1.2
+        )
+        self.title_style = ParagraphStyle(
+            f'{self.name}-Title',
+            parent=sample['Heading1'],
+            fontName=self.bold_font,
+            fontSize=self.title_size,
+            leading=self.title_size * 1.2,
+            textColor=colors.HexColor(self.title_color),
+            spaceAfter=12
+        )
+        self.heading_style = ParagraphStyle(
+            f'{self.name}-Heading',
+            parent=sample['Heading2'],
+            fontName=self.bold_font,
+            fontSize=self.heading_size,
+            leading=self.heading_size * 1.2,
+            textColor=colors.HexColor(self.heading_color),
+            spaceAfter=6,
+            spaceBefore=12
+        )
+
+    def build_docx_base(self):
+        """Base DOCX with the same look applied to its styles, stored as bytes"""
+        from docx import Document
+        from docx.shared import Pt, RGBColor
+
+        doc = Document()
+        styles = doc.styles
+        styles['Normal'].font.name = self.docx_font
+        styles['Normal'].font.size = Pt(self.body_size + 1)
+        for style_name, size, color in (
+            ('Heading 1', self.title_size, self.title_color),
+            ('Heading 2', self.heading_size, self.heading_color),
+            ('Heading 3', self.body_size + 2, self.heading_color),
+        ):
+            style = styles[style_name]
+            style.font.name = self.docx_font
+            style.font.size = Pt(size)
+            style.font.color.rgb = RGBColor.from_string(color.lstrip('#').upper())
+        for section in doc.sections:
+            section.left_margin = section.right_margin = int(self.margin * 12700)
+            section.top_margin = section.bottom_margin = int(self.margin * 12700)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        self.docx_base = buffer.getvalue()
+
+    # PDF flowable factories
+
+    def pdf_document(self, output) -> 'SimpleDocTemplate':
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate
+
+        return SimpleDocTemplate(
+            output, pagesize=letter,
+            leftMargin=self.margin, rightMargin=self.margin,
+            topMargin=self.margin, bottomMargin=self.margin
+        )
+
+    def title(self, text: str) -> 'Paragraph':
+        from reportlab.platypus import Paragraph
+        return Paragraph(text, self.title_style)
+
+    def heading(self, text: str) -> 'Paragraph':
+        from reportlab.platypus import Paragraph
+        return Paragraph(text, self.heading_style)
+
+    def paragraph(self, text: str) -> 'Paragraph':
+        from reportlab.platypus import Paragraph
+        return Paragraph(text, self.normal_style)
+
+    def section_spacer(self) -> 'Spacer':
+        from reportlab.platypus import Spacer
+        return Spacer(1, self.section_gap)
+
+    def entry_spacer(self) -> 'Spacer':
+        from reportlab.platypus import Spacer
+        return Spacer(1, self.entry_gap)
+
+    # DOCX
+
+    def new_docx(self):
+        """A fresh, pre-styled Document cloned from the base bytes"""
+        from docx import Document
+        return Document(io.BytesIO(self.docx_base))
+
+
+def build_templates() -> Dict[str, ExportTemplate]:
+    """Every available layout (cheap: styles are built on first use)"""
+    templates = [
+        ExportTemplate('classic'),
+        ExportTemplate(
+            'compact', font='Times-Roman', bold_font='Times-Bold', docx_font='Times New Roman',
+            title_size=18, heading_size=12, body_size=9, margin=0.6, section_gap=0.1, entry_gap=0.05
+        ),
+        ExportTemplate(
+            'modern', title_color='#0b3d91', heading_color='#1f6feb', title_size=26, heading_size=13,
+            margin=0.8
+        ),
+    ]
+    return {template.name: template for template in templates}
+
+
+DEFAULT_TEMPLATE = 'classic'
+TEMPLATES = build_templates()
+
+
+def get_template(name: str) -> ExportTemplate:
+    try:
+        return TEMPLATES[name]
+    except KeyError:
+        raise ValueError(f"Unknown template: {name}. Choose from {', '.join(TEMPLATES)}")
@@ -0,0 +1,72 @@
+"""Pay import and first-call costs up front, before a process serves traffic.
+
+Heavy backends (pdfium, lxml, python-docx, ReportLab, numpy/rapidfuzz) are
+imported lazily on first use, which keeps cold starts short but makes the
+first request that needs each one slow. With WARMUP=1 the server runs these
+hooks during startup instead, trading a longer start for a fast first request.
+"""
+import importlib
+
+from models.schemas import MergeSettings, ParsedResume
+from services.exporter import ResumeExporter
+from services.merger import ResumeMerger
+from services.parser import ResumeParser
+from services.templates import DEFAULT_TEMPLATE, TEMPLATES
+
+# Module each extraction backend imports on first use
+EXTRACTION_MODULES = {
+    "pdfium": "pypdfium2",
+    "pdfplumber": "pdfplumber",
+    "stream": "lxml.etree",
+    "python-docx": "docx",
+}
+
+SAMPLE_TEXT = "\n".join([
+    "Jane Doe",
+    "jane@example.com | (555) 123-4567 | github.com/janedoe",
+    "SKILLS",
+    "Python, Docker, PostgreSQL",
+    "EXPERIENCE",
+    "Software Engineer | Acme Inc | 2020 - 2023",
+    "Built services in Python",
+    "EDUCATION",
+    "B.Sc. Computer Science - State University",
+    "PROJECTS",
+    "Tool - a side project using FastAPI",
+])
+
+SAMPLE_RESUME = {
+    "personal_info": {"name": "Jane Doe", "email": "jane@example.com", "phone": "(555) 123-4567"},
+    "skills": [{"name": "Python", "category": "programming"}, {"name": "Pythn", "category": "programming"}],
+    "experience": [{"title": "Software Engineer", "company": "Acme Inc", "description": ["Built services in Python"]}],
+    "education": [{"degree": "B.Sc. Computer Science", "institution": "State University"}],
+    "projects": [{"name": "Tool", "description": "A side project using FastAPI"}],
+}
+
+
+def warm_parser(parser: ResumeParser):
+    """Import the configured extraction backends and run the text stages once"""
+    for backend in (parser.pdf_backend, parser.docx_backend):
+        importlib.import_module(EXTRACTION_MODULES[backend.name])
+    index = parser.segmenter.segment(SAMPLE_TEXT)
+    parser._parse_personal_info(index)
+    parser._parse_skills(SAMPLE_TEXT)
+    parser._parse_experience(index.lines('experience'))
+    parser._parse_education(index.lines('education'))
+    parser._parse_projects(index.lines('projects'))
+
+
+def warm_merger(merger: ResumeMerger):
+    """Import numpy/rapidfuzz, load the taxonomy for relevance ranking and run one small merge"""
+    resume = ParsedResume.model_validate(SAMPLE_RESUME)
+    settings = MergeSettings(sort_experience_by="relevance", job_description="Python engineer, Docker and AWS")
+    merger.merge([resume, resume.model_copy(deep=True)], settings)
+
+
+def warm_exporter(exporter: ResumeExporter):
+    """Build every template and render the sample in each format, bypassing the render cache"""
+    for template in TEMPLATES.values():
+        template.warm_up()
+    layout = TEMPLATES[DEFAULT_TEMPLATE]
+    exporter._export_pdf(SAMPLE_RESUME, layout)
+    exporter._export_docx(SAMPLE_RESUME, layout)
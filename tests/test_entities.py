@@ -0,0 +1,69 @@
+from models.schemas import Education, Experience, MergeSettings, ParsedResume, PersonalInfo
+from services.dedup import near_duplicates
+from services.merger import ResumeMerger
+from services.parser import ResumeParser
+
+
+def merged_experience(*exp_lists):
+    return ResumeMerger()._merge_experience(list(exp_lists), 85, 70)
+
+
+def test_reworded_job_is_one_entry():
+    merged = merged_experience(
+        [Experience(title="Sr. Software Engineer", company="Acme Inc.", start_date="2020-01",
+                    description=["Built payment APIs in Python serving 2M users"])],
+        [Experience(title="Senior Software Engineer", company="ACME", start_date="Jan 2020",
+                    description=["Built payment APIs in Python serving 2M users!", "Mentored interns"])],
+    )
+    assert len(merged) == 1
+    assert merged[0].description == ["Built payment APIs in Python serving 2M users", "Mentored interns"]
+
+
+def test_non_latin_jobs_stay_apart():
+    merged = merged_experience(
+        [Experience(title="Разработчик 2019 - 2021", company="Яндекс", description=["Писал сервисы"])],
+        [Experience(title="Менеджер 2019 - 2021", company="Сбербанк", description=["Вёл проекты"])],
+    )
+    assert len(merged) == 2
+
+
+def test_non_latin_bullets_are_kept():
+    bullets = ["Руководил командой из пяти человек", "Внедрил CI/CD для всех сервисов", "Développé l'API de paiement"]
+    merged = merged_experience([Experience(title="Разработчик", company="Яндекс", description=bullets)])
+    assert merged[0].description == bullets
+
+
+def test_near_duplicate_non_latin_bullets_fold():
+    texts = ["Руководил командой из пяти человек", "руководил командой из пяти человек.", "Développé l'API"]
+    assert near_duplicates(texts, [0, 0, 0], 70) == [0, 0, 2]
+
+
+def test_bullets_without_words_are_never_duplicates():
+    assert near_duplicates(["—", "•", "—"], [0, 0, 0], 70) == [0, 1, 2]
+
+
+def test_parsed_jobs_without_company_stay_apart():
+    parser = ResumeParser()
+    first = parser._parse_experience(["Software Engineer 2018 - 2020", "Built the billing service"])
+    second = parser._parse_experience(["Software Engineer 2019 - 2022", "Ran the data platform"])
+    assert first[0].company == "Unknown"
+    assert len(merged_experience(first, second)) == 2
+
+
+def test_parsed_job_repeated_verbatim_folds():
+    parser = ResumeParser()
+    lines = ["Software Engineer 2018 - 2020", "Built the billing service"]
+    assert len(merged_experience(parser._parse_experience(lines), parser._parse_experience(lines))) == 1
+
+
+def test_degree_abbreviations_resolve():
+    resumes = [
+        ParsedResume(personal_info=PersonalInfo(),
+                     education=[Education(degree="B.S. Computer Science", institution="MIT", graduation_date="2016")]),
+        ParsedResume(personal_info=PersonalInfo(),
+                     education=[Education(degree="Bachelor of Science in Computer Science", institution="M.I.T.",
+                                          gpa="3.9")]),
+    ]
+    education = ResumeMerger().merge(resumes, MergeSettings()).education
+    assert len(education) == 1
+    assert education[0].gpa == "3.9"
@@ -0,0 +1,11 @@
+from models.schemas import MergeSettings, ParsedResume, PersonalInfo, Skill
+from services.merger import ResumeMerger
+
+
+def test_skill_frequency_adds_up_across_resumes():
+    resumes = [
+        ParsedResume(personal_info=PersonalInfo(), skills=[Skill(name="Python", frequency=3)]),
+        ParsedResume(personal_info=PersonalInfo(), skills=[Skill(name="python", frequency=2), Skill(name="Go")]),
+    ]
+    skills = ResumeMerger().merge(resumes, MergeSettings()).skills
+    assert [(skill.name, skill.frequency) for skill in skills] == [("Python", 5), ("Go", 1)]
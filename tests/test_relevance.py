@@ -0,0 +1,41 @@
+import config
+from models.schemas import Experience, ParsedResume, PersonalInfo, Project, Skill
+from services.relevance import RelevanceRanker
+from services.skills import SkillMatcher
+
+JOB = "Kubernetes platform engineer: run Kubernetes clusters, write Go services"
+
+
+def ranker():
+    return RelevanceRanker(matcher=SkillMatcher.from_file(config.SKILL_TAXONOMY_PATH))
+
+
+def test_skill_aliases_become_one_term():
+    assert ranker().terms("Ran k8s clusters with Python") == [
+        "word:ran", "skill:kubernetes", "word:clusters", "skill:python"
+    ]
+
+
+def test_most_relevant_experience_bullets_and_skills_come_first():
+    resume = ParsedResume(
+        personal_info=PersonalInfo(),
+        experience=[
+            Experience(title="Marketing Analyst", company="Globex", description=["Ran email campaigns"]),
+            Experience(title="Platform Engineer", company="Acme",
+                       description=["Wrote the billing reports", "Ran k8s clusters for 40 Go services"]),
+        ],
+        projects=[Project(name="Blog", description="Static site"),
+                  Project(name="Operator", description="A Kubernetes operator in Go")],
+        skills=[Skill(name="Excel"), Skill(name="Kubernetes"), Skill(name="Go")],
+    )
+    ranked = ranker().rank(resume, JOB)
+    assert [exp.company for exp in ranked.experience] == ["Acme", "Globex"]
+    assert ranked.experience[0].description == ["Ran k8s clusters for 40 Go services", "Wrote the billing reports"]
+    assert [proj.name for proj in ranked.projects] == ["Operator", "Blog"]
+    assert [skill.name for skill in ranked.skills] == ["Kubernetes", "Go", "Excel"]
+
+
+def test_irrelevant_items_keep_their_order():
+    skills = [Skill(name=name) for name in ("Excel", "Photoshop", "Figma")]
+    ranked = ranker().rank(ParsedResume(personal_info=PersonalInfo(), skills=skills), JOB)
+    assert [skill.name for skill in ranked.skills] == ["Excel", "Photoshop", "Figma"]
@@ -0,0 +1,74 @@
+import pytest
+
+from models.schemas import Experience, ParsedResume, PersonalInfo, Skill
+from services.search import QueryError, ResumeIndex, parse_query
+
+
+def resume(name, skills=(), bullets=()):
+    return ParsedResume(
+        personal_info=PersonalInfo(name=name),
+        skills=[Skill(name=skill, category="Programming") for skill in skills],
+        experience=[Experience(title="Engineer", company="Acme", description=list(bullets))],
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ResumeIndex(str(tmp_path / "index.sqlite3"))
+
+
+def test_query_clauses_or_and_exclusions():
+    clauses, excluded = parse_query('python OR golang -php skill:"Machine Learning" text:kubernetes category:cloud')
+    assert clauses == [
+        ["word:python", "skill:python", "word:golang", "skill:golang"],
+        ["skill:machine learning"],
+        ["word:kubernetes"],
+        ["category:cloud"],
+    ]
+    assert excluded == ["word:php", "skill:php"]
+
+
+def test_query_without_positive_terms_is_rejected():
+    with pytest.raises(QueryError):
+        parse_query("-php the")
+
+
+def test_bm25_ranks_more_mentions_first(index):
+    index.add("once", resume("Once", bullets=["Wrote Python tooling for the billing team"]))
+    index.add("twice", resume("Twice", skills=["Python"], bullets=["Wrote Python tooling for the billing team"]))
+    index.add("none", resume("None", skills=["Go"], bullets=["Ran the data platform"]))
+    results = index.search("python")["results"]
+    assert [result["key"] for result in results] == ["twice", "once"]
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_excluded_and_conjunctive_queries(index):
+    index.add("a", resume("A", skills=["Python", "Docker"]))
+    index.add("b", resume("B", skills=["Python", "PHP"]))
+    assert [result["key"] for result in index.search("python -php")["results"]] == ["a"]
+    assert [result["key"] for result in index.search("python docker")["results"]] == ["a"]
+    assert index.search("docker OR php")["total"] == 2
+
+
+def test_delete_and_replace_keep_postings_consistent(index):
+    index.add("a", resume("A", skills=["Python"], bullets=["Built payment APIs"]))
+    index.add("b", resume("B", skills=["Python"]))
+    assert index.document_frequencies(["skill:python", "word:payment"]) == (2, {"skill:python": 2, "word:payment": 1})
+
+    # Re-adding under the same key replaces the old postings instead of adding to them
+    index.add("a", resume("A", skills=["Go"]))
+    assert index.document_frequencies(["skill:python", "skill:go", "word:payment"]) == (
+        2, {"skill:python": 1, "skill:go": 1}
+    )
+    assert index.search("payment")["total"] == 0
+
+    assert index.delete("b") and not index.delete("b")
+    assert index.get("b") is None
+    assert index.get_stats() == {"documents": 1, "terms": 2, "tokens": 2}
+    assert index.search("python")["total"] == 0
+
+
+def test_add_without_replace_keeps_first_version(index):
+    index.add("a", resume("A", skills=["Python"]))
+    index.add("a", resume("A", skills=["Go"]), replace=False)
+    assert [skill.name for skill in index.get("a").skills] == ["Python"]
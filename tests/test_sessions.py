@@ -0,0 +1,76 @@
+from models.schemas import Education, Experience, MergeSettings, ParsedResume, PersonalInfo, Project, Skill
+from services.merger import ResumeMerger
+from services.sessions import MergeSession
+
+
+def resume(skills=(), projects=(), experience=(), education=()):
+    return ParsedResume(
+        personal_info=PersonalInfo(),
+        skills=[Skill(name=name, category="Programming") for name in skills],
+        projects=[Project(name=name, description=name) for name in projects],
+        experience=list(experience),
+        education=list(education),
+    )
+
+
+RESUMES = [
+    resume(
+        skills=["Python", "Docker"], projects=["Payments API"],
+        experience=[Experience(title="Sr. Software Engineer", company="Acme Inc.", start_date="2020-01",
+                               description=["Built payment APIs in Python serving 2M users", "Mentored interns"])],
+        education=[Education(degree="B.S. Computer Science", institution="MIT", graduation_date="2016")],
+    ),
+    resume(
+        skills=["python", "Kubernetes"], projects=["payments-api"],
+        experience=[Experience(title="Senior Software Engineer", company="ACME", start_date="Jan 2020",
+                               description=["Built payment APIs in Python serving 2M users!", "Ran on-call"]),
+                    Experience(title="Software Engineer 2017 - 2019", company="Unknown",
+                               description=["Wrote the billing service"])],
+        education=[Education(degree="Bachelor of Science in Computer Science", institution="M.I.T.", gpa="3.9")],
+    ),
+    resume(
+        skills=["Go"],
+        experience=[Experience(title="Software Engineer 2017 - 2019", company="Unknown",
+                               description=["Wrote the billing service.", "Owned deploys"]),
+                    Experience(title="Engineering Manager", company="Globex", start_date="2022")],
+        education=[Education(degree="MBA", institution="Stanford", graduation_date="2024")],
+    ),
+]
+
+
+def assert_matches_full_merge(session, merger):
+    merged = session.merge(merger)
+    assert merged == merger.merge(list(session.resumes.values()), session.settings)
+    return merged
+
+
+def test_session_matches_full_merge_after_add_and_remove():
+    merger = ResumeMerger()
+    session = MergeSession("test", MergeSettings())
+    ids = []
+    for parsed in RESUMES:
+        ids += session.add([parsed], max_bytes=2 ** 30)
+        assert_matches_full_merge(session, merger)
+
+    merged = assert_matches_full_merge(session, merger)
+    assert len(merged.experience) == 3
+    assert len(merged.education) == 2
+
+    session.remove(ids[0])
+    assert_matches_full_merge(session, merger)
+    session.remove(ids[2])
+    assert_matches_full_merge(session, merger)
+    session.add([RESUMES[0], RESUMES[2]], max_bytes=2 ** 30)
+    assert_matches_full_merge(session, merger)
+
+
+def test_session_keeps_result_until_resumes_change():
+    merger = ResumeMerger()
+    session = MergeSession("test", MergeSettings())
+    resume_id = session.add(RESUMES[:2], max_bytes=2 ** 30)[0]
+    merged = session.merge(merger)
+    assert session.merge(merger) is merged
+
+    session.remove(resume_id)
+    assert session.merge(merger) is not merged
+    assert_matches_full_merge(session, merger)